@@ -1,25 +1,20 @@
 import streamlit as st
-import spacy
 import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "model", "chat_web_ai"))
+from ai_int_app.nlp_service import get_nlp_service
+from ai_int_app.scoring import AnswerScorer
 
 # Load spaCy model
 @st.cache_resource
 def load_nlp_model():
-    return spacy.load("en_core_web_sm")
-
-nlp = load_nlp_model()
-
-# Keywords for extracting relevant skills
-SKILL_KEYWORDS = set([
-    "python", "java", "javascript", "react", "node.js", "aws", "azure", "gcp", "sql", "nosql",
-    "docker", "kubernetes", "git", "api", "rest", "graphql", "frontend", "backend", "fullstack",
-    "machine learning", "ai", "deep learning", "data science", "cloud", "agile", "scrum", "devops",
-    "testing", "security", "linux", "windows", "mobile", "web", "database", "design patterns",
-    "architecture", "communication", "teamwork", "problem solving", "leadership", "management",
-    "analytical", "critical thinking", "collaboration", "mentoring", "debugging", "scalability",
-    "performance", "optimization", "microservices", "ci/cd", "data structures", "algorithms", "oop",
-    "object-oriented programming"
-])
+    service = get_nlp_service()
+    service.warm_up()
+    return service.matcher
+
+skill_matcher = load_nlp_model()
 
 POSITIVE_REMARKS = [
     "Great explanation!",
@@ -30,19 +25,11 @@ POSITIVE_REMARKS = [
     "You’ve demonstrated solid understanding!"
 ]
 
+# Streamlit reruns this whole script on every widget interaction, so
+# anything slow is cached by its input or kept in st.session_state
+@st.cache_data(max_entries=256, show_spinner=False)
 def extract_skills_from_jd(text):
-    doc = nlp(text.lower())
-    found = set()
-
-    for token in doc:
-        if token.text in SKILL_KEYWORDS:
-            found.add(token.text)
-
-    for chunk in doc.noun_chunks:
-        if chunk.text.strip() in SKILL_KEYWORDS:
-            found.add(chunk.text.strip())
-
-    return sorted(found)
+    return skill_matcher.extract(text)
 
 def generate_question(topic):
     templates = [
@@ -54,15 +41,31 @@ def generate_question(topic):
     ]
     return random.choice(templates)
 
-def is_response_good(topic, response):
-    keywords = topic.split()
-    return all(word.lower() in response.lower() for word in keywords)
+def build_question_plan(topics):
+    # Drawn once per interview: a rerun must not change the question shown
+    return [{"topic": topic, "question": generate_question(topic)} for topic in topics]
+
+def history_entry(number, question, response, feedback):
+    # Formatted once when the answer is submitted, not on every rerun
+    return f"**Q{number}: {question}**\n\n*Your Answer:* {response}\n\n*AI Feedback:* {feedback}\n\n---"
+
+@st.cache_resource
+def load_answer_scorer():
+    return AnswerScorer()
+
+answer_scorer = load_answer_scorer()
 
-def provide_feedback(is_good):
-    if is_good:
+def score_response(topic, response):
+    return answer_scorer.score(topic, response)
+
+def provide_feedback(score):
+    grade = answer_scorer.grade(score)
+    if grade == "good":
         return random.choice(POSITIVE_REMARKS)
-    else:
+    elif grade == "partial":
         return "That's a good start! Try to include more specific details or examples."
+    else:
+        return "Could you go deeper? Talk about what you built, the problems you solved and the results."
 
 # Streamlit UI
 st.title("🧠 AI Interview Assistant")
@@ -78,37 +81,38 @@ if st.button("Start Interview"):
         if not skills:
             st.error("No recognizable skills found in the job description.")
         else:
-            st.session_state.topics = skills[:5]
+            st.session_state.plan = build_question_plan(skills[:5])
             st.session_state.index = 0
             st.session_state.history = []
+            st.session_state.celebrated = False
+
+# Current question, read from the plan
+if "plan" in st.session_state and st.session_state.index < len(st.session_state.plan):
+    step = st.session_state.plan[st.session_state.index]
+    topic, question = step["topic"], step["question"]
 
-# Initialize state
-if "topics" in st.session_state and st.session_state.index < len(st.session_state.topics):
-    topic = st.session_state.topics[st.session_state.index]
-    question = generate_question(topic)
-    
     st.subheader(f"Question {st.session_state.index + 1}")
     st.markdown(f"**💬 {question}**")
 
     response = st.text_area("Your Answer", key=f"response_{st.session_state.index}")
 
     if st.button("Submit Answer"):
-        good = is_response_good(topic, response)
-        feedback = provide_feedback(good)
+        score = score_response(topic, response)
+        feedback = provide_feedback(score)
         st.success(f"🤖 Feedback: {feedback}")
-        st.session_state.history.append((question, response, feedback))
+        st.session_state.history.append(
+            history_entry(st.session_state.index + 1, question, response, feedback)
+        )
         st.session_state.index += 1
 
 # Show past questions & feedback
 if "history" in st.session_state and st.session_state.history:
     st.markdown("---")
     st.subheader("📜 Interview History")
-    for i, (q, a, f) in enumerate(st.session_state.history):
-        st.markdown(f"**Q{i+1}: {q}**")
-        st.markdown(f"*Your Answer:* {a}")
-        st.markdown(f"*AI Feedback:* {f}")
-        st.markdown("---")
-
-if "index" in st.session_state and st.session_state.index >= 5:
-    st.balloons()
+    st.markdown("\n\n".join(st.session_state.history))
+
+if "plan" in st.session_state and st.session_state.index >= len(st.session_state.plan):
+    if not st.session_state.celebrated:
+        st.balloons()
+        st.session_state.celebrated = True
     st.success("✅ Interview complete. Good job!")
@@ -1,28 +1,24 @@
-import spacy
 import time
 import random
 from typing import List, Dict
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "model", "chat_web_ai"))
+from ai_int_app.nlp_service import get_nlp_service
+from ai_int_app.scoring import AnswerScorer
+from ai_int_app.taxonomy import TaxonomyMatcher
 
 # Load SpaCy model safely
-def load_nlp_model(model_name: str = "en_core_web_sm"):
+def load_nlp_model(model_name: str = "en_core_web_sm") -> TaxonomyMatcher:
     try:
-        return spacy.load(model_name)
+        service = get_nlp_service(model_name)
+        service.warm_up()
+        return service.matcher
     except OSError:
         raise SystemExit(f"Model '{model_name}' not found. Please run: python -m spacy download {model_name}")
 
-nlp = load_nlp_model()
-
-# Define static keywords (can be loaded from config/database)
-SKILL_KEYWORDS = set([
-    "python", "java", "javascript", "react", "node.js", "aws", "azure", "gcp", "sql", "nosql",
-    "docker", "kubernetes", "git", "api", "rest", "graphql", "frontend", "backend", "fullstack",
-    "machine learning", "ai", "deep learning", "data science", "cloud", "agile", "scrum", "devops",
-    "testing", "security", "linux", "windows", "mobile", "web", "database", "design patterns",
-    "architecture", "communication", "teamwork", "problem solving", "leadership", "management",
-    "analytical", "critical thinking", "collaboration", "mentoring", "debugging", "scalability",
-    "performance", "optimization", "microservices", "ci/cd", "data structures", "algorithms", "oop",
-    "object-oriented programming"
-])
+skill_matcher = load_nlp_model()
 
 POSITIVE_REMARKS = [
     "Great explanation!",
@@ -35,18 +31,7 @@ POSITIVE_REMARKS = [
 
 # Extract skills from job description
 def extract_skills_from_jd(text: str) -> List[str]:
-    doc = nlp(text.lower())
-    found = set()
-
-    for token in doc:
-        if token.text in SKILL_KEYWORDS:
-            found.add(token.text)
-
-    for chunk in doc.noun_chunks:
-        if chunk.text.strip() in SKILL_KEYWORDS:
-            found.add(chunk.text.strip())
-
-    return sorted(found)
+    return skill_matcher.extract(text)
 
 # Generate a relevant question for a topic
 def generate_question(topic: str) -> str:
@@ -59,17 +44,21 @@ def generate_question(topic: str) -> str:
     ]
     return random.choice(templates)
 
-# Simulated comparison to ideal answers (mocked)
-def is_response_good(topic: str, response: str) -> bool:
-    keywords = topic.split()
-    return all(word.lower() in response.lower() for word in keywords)
+# Graded comparison with the topic's rubric (see ai_int_app/scoring.py)
+answer_scorer = AnswerScorer()
+
+def score_response(topic: str, response: str) -> float:
+    return answer_scorer.score(topic, response)
 
 # Provide positive reinforcement and suggestions
-def provide_feedback(is_good: bool) -> str:
-    if is_good:
+def provide_feedback(score: float) -> str:
+    grade = answer_scorer.grade(score)
+    if grade == "good":
         return random.choice(POSITIVE_REMARKS)
-    else:
+    elif grade == "partial":
         return "That's a good start! Consider including more specific details or examples."
+    else:
+        return "Could you go deeper? Talk about what you built, the problems you solved and the results."
 
 # Interactive AI interview session
 def run_interview(job_description: str, max_questions: int = 5):
@@ -92,8 +81,8 @@ def run_interview(job_description: str, max_questions: int = 5):
             continue
 
         # Simulated analysis
-        good = is_response_good(topic, response)
-        feedback = provide_feedback(good)
+        score = score_response(topic, response)
+        feedback = provide_feedback(score)
         print(f"🤖 AI Feedback: {feedback}")
         asked += 1
 
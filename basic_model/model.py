@@ -1,28 +1,16 @@
-import spacy
+import os
+import sys
+import threading
 import time
-from typing import List, Set, Dict
-
-# -------------------- Constants --------------------
-SKILL_KEYWORDS = {
-    "python", "java", "javascript", "react", "node.js", "aws", "azure", "gcp",
-    "sql", "nosql", "docker", "kubernetes", "git", "api", "rest", "graphql",
-    "frontend", "backend", "fullstack", "machine learning", "ai", "deep learning",
-    "data science", "cloud", "agile", "scrum", "devops", "testing", "security",
-    "linux", "windows", "mobile", "web", "database", "design patterns", "architecture",
-    "communication", "teamwork", "problem solving", "leadership", "management",
-    "analytical", "critical thinking", "collaboration", "mentoring", "debugging",
-    "scalability", "performance", "optimization", "microservices", "ci/cd",
-    "data structures", "algorithms", "oop", "object-oriented programming"
-}
-
-GENERIC_TERMS = {
-    "experience", "years", "role", "team", "responsibilities", "candidate", "skills",
-    "knowledge", "ability"
-}
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Iterable, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "model", "chat_web_ai"))
+from ai_int_app.nlp_service import get_nlp_service
 
 # -------------------- NLP Setup --------------------
 try:
-    nlp = spacy.load("en_core_web_sm")
+    skill_matcher = get_nlp_service().matcher
 except OSError:
     print("SpaCy model 'en_core_web_sm' not found.")
     print("Please run: python -m spacy download en_core_web_sm")
@@ -33,47 +21,85 @@ except OSError:
 def analyze_job_description(text: str) -> List[str]:
     """
     Extract relevant skill-based keywords from a job description using SpaCy.
+    Multi-word skills such as "problem solving" are matched as phrases.
     """
-    doc = nlp(text.lower())
-    extracted_topics: Set[str] = set()
-
-    for chunk in doc.noun_chunks:
-        chunk_text = chunk.text.strip()
-        if any(keyword in chunk_text for keyword in SKILL_KEYWORDS):
-            extracted_topics.add(chunk_text)
-
-    for token in doc:
-        token_text = token.text.strip()
-        if token_text in SKILL_KEYWORDS:
-            extracted_topics.add(token_text)
-        # Handle compound phrases like "problem solving"
-        if token_text == "problem" and token.head.text.lower() == "solving":
-            extracted_topics.add("problem solving")
-        if token_text == "data" and token.head.text.lower() == "science":
-            extracted_topics.add("data science")
-
-    return sorted(
-        topic for topic in extracted_topics
-        if topic not in GENERIC_TERMS and len(topic.split()) <= 4
-    )
-
-
-def simulate_llm_question_generation(topic: str, context: str = "") -> str:
+    return skill_matcher.extract(text)
+
+
+def draft_llm_question(topic: str, context: str = "") -> str:
     """
-    Simulates LLM behavior to generate an interview question.
+    Simulates the model call behind question generation (the slow part).
+    Prints nothing, so it can run in the background.
     """
-    print(f"\n--- Generating question for: '{topic}' ---")
     if context:
         default_question = f"Can you elaborate more on your experience with {topic}, specifically regarding {context}?"
     else:
         default_question = f"Tell me about your experience with {topic}."
 
-    time.sleep(1)
-    print("LLM is thinking...")
-    time.sleep(1)
+    time.sleep(2)  # stands in for model latency
+    return default_question
 
-    custom_question = input(f"Suggested: '{default_question}'\nOverride (or press Enter to use): ")
-    return custom_question.strip() or default_question
+
+def simulate_llm_question_generation(topic: str, context: str = "", draft: Optional[str] = None) -> str:
+    """
+    Simulates LLM behavior to generate an interview question. ``draft`` is a
+    question already generated in the background, if any.
+    """
+    print(f"\n--- Generating question for: '{topic}' ---")
+    if draft is None:
+        print("LLM is thinking...")
+        draft = draft_llm_question(topic, context)
+
+    custom_question = input(f"Suggested: '{draft}'\nOverride (or press Enter to use): ")
+    return custom_question.strip() or draft
+
+
+class SpeculativeQuestions:
+    """
+    Generates questions for the topics likely to come next on background
+    threads while the candidate is still answering. ``take`` hands over a
+    prefetched question (waiting for it if it is still being generated);
+    ``keep_only`` throws away the ones the interview will no longer ask.
+    """
+
+    def __init__(self, generate=draft_llm_question, workers: int = 2):
+        self.generate = generate
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="question-speculation")
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, candidates: Iterable[Tuple[str, str]]):
+        with self._lock:
+            for key in candidates:
+                if key not in self._pending:
+                    self._pending[key] = self._pool.submit(self.generate, *key)
+
+    def take(self, topic: str, context: str = "") -> Optional[str]:
+        with self._lock:
+            future = self._pending.pop((topic, context), None)
+        return future.result() if future is not None else None
+
+    def keep_only(self, candidates: Iterable[Tuple[str, str]]):
+        keep = set(candidates)
+        with self._lock:
+            for key in [k for k in self._pending if k not in keep]:
+                # Running ones finish in the background; the result is dropped
+                self._pending.pop(key).cancel()
+
+    def close(self):
+        self.keep_only(())
+        self._pool.shutdown(wait=False)
+
+
+def likely_next(remaining: List[str], delving: List[str]) -> List[Tuple[str, str]]:
+    """
+    The (topic, context) pairs the next question may be about: the first
+    sub-topic queued for a deeper dive, or else the first remaining topics
+    (the next one may get covered by the current answer).
+    """
+    if delving:
+        return [(delving[0], delving[0])]
+    return [(topic, "") for topic in remaining[:2]]
 
 
 def simulate_llm_response_analysis(question: str, response: str) -> Dict[str, List[str]]:
@@ -118,46 +144,60 @@ def run_interview(job_description: str, max_questions: int = 10) -> None:
     history = []
     count = 0
 
+    speculative = SpeculativeQuestions()
+
     print("\n--- Starting Interview ---")
-    while count < max_questions and (remaining or delving):
-        if delving:
-            topic = delving.pop(0)
-            context = topic
-            print(f"\nDiving deeper into: {topic}")
-        else:
-            topic = remaining.pop(0)
-            context = ""
-            print(f"\nAsking about: {topic}")
-
-        question = simulate_llm_question_generation(topic, context)
-        print(f"\nAI: {question}")
-        
-        response = input("You: ").strip()
-        if not response:
-            print("No response received. Skipping to next.")
-            continue
-
-        count += 1
-        history.append((question, response))
-
-        analysis = simulate_llm_response_analysis(question, response)
-
-        for t in analysis["covered_topics"]:
-            covered.add(t)
-            if t in remaining:
-                remaining.remove(t)
-
-        for sub in analysis["needs_delving"]:
-            if sub not in delving:
-                delving.append(sub)
-
-        # Interview status snapshot
-        print("\n--- Status Update ---")
-        print(f"Questions Asked: {count}/{max_questions}")
-        print(f"Covered: {', '.join(covered) if covered else 'None'}")
-        print(f"Remaining: {', '.join(remaining) if remaining else 'None'}")
-        print(f"To Delve Deeper: {', '.join(delving) if delving else 'None'}")
-        print("-----------------------")
+    try:
+        speculative.prefetch(likely_next(remaining, delving))
+        while count < max_questions and (remaining or delving):
+            if delving:
+                topic = delving.pop(0)
+                context = topic
+                print(f"\nDiving deeper into: {topic}")
+            else:
+                topic = remaining.pop(0)
+                context = ""
+                print(f"\nAsking about: {topic}")
+
+            question = simulate_llm_question_generation(topic, context, speculative.take(topic, context))
+            print(f"\nAI: {question}")
+
+            # Draft the next question while the candidate is answering this one
+            speculative.prefetch(likely_next(remaining, delving))
+            response = input("You: ").strip()
+            if not response:
+                print("No response received. Skipping to next.")
+                continue
+
+            count += 1
+            history.append((question, response))
+
+            analysis = simulate_llm_response_analysis(question, response)
+
+            for t in analysis["covered_topics"]:
+                covered.add(t)
+                if t in remaining:
+                    remaining.remove(t)
+
+            for sub in analysis["needs_delving"]:
+                if sub not in delving:
+                    delving.append(sub)
+
+            # The analysis decides what comes next: start on a new deep dive at
+            # once and drop drafts for topics that were covered
+            speculative.keep_only(likely_next(remaining, delving))
+            speculative.prefetch(likely_next(remaining, delving))
+
+            # Interview status snapshot
+            print("\n--- Status Update ---")
+            print(f"Questions Asked: {count}/{max_questions}")
+            print(f"Covered: {', '.join(covered) if covered else 'None'}")
+            print(f"Remaining: {', '.join(remaining) if remaining else 'None'}")
+            print(f"To Delve Deeper: {', '.join(delving) if delving else 'None'}")
+            print("-----------------------")
+    finally:
+        # Also on Ctrl+C or an error from the model, so the drafting threads stop
+        speculative.close()
 
     # Final report
     print("\n--- Interview Concluded ---")
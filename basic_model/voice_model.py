@@ -1,37 +1,39 @@
-import spacy
 import random
 import time
 import pyttsx3
 import speech_recognition as sr
 from typing import List, Dict
+import os
+import sys
 
-engine = pyttsx3.init()
-engine.setProperty('rate', 150)     # Speed of speech (default ~200)
-engine.setProperty('volume', 2.0)  # Volume (0.0 to 1.0)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "model", "chat_web_ai"))
+from ai_int_app.nlp_service import get_nlp_service
+from ai_int_app.scoring import AnswerScorer
+from ai_int_app.taxonomy import TaxonomyMatcher
+from ai_int_app.speech import SpeechWorker
+
+def init_engine():
+    engine = pyttsx3.init()
+    engine.setProperty('rate', 150)     # Speed of speech (default ~200)
+    engine.setProperty('volume', 2.0)  # Volume (0.0 to 1.0)
+    return engine
+
+# Speech plays on a background thread so the interview loop keeps going
+speech_output = SpeechWorker(init_engine)
 
 def speak(text: str):
-    engine.say(text)
-    engine.runAndWait()
- 
+    return speech_output.say(text)
+
 
-def load_nlp_model(model_name: str = "en_core_web_sm"):
+def load_nlp_model(model_name: str = "en_core_web_sm") -> TaxonomyMatcher:
     try:
-        return spacy.load(model_name)
+        service = get_nlp_service(model_name)
+        service.warm_up()
+        return service.matcher
     except OSError:
         raise SystemExit(f"Model '{model_name}' not found. Please run: python -m spacy download {model_name}")
 
-nlp = load_nlp_model()
-
-SKILL_KEYWORDS = set([
-    "python", "java", "javascript", "react", "node.js", "aws", "azure", "gcp", "sql", "nosql",
-    "docker", "kubernetes", "git", "api", "rest", "graphql", "frontend", "backend", "fullstack",
-    "machine learning", "ai", "deep learning", "data science", "cloud", "agile", "scrum", "devops",
-    "testing", "security", "linux", "windows", "mobile", "web", "database", "design patterns",
-    "architecture", "communication", "teamwork", "problem solving", "leadership", "management",
-    "analytical", "critical thinking", "collaboration", "mentoring", "debugging", "scalability",
-    "performance", "optimization", "microservices", "ci/cd", "data structures", "algorithms", "oop",
-    "object-oriented programming"
-])
+skill_matcher = load_nlp_model()
 
 POSITIVE_REMARKS = [
     "Great explanation!",
@@ -44,18 +46,7 @@ POSITIVE_REMARKS = [
 
 # Extract skills from job description
 def extract_skills_from_jd(text: str) -> List[str]:
-    doc = nlp(text.lower())
-    found = set()
-
-    for token in doc:
-        if token.text in SKILL_KEYWORDS:
-            found.add(token.text)
-
-    for chunk in doc.noun_chunks:
-        if chunk.text.strip() in SKILL_KEYWORDS:
-            found.add(chunk.text.strip())
-
-    return sorted(found)
+    return skill_matcher.extract(text)
 
 # Generate a relevant question for a topic
 def generate_question(topic: str) -> str:
@@ -68,17 +59,21 @@ def generate_question(topic: str) -> str:
     ]
     return random.choice(templates)
 
-# Simulated comparison to ideal answers (mocked)
-def is_response_good(topic: str, response: str) -> bool:
-    keywords = topic.split()
-    return all(word.lower() in response.lower() for word in keywords)
+# Graded comparison with the topic's rubric (see ai_int_app/scoring.py)
+answer_scorer = AnswerScorer()
+
+def score_response(topic: str, response: str) -> float:
+    return answer_scorer.score(topic, response)
 
 # Provide positive reinforcement and suggestions
-def provide_feedback(is_good: bool) -> str:
-    if is_good:
+def provide_feedback(score: float) -> str:
+    grade = answer_scorer.grade(score)
+    if grade == "good":
         return random.choice(POSITIVE_REMARKS)
-    else:
+    elif grade == "partial":
         return "That's a good start! Consider including more specific details or examples."
+    else:
+        return "Could you go deeper? Talk about what you built, the problems you solved and the results."
     
 def run_interview(job_description: str, max_questions: int = 5):
     print("\n--- AI Interview Started ---\n")
@@ -89,6 +84,7 @@ def run_interview(job_description: str, max_questions: int = 5):
     if not topics:
         print("Could not identify relevant topics from job description.")
         speak("Sorry, I could not identify relevant skills in the job description.")
+        speech_output.wait_idle()
         return
 
     print(f"Identified Skills: {', '.join(topics)}")
@@ -100,7 +96,9 @@ def run_interview(job_description: str, max_questions: int = 5):
         print(f"\n AI: {question}")
         speak(question)
 
+        # The candidate may start typing while the question is still read out
         response = input(" You: ").strip()
+        speech_output.cancel()
 
         if not response:
             print("!! No response detected. Skipping topic.\n")
@@ -108,14 +106,15 @@ def run_interview(job_description: str, max_questions: int = 5):
             continue
 
         # Simulated analysis
-        good = is_response_good(topic, response)
-        feedback = provide_feedback(good)
+        score = score_response(topic, response)
+        feedback = provide_feedback(score)
         print(f"🤖 AI Feedback: {feedback}")
         speak(feedback)
         asked += 1
 
     print("\n Interview Concluded")
     speak("Great job! The interview is complete. Keep practicing for more confidence.")
+    speech_output.wait_idle()
 
 
 # Demo mode with optional user JD
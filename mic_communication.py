@@ -1,36 +1,39 @@
-import spacy
 import random
 import pyttsx3
-import speech_recognition as sr
 from typing import List
-
-# Initialize text-to-speech engine
-engine = pyttsx3.init()
-engine.setProperty('rate', 150)
-engine.setProperty('volume', 1.0)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "model", "chat_web_ai"))
+from ai_int_app.nlp_service import get_nlp_service
+from ai_int_app.scoring import AnswerScorer
+from ai_int_app.taxonomy import TaxonomyMatcher
+from ai_int_app.speech import (
+    MicrophoneSource, SpeechWorker, StreamingCapture, TranscriptionError, make_backend
+)
+
+# Initialize text-to-speech engine (on the speech worker's thread)
+def init_engine():
+    engine = pyttsx3.init()
+    engine.setProperty('rate', 150)
+    engine.setProperty('volume', 1.0)
+    return engine
+
+speech_output = SpeechWorker(init_engine)
 
 def speak(text: str):
-    engine.say(text)
-    engine.runAndWait()
+    # Returns at once; the Future resolves when the text has been spoken
+    return speech_output.say(text)
 
-def load_nlp_model(model_name: str = "en_core_web_sm"):
+def load_nlp_model(model_name: str = "en_core_web_sm") -> TaxonomyMatcher:
     try:
-        return spacy.load(model_name)
+        service = get_nlp_service(model_name)
+        service.warm_up()
+        return service.matcher
     except OSError:
         raise SystemExit(f"Model '{model_name}' not found. Please run: python -m spacy download {model_name}")
 
-nlp = load_nlp_model()
-
-SKILL_KEYWORDS = set([
-    "python", "java", "javascript", "react", "node.js", "aws", "azure", "gcp", "sql", "nosql",
-    "docker", "kubernetes", "git", "api", "rest", "graphql", "frontend", "backend", "fullstack",
-    "machine learning", "ai", "deep learning", "data science", "cloud", "agile", "scrum", "devops",
-    "testing", "security", "linux", "windows", "mobile", "web", "database", "design patterns",
-    "architecture", "communication", "teamwork", "problem solving", "leadership", "management",
-    "analytical", "critical thinking", "collaboration", "mentoring", "debugging", "scalability",
-    "performance", "optimization", "microservices", "ci/cd", "data structures", "algorithms", "oop",
-    "object-oriented programming"
-])
+skill_matcher = load_nlp_model()
 
 POSITIVE_REMARKS = [
     "Great explanation!",
@@ -42,18 +45,7 @@ POSITIVE_REMARKS = [
 ]
 
 def extract_skills_from_jd(text: str) -> List[str]:
-    doc = nlp(text.lower())
-    found = set()
-
-    for token in doc:
-        if token.text in SKILL_KEYWORDS:
-            found.add(token.text)
-
-    for chunk in doc.noun_chunks:
-        if chunk.text.strip() in SKILL_KEYWORDS:
-            found.add(chunk.text.strip())
-
-    return sorted(found)
+    return skill_matcher.extract(text)
 
 def generate_question(topic: str) -> str:
     templates = [
@@ -65,39 +57,56 @@ def generate_question(topic: str) -> str:
     ]
     return random.choice(templates)
 
-def is_response_good(topic: str, response: str) -> bool:
-    keywords = topic.split()
-    return all(word.lower() in response.lower() for word in keywords)
+# Graded comparison with the topic's rubric (see ai_int_app/scoring.py)
+answer_scorer = AnswerScorer()
+
+def score_response(topic: str, response: str) -> float:
+    return answer_scorer.score(topic, response)
 
-def provide_feedback(is_good: bool) -> str:
-    if is_good:
+def provide_feedback(score: float) -> str:
+    grade = answer_scorer.grade(score)
+    if grade == "good":
         return random.choice(POSITIVE_REMARKS)
-    else:
+    elif grade == "partial":
         return "That's a good start! Consider including more specific details or examples."
+    else:
+        return "Could you go deeper? Talk about what you built, the problems you solved and the results."
+
+# One capture session for the whole interview: the microphone stays open
+# and ambient noise is calibrated once instead of before every answer
+_capture = None
+
+def get_capture() -> StreamingCapture:
+    global _capture
+    if _capture is None:
+        backend = make_backend(os.environ.get("STT_BACKEND", "google"))
+        _capture = StreamingCapture(
+            MicrophoneSource(), backend, on_partial=lambda text: print(f"   ... {text}")
+        )
+        print("Calibrating microphone for ambient noise...")
+        _capture.calibrate()
+    return _capture
 
 def get_voice_input(timeout=5) -> str:
-    recognizer = sr.Recognizer()
-    mic = sr.Microphone()
+    capture = get_capture()
 
     print("🎤 Listening... (speak clearly)")
-    with mic as source:
-        recognizer.adjust_for_ambient_noise(source)
-        try:
-            audio = recognizer.listen(source, timeout=timeout)
-            response = recognizer.recognize_google(audio)
-            print(f"You said: {response}")
-            return response
-        except sr.WaitTimeoutError:
-            print("⏱️ No speech detected (timeout).")
-        except sr.UnknownValueError:
-            print("Could not understand the audio.")
-        except sr.RequestError as e:
-            print(f"API error: {e}")
-
-    return ""
+    try:
+        response = capture.listen(timeout=timeout)
+    except TranscriptionError as e:
+        print(f"API error: {e}")
+        return ""
+
+    if response:
+        print(f"You said: {response}")
+    else:
+        print("⏱️ No speech detected (timeout) or could not understand the audio.")
+    return response
 
 def run_interview(job_description: str, max_questions: int = 5):
     print("\n--- AI Interview Started ---\n")
+    # Open and calibrate the microphone before anything is played
+    get_capture()
     speak("Welcome to your AI-powered interview session.")
 
     topics = extract_skills_from_jd(job_description)
@@ -105,6 +114,7 @@ def run_interview(job_description: str, max_questions: int = 5):
     if not topics:
         print("Could not identify relevant topics from job description.")
         speak("Sorry, I could not identify relevant skills in the job description.")
+        speech_output.wait_idle()
         return
 
     print(f"Identified Skills: {', '.join(topics)}")
@@ -114,7 +124,9 @@ def run_interview(job_description: str, max_questions: int = 5):
     for topic in topics[:max_questions]:
         question = generate_question(topic)
         print(f"\n AI: {question}")
-        speak(question)
+        # This question was prepared while the previous feedback was playing;
+        # listen only once it has been read out so the mic does not hear it
+        speak(question).result()
 
         response = get_voice_input()
 
@@ -123,14 +135,15 @@ def run_interview(job_description: str, max_questions: int = 5):
             speak("No response detected. Let's skip this one.")
             continue
 
-        good = is_response_good(topic, response)
-        feedback = provide_feedback(good)
+        score = score_response(topic, response)
+        feedback = provide_feedback(score)
         print(f"AI Feedback: {feedback}")
         speak(feedback)
         asked += 1
 
     print("\n Interview Concluded")
     speak("Great job! The interview is complete. Keep practicing for more confidence.")
+    speech_output.wait_idle()
 
 # Run program
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Admission control for the interview endpoints. At most ``max_in_flight``
+# calls do CPU work at once; the rest queue, turns of interviews already
+# under way ahead of new starts, and a call that cannot get a slot within
+# ``deadline`` seconds is refused at once with a Retry-After instead of
+# adding to everyone's latency. Each interview and each client address also
+# has a token bucket, so one client cannot flood the queue.
+#
+# Requests of one process may run on several event loops (WSGI and the test
+# client start one per async view), so the state is guarded by a lock and
+# waiters are woken on their own loop.
+
+IN_PROGRESS, NEW = 0, 1
+PRIORITY_NAMES = {IN_PROGRESS: "in_progress", NEW: "new"}
+
+
+class Rejected(Exception):
+    """A call that was not admitted: HTTP ``status``, why, and when to retry."""
+
+    def __init__(self, status: int, reason: str, retry_after: float):
+        super().__init__(f"Server busy ({reason}), retry in {math.ceil(retry_after)}s.")
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "stamp")
+
+    def __init__(self, tokens: float, stamp: float):
+        self.tokens = tokens
+        self.stamp = stamp
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "loop", "future", "granted", "dead")
+
+    def __init__(self, priority: int, seq: int, loop, future):
+        self.priority = priority
+        self.seq = seq
+        self.loop = loop
+        self.future = future
+        self.granted = False
+        self.dead = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+def _resolve(future, exception: Optional[BaseException] = None):
+    if future.done():
+        return
+    if exception is None:
+        future.set_result(None)
+    else:
+        future.set_exception(exception)
+
+
+class AdmissionController:
+    """
+    ``acquire(priority, key)`` admits a call or raises Rejected; every
+    admitted call must ``release`` the ticket it got. ``key`` (a running
+    interview or a client address) selects the token bucket refilled at
+    ``rate`` calls per second up to ``burst``, or at the (rate, burst) that
+    ``limits`` gives the key's prefix (the part before the first colon);
+    calls without a key are not rate limited. ``on_shed(reason,
+    priority)`` is called for every refused call.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        max_queue: int = 64,
+        deadline: float = 2.0,
+        rate: float = 1.0,
+        burst: int = 5,
+        max_buckets: int = 100000,
+        limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        on_shed: Optional[Callable[[str, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        enabled: bool = True,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.deadline = deadline
+        self.rate = rate
+        self.burst = burst
+        self.max_buckets = max_buckets
+        self.limits = dict(limits or {})
+        self.on_shed = on_shed
+        self.clock = clock
+        self.enabled = enabled
+        self.in_flight = 0
+        # Moving average of how long an admitted call holds its slot
+        self.service_time = 0.0
+        self.shed: Dict[str, int] = {}
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._queue: List[_Waiter] = []
+        self._waiting = {IN_PROGRESS: 0, NEW: 0}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, **overrides) -> "AdmissionController":
+        options = {
+            "max_in_flight": settings.ADMISSION_MAX_IN_FLIGHT,
+            "max_queue": settings.ADMISSION_MAX_QUEUE,
+            "deadline": settings.ADMISSION_DEADLINE,
+            "rate": settings.ADMISSION_RATE,
+            "burst": settings.ADMISSION_BURST,
+            "limits": {
+                "client": (settings.ADMISSION_CLIENT_RATE, settings.ADMISSION_CLIENT_BURST),
+                "audio": (settings.ADMISSION_AUDIO_RATE, settings.ADMISSION_AUDIO_BURST),
+            },
+            "enabled": settings.ADMISSION_ENABLED,
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    @property
+    def queued(self) -> Dict[str, int]:
+        return {PRIORITY_NAMES[priority]: count for priority, count in self._waiting.items()}
+
+    def _shed(self, status: int, reason: str, priority: int, retry_after: float) -> Rejected:
+        # Called with the lock held
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        if self.on_shed is not None:
+            self.on_shed(reason, PRIORITY_NAMES[priority])
+        return Rejected(status, reason, retry_after)
+
+    def _take_token(self, key: str, priority: int, now: float):
+        rate, burst = self.limits.get(key.partition(":")[0], (self.rate, self.burst))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(burst, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.stamp) * rate)
+            bucket.stamp = now
+        if bucket.tokens < 1:
+            raise self._shed(429, "rate_limited", priority, (1 - bucket.tokens) / rate)
+        bucket.tokens -= 1
+
+    def _expected_wait(self, priority: int) -> float:
+        ahead = self._waiting[IN_PROGRESS] if priority == IN_PROGRESS else sum(self._waiting.values())
+        return (ahead // self.max_in_flight + 1) * self.service_time
+
+    def _evict_newest_start(self) -> bool:
+        starts = [w for w in self._queue if w.priority == NEW and not w.dead]
+        if not starts:
+            return False
+        waiter = max(starts, key=lambda w: w.seq)
+        self._abandon(waiter)
+        rejected = self._shed(503, "evicted", NEW, self._expected_wait(NEW))
+        waiter.loop.call_soon_threadsafe(_resolve, waiter.future, rejected)
+        return True
+
+    async def acquire(self, priority: int = NEW, key: Optional[str] = None) -> float:
+        """Wait for a slot; returns the ticket to release. Raises Rejected."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            now = self.clock()
+            if key is not None:
+                self._take_token(key, priority, now)
+            if self.in_flight < self.max_in_flight:
+                self.in_flight += 1
+                return now
+            expected = self._expected_wait(priority)
+            if expected > self.deadline:
+                raise self._shed(503, "deadline", priority, expected)
+            if sum(self._waiting.values()) >= self.max_queue:
+                # A full queue makes room for a turn by dropping the newest start
+                if priority == NEW or not self._evict_newest_start():
+                    raise self._shed(503, "queue_full", priority, max(expected, self.deadline))
+            waiter = _Waiter(priority, next(self._seq), loop, loop.create_future())
+            heapq.heappush(self._queue, waiter)
+            self._waiting[priority] += 1
+
+        try:
+            await asyncio.wait_for(waiter.future, self.deadline)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if not waiter.granted:
+                    if waiter.dead:
+                        # Evicted just as the deadline passed; already counted
+                        raise Rejected(503, "evicted", self._expected_wait(priority))
+                    self._abandon(waiter)
+                    raise self._shed(503, "deadline", priority, self._expected_wait(priority))
+        except asyncio.CancelledError:
+            # The client went away; pass on a slot handed over meanwhile
+            with self._lock:
+                if waiter.granted:
+                    self._hand_off()
+                elif not waiter.dead:
+                    self._abandon(waiter)
+            raise
+        return self.clock()
+
+    def _abandon(self, waiter: _Waiter):
+        waiter.dead = True
+        self._waiting[waiter.priority] -= 1
+
+    def _hand_off(self):
+        # Called with the lock held: the slot goes to the best live waiter
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            if waiter.dead:
+                continue
+            waiter.granted = True
+            self._waiting[waiter.priority] -= 1
+            waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+            return
+        self.in_flight -= 1
+
+    def release(self, ticket: float):
+        """Hand the slot to the next waiter, in-progress interviews first."""
+        with self._lock:
+            held = self.clock() - ticket
+            self.service_time = held if not self.service_time else 0.8 * self.service_time + 0.2 * held
+            self._hand_off()
+
+    @asynccontextmanager
+    async def admitted(self, priority: int = NEW, key: Optional[str] = None):
+        ticket = await self.acquire(priority, key)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "shed": dict(self.shed),
+                "service_time_ms": round(1000 * self.service_time, 3),
+                "buckets": len(self._buckets),
+            }
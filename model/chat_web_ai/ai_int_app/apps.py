@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def enable_sqlite_wal(sender, connection, **kwargs):
+    # WAL lets the results write-behind thread commit while requests read
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
 
 
 class AiIntAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_int_app'
+
+    def ready(self):
+        connection_created.connect(enable_sqlite_wal)
+
+        from .metrics import registry
+
+        # When off, spans and counters do nothing and TimingMiddleware drops itself
+        registry.enabled = settings.METRICS_ENABLED
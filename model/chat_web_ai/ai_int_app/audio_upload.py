@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+from .speech import Segmenter
+
+# Answers uploaded as audio (see process.txt): while the candidate speaks the
+# client sends 16-bit mono PCM in numbered chunks. Every stretch of speech a
+# chunk completes is submitted for transcription right away, so when the last
+# chunk arrives only the final segment is still being transcribed.
+
+SAMPLE_WIDTH = 2
+SAMPLE_RATES = range(8000, 48001)
+
+
+class UploadError(Exception):
+    """A chunk was rejected; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class AudioUpload:
+    """
+    One answer being uploaded. ``submit(segment, sample_rate)`` starts the
+    transcription of a segment and returns its future.
+    """
+
+    def __init__(
+        self,
+        interview_id: str,
+        submit: Callable[[bytes, int], Future],
+        sample_rate: int,
+        max_seconds: float = 180,
+        **segmenter_options,
+    ):
+        self.interview_id = interview_id
+        self.submit = submit
+        self.sample_rate = sample_rate
+        self.max_bytes = int(max_seconds * sample_rate) * SAMPLE_WIDTH
+        self.segmenter = Segmenter(sample_rate, SAMPLE_WIDTH, **segmenter_options)
+        self.futures: List[Future] = []
+        self.next_seq = 0
+        self.received = 0
+        self.finished = False
+        self.touched = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def seconds(self) -> float:
+        return self.received / SAMPLE_WIDTH / self.sample_rate
+
+    def add(self, seq: int, pcm: bytes):
+        with self.lock:
+            if self.finished:
+                raise UploadError("Upload already finished.", 409)
+            if seq != self.next_seq:
+                raise UploadError(f"Expected chunk {self.next_seq}, got {seq}.", 409)
+            if self.received + len(pcm) > self.max_bytes:
+                raise UploadError("Answer audio is too long.", 413)
+            self.next_seq += 1
+            self.received += len(pcm)
+            self.touched = time.monotonic()
+            for segment in self.segmenter.feed(pcm):
+                self.futures.append(self.submit(segment, self.sample_rate))
+
+    def finish(self) -> List[Future]:
+        """Submit whatever speech is left; the futures of every segment, in order."""
+        with self.lock:
+            if not self.finished:
+                self.finished = True
+                segment = self.segmenter.flush()
+                if segment:
+                    self.futures.append(self.submit(segment, self.sample_rate))
+            return list(self.futures)
+
+    def partial(self) -> str:
+        """Transcript of the contiguous run of finished segments."""
+        texts = []
+        for future in list(self.futures):
+            if not future.done() or future.cancelled() or future.exception() is not None:
+                break
+            if future.result():
+                texts.append(future.result())
+        return " ".join(texts)
+
+    async def transcript(self) -> str:
+        """
+        The whole transcript, once the last segment is transcribed. Raises
+        the backend's TranscriptionError.
+        """
+        texts = [await asyncio.wrap_future(future) for future in self.finish()]
+        return " ".join(text for text in texts if text)
+
+    def cancel(self):
+        for future in self.futures:
+            future.cancel()
+
+
+class UploadStore:
+    """
+    In-process registry of the uploads in progress, one per interview and
+    at most ``max_uploads`` at a time. Chunk 0 starts an upload and replaces
+    any earlier one of the same interview (the answer was re-recorded).
+    Uploads idle for ``ttl`` seconds are dropped.
+    """
+
+    def __init__(
+        self,
+        submit: Callable[[bytes, int], Future],
+        max_uploads: int = 32,
+        ttl: float = 300,
+        max_seconds: float = 180,
+        **segmenter_options,
+    ):
+        self.submit = submit
+        self.max_uploads = max_uploads
+        self.ttl = ttl
+        self.max_seconds = max_seconds
+        self.segmenter_options = segmenter_options
+        self._uploads: Dict[str, AudioUpload] = {}
+        self._lock = threading.Lock()
+
+    def _purge_expired(self, now: float):
+        for key, upload in list(self._uploads.items()):
+            if now - upload.touched > self.ttl:
+                upload.cancel()
+                del self._uploads[key]
+
+    def chunk(self, interview_id: str, seq: int, pcm: bytes, sample_rate: int) -> AudioUpload:
+        """Add chunk ``seq`` of an interview's answer; raises UploadError."""
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            upload = self._uploads.get(interview_id)
+            if seq == 0:
+                if sample_rate not in SAMPLE_RATES:
+                    raise UploadError(f"Unsupported sample rate {sample_rate}.")
+                if upload is not None:
+                    upload.cancel()
+                elif len(self._uploads) >= self.max_uploads:
+                    raise UploadError("Too many answers are being uploaded, try again shortly.", 503)
+                upload = self._uploads[interview_id] = AudioUpload(
+                    interview_id, self.submit, sample_rate, self.max_seconds, **self.segmenter_options
+                )
+            elif upload is None:
+                raise UploadError("Unknown upload, start with chunk 0.", 404)
+            elif sample_rate != upload.sample_rate:
+                raise UploadError("The sample rate changed during the upload.")
+        upload.add(seq, pcm)
+        return upload
+
+    def pop(self, interview_id: str) -> Optional[AudioUpload]:
+        with self._lock:
+            return self._uploads.pop(interview_id, None)
+
+    def __len__(self):
+        return len(self._uploads)
@@ -0,0 +1,250 @@
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import wave
+from typing import Callable, Dict, List, Optional, Sequence
+
+from django.test import Client
+
+from . import views
+from .latency import summarize
+from .skills import SKILL_KEYWORDS
+from .speech import ScriptedBackend, SilentEngine, SpeechWorker, StreamingCapture, WavSource
+
+# Benchmarks for the three hot paths: topic extraction, the interview API and
+# the voice loop. Everything is seeded, so two runs on the same commit see the
+# same inputs and their JSON reports can be compared directly.
+
+FILLER_WORDS = (
+    "we are looking for a motivated engineer to join our team and help build "
+    "reliable products for customers across the world you will work closely "
+    "with designers and product managers on new features review code mentor "
+    "others and take ownership of services in production experience with"
+).split()
+
+
+def generate_jd(words: int, rng: random.Random, skill_ratio: float = 0.05) -> str:
+    keywords = sorted(SKILL_KEYWORDS)
+    return " ".join(
+        rng.choice(keywords) if rng.random() < skill_ratio else rng.choice(FILLER_WORDS)
+        for _ in range(words)
+    )
+
+
+def generate_corpus(lengths: Sequence[int], per_length: int, seed: int = 0) -> Dict[int, List[str]]:
+    rng = random.Random(seed)
+    return {length: [generate_jd(length, rng) for _ in range(per_length)] for length in lengths}
+
+
+def write_wav(path: str, pattern, rate: int = 16000):
+    """Write (seconds, amplitude) pieces of a 440 Hz tone as 16-bit mono."""
+    frames = bytearray()
+    for seconds, amplitude in pattern:
+        for i in range(int(seconds * rate)):
+            sample = int(amplitude * math.sin(2 * math.pi * 440 * i / rate))
+            frames += sample.to_bytes(2, "little", signed=True)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(bytes(frames))
+
+
+def _timed(func: Callable, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+# -------------------- Extraction --------------------
+
+def bench_extraction(matcher, lengths=(50, 200, 1000, 5000), per_length: int = 50, seed: int = 0) -> Dict:
+    """
+    Uncached extraction throughput per JD length, one JD at a time and
+    batched through ``extract_many``.
+    """
+    corpus = generate_corpus(lengths, per_length, seed)
+    matcher.extract(corpus[lengths[0]][0])  # first call pays for lazy setup
+
+    results = {}
+    for length, jds in corpus.items():
+        single = [_timed(matcher.extract, jd) for jd in jds]
+        batched = _timed(matcher.extract_many, jds)
+        total = sum(single)
+        results[str(length)] = {
+            "jds": len(jds),
+            "jds_per_second": round(len(jds) / total, 2) if total else None,
+            "words_per_second": round(len(jds) * length / total, 2) if total else None,
+            "batched_jds_per_second": round(len(jds) / batched, 2) if batched else None,
+            **summarize(single),
+        }
+    return results
+
+
+# -------------------- Interview API --------------------
+
+def _post(client: Client, payload: Dict) -> Dict:
+    response = client.post("/interview/", json.dumps(payload), content_type="application/json")
+    if response.status_code != 200:
+        raise RuntimeError(f"interview_api returned {response.status_code} for {payload}")
+    return response.json()
+
+
+def bench_api(requests: int = 200, jd_words: int = 200, seed: int = 0, client: Optional[Client] = None) -> Dict:
+    """
+    Latency of each interview_api call type through the Django test client:
+    topic extraction (fresh and repeated JDs), question generation and
+    answer feedback, plus the session protocol's start and turn calls.
+    Needs a database, e.g. the test database set up by ``run_benchmarks``.
+    Admission control is off for the run, as every call comes from the one
+    client address its rate limit would soon refuse.
+    """
+    client = client or Client()
+    rng = random.Random(seed)
+    jds = [generate_jd(jd_words, rng) for _ in range(requests)]
+    repeated_jd = jds[0]
+
+    timings: Dict[str, List[float]] = {
+        "topics_fresh": [], "topics_cached": [], "question": [], "feedback": [],
+        "session_start": [], "session_turn": [],
+    }
+
+    def timed_post(kind: str, payload: Dict) -> Dict:
+        start = time.perf_counter()
+        data = _post(client, payload)
+        timings[kind].append(time.perf_counter() - start)
+        return data
+
+    admission_enabled, views.admission.enabled = views.admission.enabled, False
+    try:
+        _post(client, {"jd": repeated_jd})
+        for jd in jds:
+            topics = timed_post("topics_fresh", {"jd": jd})["topics"] or ["python"]
+            timed_post("topics_cached", {"jd": repeated_jd})
+            topic = rng.choice(topics)
+            timed_post("question", {"topic": topic})
+            timed_post("feedback", {"topic": topic, "response": f"I used {topic} on several projects."})
+
+            session = timed_post("session_start", {"action": "start", "jd": jd})
+            if not session["done"]:
+                timed_post("session_turn", {
+                    "action": "turn", "interview_id": session["interview_id"],
+                    "response": f"I used {session['topic']} on several projects.",
+                })
+            views.interview_sessions.discard(session["interview_id"])
+    finally:
+        views.admission.enabled = admission_enabled
+        # Write the buffered results while the benchmark's database is still there
+        views.results_buffer.flush()
+    return {kind: summarize(seconds) for kind, seconds in timings.items()}
+
+
+# -------------------- Voice loop --------------------
+
+ANSWER_PATTERN = [(0.3, 20), (0.8, 5000), (0.6, 20), (0.8, 5000), (1.5, 20)]
+
+
+def _fixtures(wav_dir: Optional[str], workdir: str, turns: int):
+    """
+    Recorded fixtures are ``*.wav`` files in ``wav_dir`` with an optional
+    ``.txt`` transcript next to each; otherwise synthetic answers are used.
+    """
+    if wav_dir:
+        paths = sorted(os.path.join(wav_dir, name) for name in os.listdir(wav_dir) if name.endswith(".wav"))
+        if not paths:
+            raise ValueError(f"No .wav fixtures in {wav_dir}.")
+    else:
+        paths = [os.path.join(workdir, "answer.wav")]
+        write_wav(paths[0], ANSWER_PATTERN)
+
+    fixtures = []
+    for i in range(turns):
+        path = paths[i % len(paths)]
+        transcript_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(transcript_path):
+            with open(transcript_path, encoding="utf-8") as transcript:
+                transcripts = [transcript.read().strip()]
+        else:
+            transcripts = ["I have used python", "for several years"]
+        fixtures.append((path, transcripts))
+    return fixtures
+
+
+def bench_voice(turns: int = 20, wav_dir: Optional[str] = None, word_seconds: float = 0.0) -> Dict:
+    """
+    Times the loop mic_communication.py runs for every question: speak the
+    question, capture and transcribe the answer, score it and speak the
+    feedback. Audio comes from WAV fixtures read as fast as possible, so the
+    numbers are processing overhead rather than real-time durations.
+    """
+    timings: Dict[str, List[float]] = {"speak_question": [], "listen": [], "feedback": [], "turn": []}
+    speech_output = SpeechWorker(lambda: SilentEngine(word_seconds))
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for path, transcripts in _fixtures(wav_dir, workdir, turns):
+                capture = StreamingCapture(WavSource(path), ScriptedBackend(transcripts))
+                try:
+                    capture.calibrate(0.2)
+                    turn_start = time.perf_counter()
+                    timings["speak_question"].append(
+                        _timed(lambda: speech_output.say(views.generate_question("python")).result())
+                    )
+
+                    start = time.perf_counter()
+                    answer = capture.listen(timeout=5)
+                    timings["listen"].append(time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    speech_output.say(views.evaluate_response("python", answer)).result()
+                    timings["feedback"].append(time.perf_counter() - start)
+                    timings["turn"].append(time.perf_counter() - turn_start)
+                finally:
+                    capture.close()
+    finally:
+        speech_output.close()
+    return {phase: summarize(seconds) for phase, seconds in timings.items()}
+
+
+# -------------------- Report --------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report_metadata(model: str) -> Dict:
+    return {
+        "commit": _git_commit(),
+        "model": model,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(current: Dict, baseline: Dict, prefix: str = "") -> List[str]:
+    """
+    One line per numeric metric present in both reports, with the relative
+    change from ``baseline``.
+    """
+    lines = []
+    for key, value in current.items():
+        if key == "meta" or key not in baseline:
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and isinstance(baseline[key], dict):
+            lines.extend(compare(value, baseline[key], f"{name}."))
+        elif isinstance(value, (int, float)) and isinstance(baseline[key], (int, float)) and baseline[key]:
+            change = 100 * (value - baseline[key]) / baseline[key]
+            lines.append(f"{name}: {baseline[key]} -> {value} ({change:+.1f}%)")
+    return lines
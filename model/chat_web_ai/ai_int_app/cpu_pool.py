@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional
+
+
+class CPUPool:
+    """
+    Runs CPU-bound work (topic extraction, answer scoring) off the event
+    loop on a bounded thread or process pool. At most ``max_concurrency``
+    calls are submitted at once; the rest wait on a semaphore without
+    holding a worker, so idle interviews cost nothing but their coroutine.
+
+    Functions sent to a process pool must be importable at module level.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_concurrency: int = 8):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown pool kind '{kind}', expected 'thread' or 'process'.")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.waiting = 0
+        self.running = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        # asyncio primitives belong to one loop; WSGI and the test client
+        # run each async view in a fresh loop
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="cpu-pool")
+            return self._executor
+
+    def _semaphore(self, loop) -> asyncio.Semaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return semaphore
+
+    def _adjust(self, waiting: int = 0, running: int = 0):
+        with self._lock:
+            self.waiting += waiting
+            self.running += running
+
+    async def run(self, func: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        self._adjust(waiting=1)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._adjust(waiting=-1)
+
+        self._adjust(running=1)
+        try:
+            return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+        finally:
+            self._adjust(running=-1)
+            semaphore.release()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Like ``run`` but returns a concurrent future, which outlives the event
+        loop of the request that submitted it. Not held to ``max_concurrency``;
+        callers bound their own submissions.
+        """
+        self._adjust(running=1)
+        future = self.executor.submit(func, *args, **kwargs)
+        future.add_done_callback(lambda _: self._adjust(running=-1))
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,78 @@
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from .admission import Rejected
+
+
+# Django 4.2's csrf_exempt and require_POST wrap views in plain functions,
+# which hides async views from the handler; these keep them coroutines.
+
+def async_csrf_exempt(view):
+    view.csrf_exempt = True
+    return view
+
+
+def async_require_POST(view):
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        return await view(request, *args, **kwargs)
+
+    return inner
+
+
+def async_profiled(profiler, tag):
+    """
+    Run the requests ``profiler`` picks under it and save one profile per
+    request, named after the view and ``tag(request)``. Requests that are
+    not picked only pay for the check.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if not profiler.active or not profiler.wanted(request.headers):
+                return await view(request, *args, **kwargs)
+            handle = profiler.start()
+            started = time.perf_counter()
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                profiler.stop(handle)
+                await sync_to_async(profiler.write)(
+                    handle, view.__name__, tag(request), time.perf_counter() - started
+                )
+
+        return inner
+
+    return decorator
+
+
+def async_admitted(controller, classify):
+    """
+    Admit requests through the AdmissionController ``controller``;
+    ``classify(request)`` gives a request's (priority, key). Refused
+    requests get the controller's status and a Retry-After header.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if not controller.enabled:
+                return await view(request, *args, **kwargs)
+            try:
+                ticket = await controller.acquire(*classify(request))
+            except Rejected as exc:
+                response = JsonResponse({"error": str(exc), "retry_after": exc.retry_after_header}, status=exc.status)
+                response["Retry-After"] = exc.retry_after_header
+                return response
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                controller.release(ticket)
+
+        return inner
+
+    return decorator
@@ -0,0 +1,144 @@
+import csv
+import io
+import json
+from typing import Dict, Iterator, List, Optional
+
+from .models import InterviewTurn
+
+# One row per answered turn, with the interview it belongs to
+EXPORT_COLUMNS = [
+    "interview_id", "candidate", "interview_topics", "started_at", "completed_at",
+    "turn_index", "topic", "question", "response", "feedback", "score", "answered_at",
+]
+
+_FIELDS = [
+    "pk", "interview_id", "interview__candidate", "interview__topics", "interview__started_at",
+    "interview__completed_at", "index", "topic", "question", "response", "feedback", "score", "answered_at",
+]
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def export_queryset(since=None, until=None, candidate: Optional[str] = None):
+    turns = InterviewTurn.objects.all()
+    if since is not None:
+        turns = turns.filter(answered_at__gte=since)
+    if until is not None:
+        turns = turns.filter(answered_at__lt=until)
+    if candidate:
+        turns = turns.filter(interview__candidate=candidate)
+    return turns
+
+
+def iter_row_chunks(queryset=None, chunk_size: int = 2000) -> Iterator[List[Dict]]:
+    """
+    Yield the rows of ``queryset`` (every turn by default) in chunks of at
+    most ``chunk_size``. Each chunk is its own query, continuing after the
+    last primary key seen, so no cursor stays open between chunks and memory
+    is bounded by one chunk however large the table is.
+    """
+    queryset = export_queryset() if queryset is None else queryset
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).order_by("pk").values_list(*_FIELDS)[:chunk_size])
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        yield [dict(zip(EXPORT_COLUMNS, row[1:])) for row in rows]
+        if len(rows) < chunk_size:
+            return
+
+
+# Spreadsheets run a cell starting with one of these as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return json.dumps(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        # Candidates type their responses; export them as text
+        return "'" + value
+    return "" if value is None else value
+
+
+def iter_csv(chunks: Iterator[List[Dict]]) -> Iterator[str]:
+    """Encode row chunks as CSV text, one string per chunk after the header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(row[column]) for column in EXPORT_COLUMNS] for row in chunk)
+        yield buffer.getvalue()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose bytes are handed out as they are written."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def iter_parquet(chunks: Iterator[List[Dict]]) -> Iterator[bytes]:
+    """
+    Encode row chunks as a Parquet file with one row group per chunk,
+    yielding the bytes of each row group once written. Requires pyarrow,
+    which is checked before anything is yielded.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow).") from exc
+    return _parquet_row_groups(pa, pq, chunks)
+
+
+def _parquet_row_groups(pa, pq, chunks):
+    schema = pa.schema([
+        ("interview_id", pa.string()),
+        ("candidate", pa.string()),
+        ("interview_topics", pa.list_(pa.string())),
+        ("started_at", pa.timestamp("us", tz="UTC")),
+        ("completed_at", pa.timestamp("us", tz="UTC")),
+        ("turn_index", pa.int64()),
+        ("topic", pa.string()),
+        ("question", pa.string()),
+        ("response", pa.string()),
+        ("feedback", pa.string()),
+        ("score", pa.float64()),
+        ("answered_at", pa.timestamp("us", tz="UTC")),
+    ])
+    sink = _Drain()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            yield sink.take()
+    # The footer is written on close
+    yield sink.take()
+
+
+def iter_export(fmt: str, chunks: Iterator[List[Dict]]):
+    if fmt == "csv":
+        return iter_csv(chunks)
+    if fmt == "parquet":
+        return iter_parquet(chunks)
+    raise ValueError(f"Unknown export format {fmt!r}; use one of {sorted(EXPORT_FORMATS)}")
@@ -0,0 +1,127 @@
+import csv
+import json
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.db import transaction
+
+from .models import JobDescription
+from .nlp_service import SPACY_MODEL, extract_in_worker, get_nlp_service, init_extraction_worker
+from .question_bank import QuestionBank, get_question_bank
+from .taxonomy import TaxonomyMatcher
+
+def load_matcher(model_name: str = SPACY_MODEL) -> TaxonomyMatcher:
+    return get_nlp_service(model_name).matcher
+
+
+def iter_jd_records(lines: Iterable[str], fmt: str) -> Iterator[Dict]:
+    """
+    Lazily parse JD records from JSONL or CSV lines. Each record needs a
+    ``description`` (or ``jd``) and may carry ``title`` and ``id``; a record
+    with an ``id`` updates that JobDescription instead of creating one.
+    """
+    if fmt == "jsonl":
+        rows = (json.loads(line) for line in lines if line.strip())
+    elif fmt == "csv":
+        rows = csv.DictReader(lines)
+    else:
+        raise ValueError(f"Unsupported format '{fmt}', expected 'jsonl' or 'csv'.")
+
+    for row in rows:
+        description = (row.get("description") or row.get("jd") or "").strip()
+        record = {"title": (row.get("title") or "").strip()[:255], "description": description}
+        if row.get("id"):
+            record["id"] = int(row["id"])
+        yield record
+
+
+def guess_format(filename: str) -> str:
+    return "csv" if filename.lower().endswith(".csv") else "jsonl"
+
+
+def _chunked(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _save_chunk(chunk: List[Dict], topics: List[List[str]], stats: Counter, bank: QuestionBank):
+    new, changed = [], {}
+    bank.ensure_topics(topic for found in topics for topic in found)
+    for record, found in zip(chunk, topics):
+        if not record["description"]:
+            stats["skipped"] += 1
+        elif "id" in record:
+            changed[record["id"]] = (record, found)
+        else:
+            new.append(JobDescription(
+                title=record["title"] or "Untitled", description=record["description"], topics=found,
+                question_plan=bank.plan(found),
+            ))
+
+    with transaction.atomic():
+        if new:
+            JobDescription.objects.bulk_create(new)
+            stats["created"] += len(new)
+        if changed:
+            existing = JobDescription.objects.in_bulk(list(changed))
+            for pk, jd in existing.items():
+                record, found = changed[pk]
+                jd.title = record["title"] or jd.title
+                jd.description = record["description"]
+                jd.topics = found
+                jd.question_plan = bank.plan(found)
+            JobDescription.objects.bulk_update(existing.values(), ["title", "description", "topics", "question_plan"])
+            stats["updated"] += len(existing)
+            stats["skipped"] += len(changed) - len(existing)
+
+
+def ingest_records(
+    records: Iterable[Dict],
+    batch_size: int = 200,
+    processes: int = 1,
+    matcher: Optional[TaxonomyMatcher] = None,
+    model_name: str = SPACY_MODEL,
+    question_bank: Optional[QuestionBank] = None,
+) -> Dict[str, int]:
+    """
+    Extract topics for a stream of JD records and write them back in bulk,
+    each with its question plan. At most ``2 * processes`` chunks of
+    ``batch_size`` records are held in memory at once, whatever the size of
+    the input.
+    """
+    stats = Counter(created=0, updated=0, skipped=0)
+    bank = question_bank or get_question_bank()
+    chunks = _chunked(records, batch_size)
+
+    if processes <= 1:
+        matcher = matcher or load_matcher(model_name)
+        for chunk in chunks:
+            topics = matcher.extract_many([r["description"] for r in chunk], batch_size=batch_size)
+            _save_chunk(chunk, topics, stats, bank)
+        return dict(stats)
+
+    # Spawned, not forked: a web worker already runs threads (the results
+    # flusher, the pools), and a forked child only gets copies of their locks
+    pool = ProcessPoolExecutor(
+        processes, mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_extraction_worker, initargs=(model_name,),
+    )
+    with pool:
+        pending = deque()
+        for chunk in chunks:
+            texts = [r["description"] for r in chunk]
+            pending.append((chunk, pool.submit(extract_in_worker, texts, batch_size)))
+            if len(pending) >= 2 * processes:
+                done, future = pending.popleft()
+                _save_chunk(done, future.result(), stats, bank)
+        while pending:
+            done, future = pending.popleft()
+            _save_chunk(done, future.result(), stats, bank)
+    return dict(stats)
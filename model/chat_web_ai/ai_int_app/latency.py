@@ -0,0 +1,26 @@
+import math
+from typing import Dict, Sequence
+
+# Latency statistics shared by the benchmarks and the load tester. Kept free
+# of Django so the load tester can run without importing the views.
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile, ``q`` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(seconds: Sequence[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    return {
+        "count": len(seconds),
+        "mean_ms": round(1000 * sum(seconds) / len(seconds), 3) if seconds else 0.0,
+        "p50_ms": round(1000 * percentile(seconds, 50), 3),
+        "p95_ms": round(1000 * percentile(seconds, 95), 3),
+        "p99_ms": round(1000 * percentile(seconds, 99), 3),
+    }
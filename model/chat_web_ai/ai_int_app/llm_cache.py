@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How long each type of LLM reply stays valid, in seconds. Replies that
+# depend on one candidate's answer are rarely asked for twice, so evaluations
+# are not cached unless configured.
+DEFAULT_TTLS = {
+    "topics": 7 * 24 * 3600,
+    "questions": 7 * 24 * 3600,
+    "follow_up": 24 * 3600,
+    "summary": 3600,
+    "evaluation": 0,
+}
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.split())
+
+
+def cache_key(model: str, prompt: str, params: Optional[Dict] = None) -> str:
+    material = json.dumps(
+        {"model": model, "prompt": normalize_prompt(prompt), "params": params or {}},
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier cache of model replies keyed by ``cache_key``: a bounded
+    in-process LRU in front of one JSON file per entry under ``directory``
+    (no disk tier when it is None), shared by every worker on the host.
+    Entries expire after the TTL of their call type; a TTL of 0 disables
+    caching for that type. Every ``prune_every`` writes the disk tier is
+    pruned to ``max_disk_entries`` oldest-first on a background thread.
+
+    ``aget`` and ``aput`` are for event loops: a memory hit is answered in
+    place and only the disk tier runs on a thread.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: int = 1024,
+        max_disk_entries: int = 50000,
+        prune_every: int = 100,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = str(directory) if directory else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.prune_every = prune_every
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._lru: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._pruner: Optional[threading.Thread] = None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    def ttl(self, call_type: str) -> float:
+        return self.ttls.get(call_type, self.default_ttl)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _remember(self, key: str, expires: float, value: Dict):
+        with self._lock:
+            self._lru[key] = (expires, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict]]:
+        try:
+            with open(self._path(key), encoding="utf-8") as handle:
+                entry = json.load(handle)
+            return entry["expires"], entry["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            logger.warning("Unreadable LLM cache entry %s", key, exc_info=True)
+            return None
+
+    def _write_disk(self, key: str, expires: float, value: Dict):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so readers never see half a file
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"expires": expires, "value": value}, handle)
+            os.replace(tmp, path)
+        except OSError:
+            logger.warning("LLM cache write failed", exc_info=True)
+            return
+        with self._lock:
+            self._writes += 1
+            if self._writes % self.prune_every or (self._pruner is not None and self._pruner.is_alive()):
+                return
+            # A scan of the whole directory has no place on the request path
+            self._pruner = threading.Thread(target=self._prune_quietly, name="llm-cache-prune", daemon=True)
+            self._pruner.start()
+
+    def _prune_quietly(self):
+        try:
+            self.prune()
+        except OSError:
+            logger.warning("LLM cache pruning failed", exc_info=True)
+
+    def _get_memory(self, key: str, now: float) -> Optional[Dict]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._lru.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return entry[1]
+                del self._lru[key]
+        return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[Dict]:
+        entry = self._read_disk(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._count("disk_hits")
+                self._remember(key, *entry)
+                return entry[1]
+            self._unlink(self._path(key))
+        return None
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = self.clock()
+        value = self._get_memory(key, now)
+        if value is None and self.directory:
+            value = self._get_disk(key, now)
+        if value is None:
+            self._count("misses")
+        return value
+
+    async def aget(self, key: str) -> Optional[Dict]:
+        now = self.clock()
+        value = self._get_memory(key, now)
+        if value is None and self.directory:
+            value = await asyncio.to_thread(self._get_disk, key, now)
+        if value is None:
+            self._count("misses")
+        return value
+
+    def _store(self, key: str, call_type: str, value: Dict) -> Optional[float]:
+        # The expiry time when the entry should also go to disk
+        ttl = self.ttl(call_type)
+        if ttl <= 0:
+            return None
+        expires = self.clock() + ttl
+        self._remember(key, expires, value)
+        self._count("stores")
+        return expires if self.directory else None
+
+    def put(self, key: str, call_type: str, value: Dict):
+        expires = self._store(key, call_type, value)
+        if expires is not None:
+            self._write_disk(key, expires, value)
+
+    async def aput(self, key: str, call_type: str, value: Dict):
+        expires = self._store(key, call_type, value)
+        if expires is not None:
+            await asyncio.to_thread(self._write_disk, key, expires, value)
+
+    def prune(self) -> int:
+        """
+        Delete the oldest disk entries beyond ``max_disk_entries``; returns
+        the number of files removed. Expired entries are deleted when read.
+        """
+        if not self.directory or not os.path.isdir(self.directory):
+            return 0
+        entries = []
+        for shard in os.scandir(self.directory):
+            if shard.is_dir():
+                entries.extend(e for e in os.scandir(shard.path) if e.name.endswith(".json"))
+        if len(entries) <= self.max_disk_entries:
+            return 0
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        return sum(self._unlink(e.path) for e in entries[: len(entries) - self.max_disk_entries])
+
+    @staticmethod
+    def _unlink(path: str) -> int:
+        try:
+            os.unlink(path)
+            return 1
+        except OSError:
+            return 0
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+        if self.directory and os.path.isdir(self.directory):
+            for shard in os.scandir(self.directory):
+                if shard.is_dir():
+                    for entry in os.scandir(shard.path):
+                        self._unlink(entry.path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters, size=len(self._lru), max_size=self.max_entries)
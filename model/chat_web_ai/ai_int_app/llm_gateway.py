@@ -0,0 +1,408 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .llm_cache import LLMCache, cache_key
+
+# Gateway for the Gemini calls laid out in process.txt: topic extraction,
+# question generation, answer evaluation, follow-ups and summaries. Requests go
+# through one pooled HTTP client per event loop, at most ``max_concurrency``
+# at a time, and are retried with jittered backoff. httpx is only imported
+# when the first request is made.
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+TOPICS_PROMPT = """Analyze the following job description and extract the top 5-7 key skills,
+responsibilities and required qualifications.
+Return JSON only: a list of short topic names.
+
+Job Description:
+---
+{jd_text}
+---"""
+
+QUESTIONS_PROMPT = """You are an AI assistant helping generate interview questions.
+The job role involves: {job_role}
+For each key skill/responsibility below, generate {per_topic} distinct, open-ended interview
+questions: one behavioral, one technical if the topic is technical (otherwise situational),
+and one situational.
+Return JSON only: an object mapping each topic to a list of {{"kind": ..., "question": ...}}.
+Topics: {topics_json}"""
+
+EVALUATION_PROMPT = """Context:
+- Job Description Skill/Requirement: {skill}
+- Interview Question Asked: {question}
+- Candidate's Answer: {answer}
+
+Task:
+Evaluate the candidate's answer based on its clarity, relevance to the question,
+and how well it demonstrates the skill/requirement '{skill}'.
+Provide a brief summary of the answer's strengths and weaknesses regarding this skill.
+Give a qualitative rating (e.g., Excellent, Good, Fair, Poor).
+
+Evaluation:"""
+
+FOLLOW_UP_PROMPT = """The candidate answered: '{answer}' to the question '{question}'.
+Generate one insightful follow-up question to probe deeper into their experience with {aspect}.
+Return only the question."""
+
+SUMMARY_PROMPT = """Based on the following Q&A pairs and evaluations from an interview for a {job_role},
+provide an overall summary of the candidate's performance, highlighting strengths and areas
+for improvement related to the job requirements:
+{qa_pairs}"""
+
+
+class LLMError(Exception):
+    """The model could not be reached or returned an unusable response."""
+
+
+class LLMResult:
+    __slots__ = ("text", "prompt_tokens", "completion_tokens", "latency", "attempts")
+
+    def __init__(self, text: str, prompt_tokens: int, completion_tokens: int, latency: float, attempts: int):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.latency = latency
+        self.attempts = attempts
+
+
+class CallStats:
+    """Latency and token accounting for one type of call."""
+
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies: "deque[float]" = deque(maxlen=window)
+
+    def record(self, result: LLMResult):
+        self.calls += 1
+        self.retries += result.attempts - 1
+        self.prompt_tokens += result.prompt_tokens
+        self.completion_tokens += result.completion_tokens
+        self.latencies.append(result.latency)
+
+    def record_failure(self, attempts: int):
+        self.calls += 1
+        self.failures += 1
+        self.retries += attempts - 1
+
+    def as_dict(self) -> Dict:
+        latencies = sorted(self.latencies)
+
+        def at(q):
+            return round(1000 * latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2) if latencies else 0.0
+
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_p50_ms": at(0.5),
+            "latency_p95_ms": at(0.95),
+        }
+
+
+def parse_json(text: str):
+    """JSON from a model reply, which may wrap it in a Markdown code fence."""
+    match = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    try:
+        return json.loads(match.group(1) if match else text)
+    except ValueError as exc:
+        raise LLMError(f"Model reply is not valid JSON: {text[:200]!r}") from exc
+
+
+def _batches(items: Sequence[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
+
+class LLMGateway:
+    """
+    Async client for the Gemini ``generateContent`` API.
+
+    Each event loop gets its own pooled ``httpx.AsyncClient`` and
+    concurrency semaphore (under ASGI that is one of each per worker).
+    Failed requests - transport errors and 408/429/5xx answers - are retried
+    up to ``max_retries`` times, sleeping a random time up to
+    ``backoff_base * 2 ** attempt`` (capped at ``backoff_cap``) or what
+    Retry-After asks for. ``generate_questions`` packs up to
+    ``topics_per_request`` topics into each prompt and sends the batches
+    concurrently. ``stats()`` reports calls, cache hits, retries, tokens and
+    latency per call type.
+
+    With a ``cache``, replies are looked up by model, normalized prompt and
+    parameters before anything is sent; question generation is cached per
+    topic, so a batch only asks for the topics no earlier batch covered.
+    Every call takes ``use_cache=False`` to bypass it.
+    """
+
+    def __init__(
+        self,
+        api_key: str = "",
+        model: str = "gemini-1.5-flash",
+        base_url: str = GEMINI_BASE_URL,
+        max_concurrency: int = 8,
+        max_connections: int = 16,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        topics_per_request: int = 5,
+        transport=None,
+        rng: Optional[random.Random] = None,
+        cache: Optional[LLMCache] = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.topics_per_request = topics_per_request
+        self.transport = transport
+        self.rng = rng or random.Random()
+        self.cache = cache
+        self._stats: Dict[str, CallStats] = {}
+        self._lock = threading.Lock()
+        self._loops: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_settings(cls, settings, **overrides) -> "LLMGateway":
+        options = dict(
+            api_key=settings.GEMINI_API_KEY,
+            model=settings.LLM_MODEL,
+            base_url=settings.LLM_BASE_URL,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            timeout=settings.LLM_TIMEOUT,
+            max_retries=settings.LLM_MAX_RETRIES,
+            topics_per_request=settings.LLM_TOPICS_PER_REQUEST,
+            cache=LLMCache(
+                directory=settings.LLM_CACHE_DIR,
+                max_entries=settings.LLM_CACHE_SIZE,
+                max_disk_entries=settings.LLM_CACHE_DISK_ENTRIES,
+                ttls=settings.LLM_CACHE_TTLS,
+            ) if settings.LLM_CACHE_ENABLED else None,
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    # -------------------- Transport --------------------
+
+    def _loop_state(self) -> Tuple[object, asyncio.Semaphore]:
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loops.get(loop)
+            if state is None:
+                client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections, max_keepalive_connections=self.max_connections
+                    ),
+                    transport=self.transport,
+                )
+                state = self._loops[loop] = (client, asyncio.Semaphore(self.max_concurrency))
+            return state
+
+    async def aclose(self):
+        """Close the client of the running event loop."""
+        with self._lock:
+            state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].aclose()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_cap)
+            except ValueError:
+                pass
+        return self.rng.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _call_stats(self, call_type: str) -> CallStats:
+        with self._lock:
+            return self._stats.setdefault(call_type, CallStats())
+
+    async def _cached(self, key: str, call_type: str) -> Optional[Dict]:
+        value = await self.cache.aget(key)
+        if value is not None:
+            stats = self._call_stats(call_type)
+            with self._lock:
+                stats.cache_hits += 1
+        return value
+
+    async def generate(
+        self, prompt: str, call_type: str = "generic", json_output: bool = False, use_cache: bool = True
+    ) -> LLMResult:
+        use_cache = use_cache and self.cache is not None
+        generation_config = {"responseMimeType": "application/json"} if json_output else {}
+        if use_cache:
+            key = cache_key(self.model, prompt, generation_config)
+            cached = await self._cached(key, call_type)
+            if cached is not None:
+                return LLMResult(cached["text"], 0, 0, 0.0, 0)
+
+        result = await self._request(prompt, call_type, generation_config)
+        if use_cache:
+            await self.cache.aput(key, call_type, {"text": result.text})
+        return result
+
+    async def _request(self, prompt: str, call_type: str, generation_config: Dict) -> LLMResult:
+        import httpx
+
+        client, semaphore = self._loop_state()
+        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        url = f"/models/{self.model}:generateContent"
+        # In a header rather than the query string, which proxies and access logs keep
+        headers = {"x-goog-api-key": self.api_key}
+        stats = self._call_stats(call_type)
+
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                # A concurrency slot is held for the call, not for the backoff after it
+                async with semaphore:
+                    response = await client.post(url, headers=headers, json=payload)
+            except httpx.TransportError as exc:
+                error = LLMError(f"{call_type}: {exc!r}")
+            else:
+                if response.status_code == 200:
+                    break
+                error = LLMError(f"{call_type}: HTTP {response.status_code} {response.text[:200]}")
+                if response.status_code not in RETRY_STATUSES:
+                    stats.record_failure(attempt)
+                    raise error
+                retry_after = response.headers.get("Retry-After")
+            if attempt > self.max_retries:
+                stats.record_failure(attempt)
+                raise error
+            await asyncio.sleep(self._backoff(attempt - 1, retry_after))
+
+        latency = time.perf_counter() - start
+        try:
+            body = response.json()
+            text = "".join(part.get("text", "") for part in body["candidates"][0]["content"]["parts"])
+        except (ValueError, KeyError, IndexError) as exc:
+            stats.record_failure(attempt)
+            raise LLMError(f"{call_type}: unexpected response {response.text[:200]!r}") from exc
+
+        usage = body.get("usageMetadata", {})
+        result = LLMResult(
+            text=text.strip(),
+            # Rough estimate when the server does not report usage
+            prompt_tokens=usage.get("promptTokenCount", len(prompt) // 4),
+            completion_tokens=usage.get("candidatesTokenCount", len(text) // 4),
+            latency=latency,
+            attempts=attempt,
+        )
+        stats.record(result)
+        return result
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {call_type: stats.as_dict() for call_type, stats in self._stats.items()}
+
+    # -------------------- Interview calls --------------------
+
+    async def extract_topics(self, jd_text: str, use_cache: bool = True) -> List[str]:
+        result = await self.generate(
+            TOPICS_PROMPT.format(jd_text=jd_text), "topics", json_output=True, use_cache=use_cache
+        )
+        topics = parse_json(result.text)
+        if not isinstance(topics, list):
+            raise LLMError("Expected a JSON list of topics.")
+        return [str(topic).strip().lower() for topic in topics if str(topic).strip()]
+
+    async def _questions_batch(self, topics: List[str], job_role: str, per_topic: int) -> Dict[str, List[Dict]]:
+        prompt = QUESTIONS_PROMPT.format(job_role=job_role or "the role described in the job description",
+                                         per_topic=per_topic, topics_json=json.dumps(topics))
+        # Cached per topic by generate_questions instead
+        result = await self.generate(prompt, "questions", json_output=True, use_cache=False)
+        by_topic = parse_json(result.text)
+        if not isinstance(by_topic, dict):
+            raise LLMError("Expected a JSON object of questions per topic.")
+        wanted = {topic.lower(): topic for topic in topics}
+        questions = {}
+        for topic, entries in by_topic.items():
+            if str(topic).lower() not in wanted or not isinstance(entries, list):
+                continue
+            questions[wanted[str(topic).lower()]] = [
+                {"kind": str(entry.get("kind", "general")).lower(), "question": str(entry["question"]).strip()}
+                for entry in entries if isinstance(entry, dict) and entry.get("question")
+            ]
+        return questions
+
+    def _topic_key(self, topic: str, job_role: str, per_topic: int) -> str:
+        return cache_key(self.model, f"questions {topic}", {"job_role": job_role, "per_topic": per_topic})
+
+    async def generate_questions(
+        self, topics: Sequence[str], job_role: str = "", per_topic: int = 3, use_cache: bool = True
+    ) -> Dict[str, List[Dict]]:
+        """
+        ``{topic: [{"kind", "question"}, ...]}`` for every topic the model
+        answered for. Topics missing from a reply are left out rather than
+        failing the batch; a batch that fails outright raises LLMError.
+        """
+        use_cache = use_cache and self.cache is not None
+        questions, missing = {}, []
+        for topic in dict.fromkeys(topics):
+            cached = await self._cached(self._topic_key(topic, job_role, per_topic), "questions") if use_cache else None
+            if cached is not None:
+                questions[topic] = cached["questions"]
+            else:
+                missing.append(topic)
+
+        # Sorted, so the same topics always travel in the same batches
+        batches = await asyncio.gather(*(
+            self._questions_batch(batch, job_role, per_topic)
+            for batch in _batches(sorted(missing), self.topics_per_request)
+        ))
+        for batch in batches:
+            for topic, entries in batch.items():
+                questions[topic] = entries
+                if use_cache and entries:
+                    await self.cache.aput(
+                        self._topic_key(topic, job_role, per_topic), "questions", {"questions": entries}
+                    )
+        return questions
+
+    async def evaluate_answer(self, question: str, answer: str, skill: str, use_cache: bool = True) -> str:
+        prompt = EVALUATION_PROMPT.format(question=question, answer=answer, skill=skill)
+        return (await self.generate(prompt, "evaluation", use_cache=use_cache)).text
+
+    async def follow_up(self, question: str, answer: str, aspect: str, use_cache: bool = True) -> str:
+        prompt = FOLLOW_UP_PROMPT.format(question=question, answer=answer, aspect=aspect)
+        return (await self.generate(prompt, "follow_up", use_cache=use_cache)).text
+
+    async def summarize(
+        self, job_role: str, qa_pairs: Sequence[Tuple[str, str, str]], use_cache: bool = True
+    ) -> str:
+        """``qa_pairs`` holds (question, answer, evaluation) tuples."""
+        lines = "\n".join(f"Q: {q}\nA: {a}\nEvaluation: {e}" for q, a, e in qa_pairs)
+        prompt = SUMMARY_PROMPT.format(job_role=job_role, qa_pairs=lines)
+        return (await self.generate(prompt, "summary", use_cache=use_cache)).text
@@ -0,0 +1,100 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# A stand-in for the Gemini generateContent endpoint, so the LLM gateway can
+# be exercised and load-tested without network access or an API key. Replies
+# are canned but have the right shape: JSON questions for question prompts,
+# a JSON topic list for topic prompts and plain text otherwise.
+
+QUESTION_KINDS = ("behavioral", "technical", "situational")
+
+
+def _reply_for(prompt: str) -> str:
+    topics = re.search(r"^Topics: (\[.*\])$", prompt, re.MULTILINE)
+    if topics:
+        return json.dumps({
+            topic: [{"kind": kind, "question": f"[stub] A {kind} question about {topic}?"} for kind in QUESTION_KINDS]
+            for topic in json.loads(topics.group(1))
+        })
+    if "a list of short topic names" in prompt:
+        return json.dumps(["communication", "python", "sql"])
+    if "follow-up question" in prompt:
+        return "[stub] Can you walk me through one concrete example?"
+    return "[stub] Clear and relevant answer. Rating: Good"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        time.sleep(max(0.0, server.rng.gauss(server.latency, server.latency / 4)))
+        with server.lock:
+            server.requests += 1
+            fail = server.rng.random() < server.error_rate
+
+        if fail or ":generateContent" not in self.path:
+            status, reply = (503, {"error": "stub overloaded"}) if fail else (404, {"error": "not found"})
+        else:
+            prompt = "".join(
+                part.get("text", "") for content in json.loads(body)["contents"] for part in content["parts"]
+            )
+            text = _reply_for(prompt)
+            status, reply = 200, {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+                "usageMetadata": {
+                    "promptTokenCount": len(prompt.split()),
+                    "candidatesTokenCount": len(text.split()),
+                },
+            }
+
+        data = json.dumps(reply).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Serves the stub on ``host:port`` (port 0 picks a free one) with a mean
+    reply ``latency`` in seconds and a share of 503s given by ``error_rate``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,232 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .latency import summarize
+
+# Load test for a running server: N virtual candidates each replay the call
+# sequence of templates/static/sample.js and index.html, one interview after
+# another, with their own session cookie. Concurrency ramps up in stages and
+# every stage is reported per endpoint. Like the LLM gateway, httpx is only
+# imported when a stage starts.
+
+ENDPOINTS = ("start", "turn", "save_summary", "summary")
+
+# The JD index.html submits
+DEFAULT_JD = (
+    "AI/ML development, focusing on LLMs, LangChain, or Agentic AI. Strong proficiency in Python and AI "
+    "frameworks like LangChain, Hugging Face, OpenAI, and other LLM APIs. Hands-on experience in NLP, prompt "
+    "engineering, embeddings, and vector search. Familiarity with multi-agent AI architectures and "
+    "retrieval-augmented generation (RAG). Experience with database systems (SQL, NoSQL, or vector databases "
+    "like Pinecone, ChromaDB, or FAISS). Strong problem-solving and analytical skills. Understanding of API "
+    "development and integration with backend systems."
+)
+
+ANSWER_WORDS = (
+    "i have used this in production for a few years on a team that shipped customer facing services "
+    "we designed the system tested it carefully measured latency and fixed the bottlenecks we found "
+    "one project i am proud of involved migrating a legacy codebase while keeping it running"
+).split()
+
+
+class EndpointStats:
+    """Latencies of the successful calls to one endpoint, and why the others failed."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+
+    def record(self, seconds: float, error: Optional[str] = None):
+        if error is None:
+            self.latencies.append(seconds)
+        else:
+            self.errors[error] += 1
+
+    def as_dict(self, elapsed: float) -> Dict:
+        errors = sum(self.errors.values())
+        requests = len(self.latencies) + errors
+        return {
+            "requests": requests,
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "requests_per_second": round(requests / elapsed, 2) if elapsed else 0.0,
+            **summarize(self.latencies),
+            "error_reasons": dict(self.errors),
+        }
+
+
+class StageRun:
+    """One concurrency level of a ramp."""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.endpoints = {name: EndpointStats() for name in ENDPOINTS}
+        self.interviews = 0
+        self.failed_interviews = 0
+        self.seconds = 0.0
+
+    def report(self) -> Dict:
+        endpoints = {name: stats.as_dict(self.seconds) for name, stats in self.endpoints.items()}
+        requests = sum(e["requests"] for e in endpoints.values())
+        errors = sum(e["errors"] for e in endpoints.values())
+        return {
+            "concurrency": self.concurrency,
+            "seconds": round(self.seconds, 3),
+            "interviews": self.interviews,
+            "failed_interviews": self.failed_interviews,
+            "interviews_per_second": round(self.interviews / self.seconds, 3) if self.seconds else 0.0,
+            "requests_per_second": round(requests / self.seconds, 2) if self.seconds else 0.0,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+class LoadTest:
+    """
+    Virtual candidates against ``base_url``. Each one starts an interview,
+    thinks for ``think_time`` seconds (a uniform range) before every answer
+    of ``answer_words`` words (also a range), answers until the server says
+    the interview is done, saves the summary and loads the summary page, as
+    index.html does. ``transport`` lets tests drive an in-process ASGI app.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        think_time: Tuple[float, float] = (1.0, 3.0),
+        answer_words: Tuple[int, int] = (15, 60),
+        jds: Optional[Sequence[str]] = None,
+        timeout: float = 30.0,
+        seed: int = 0,
+        transport=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.think_time = think_time
+        self.answer_words = answer_words
+        self.jds = list(jds) if jds else [DEFAULT_JD]
+        self.timeout = timeout
+        self.seed = seed
+        self.transport = transport
+
+    def answer(self, topic: str, rng: random.Random) -> str:
+        words = [rng.choice(ANSWER_WORDS) for _ in range(max(1, rng.randint(*self.answer_words)) - 1)]
+        # Mention the topic so answers are scored like real ones
+        words.insert(rng.randint(0, len(words)), topic)
+        return " ".join(words)
+
+    def _client(self):
+        import httpx
+
+        return httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, transport=self.transport)
+
+    async def _call(self, stage: StageRun, endpoint: str, send, expect_json: bool = True):
+        """The decoded reply of one call, or None after recording why it failed."""
+        import httpx
+
+        started = time.perf_counter()
+        try:
+            response = await send()
+            data = response.json() if expect_json and response.status_code < 400 else None
+        except httpx.TimeoutException:
+            error = "timeout"
+        except httpx.TransportError as exc:
+            error = type(exc).__name__
+        except ValueError:
+            error = "invalid json"
+        else:
+            error = None if response.status_code < 400 else f"status {response.status_code}"
+        stage.endpoints[endpoint].record(time.perf_counter() - started, error)
+        if error is not None:
+            return None
+        return data if expect_json else response
+
+    async def interview(self, client, stage: StageRun, rng: random.Random) -> bool:
+        """One full interview; False if any call failed."""
+        data = await self._call(
+            stage, "start", lambda: client.post("/interview/", json={"action": "start", "jd": rng.choice(self.jds)})
+        )
+        if data is None:
+            return False
+        interview_id = data.get("interview_id")
+        if not interview_id or not data.get("topics"):
+            # index.html stops here: "No skills found in job description."
+            return False
+
+        responses = {}
+        for _ in range(len(data["topics"])):
+            if data.get("done"):
+                break
+            await asyncio.sleep(rng.uniform(*self.think_time))
+            response = self.answer(data["topic"], rng)
+            responses[data["topic"]] = response
+            data = await self._call(
+                stage, "turn",
+                lambda: client.post("/interview/", json={
+                    "action": "turn", "interview_id": interview_id, "response": response,
+                }),
+            )
+            if data is None:
+                return False
+        if not data.get("done"):
+            return False
+
+        saved = await self._call(
+            stage, "save_summary",
+            lambda: client.post("/save-summary/", json={"responses": responses, "interview_id": interview_id}),
+        )
+        if saved is None:
+            return False
+        # The browser follows window.location.href = "/summary/"
+        return await self._call(stage, "summary", lambda: client.get("/summary/"), expect_json=False) is not None
+
+    async def _candidate(self, stage: StageRun, number: int, deadline: float, interviews: Optional[int]):
+        rng = random.Random(f"{self.seed}-{stage.concurrency}-{number}")
+        # Candidates arrive spread over one think time rather than all at once
+        await asyncio.sleep(rng.uniform(0, self.think_time[1]))
+        done = 0
+        async with self._client() as client:
+            while time.perf_counter() < deadline and (interviews is None or done < interviews):
+                if await self.interview(client, stage, rng):
+                    stage.interviews += 1
+                else:
+                    stage.failed_interviews += 1
+                done += 1
+
+    async def run_stage(self, concurrency: int, duration: Optional[float], interviews: Optional[int] = None) -> Dict:
+        """
+        ``concurrency`` candidates, each starting interviews until
+        ``duration`` seconds have passed or it has run ``interviews`` of them.
+        Interviews under way at the deadline are finished.
+        """
+        stage = StageRun(concurrency)
+        started = time.perf_counter()
+        deadline = started + duration if duration is not None else float("inf")
+        await asyncio.gather(*(self._candidate(stage, n, deadline, interviews) for n in range(concurrency)))
+        stage.seconds = time.perf_counter() - started
+        return stage.report()
+
+    async def ramp(
+        self,
+        stages: Sequence[int],
+        duration: Optional[float],
+        interviews: Optional[int] = None,
+        max_error_rate: Optional[float] = None,
+        warmup: bool = True,
+    ) -> List[Dict]:
+        """
+        Run the stages in order. Stops early once a stage's error rate goes
+        over ``max_error_rate``. The unreported warm-up interview keeps the
+        server's model load out of the first stage.
+        """
+        if warmup:
+            async with self._client() as client:
+                await self.interview(client, StageRun(0), random.Random(self.seed))
+        reports = []
+        for concurrency in stages:
+            report = await self.run_stage(concurrency, duration, interviews)
+            reports.append(report)
+            if max_error_rate is not None and report["error_rate"] > max_error_rate:
+                break
+        return reports
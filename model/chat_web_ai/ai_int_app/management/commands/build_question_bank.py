@@ -0,0 +1,72 @@
+import asyncio
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ai_int_app.llm_gateway import LLMError, LLMGateway
+from ai_int_app.models import JobDescription
+from ai_int_app.question_bank import get_question_bank
+from ai_int_app.skills import SKILL_KEYWORDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Store template (or, with --llm, Gemini-generated) questions for every skill keyword "
+        "and topic of an ingested JD, then rebuild the question plan of each JobDescription."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--missing-only", action="store_true", help="Only plan JDs without a question plan.")
+        parser.add_argument("--llm", action="store_true", help="Generate questions through the LLM gateway.")
+
+    def handle(self, *args, **options):
+        bank = get_question_bank()
+        bank.warm_up()
+        created = 0
+        if options["llm"]:
+            created += self.generate_with_llm(bank)
+        created += bank.ensure_topics(SKILL_KEYWORDS)
+
+        jds = JobDescription.objects.only("id", "topics", "question_plan").order_by("pk")
+        if options["missing_only"]:
+            jds = jds.filter(question_plan=[])
+
+        planned, batch = 0, []
+        for jd in jds.iterator(chunk_size=options["batch_size"]):
+            created += bank.ensure_topics(jd.topics)
+            jd.question_plan = bank.plan(jd.topics)
+            batch.append(jd)
+            if len(batch) >= options["batch_size"]:
+                planned += self.save(batch)
+        planned += self.save(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Created {created} questions, planned {planned} job descriptions."))
+
+    def generate_with_llm(self, bank):
+        topics = set(SKILL_KEYWORDS)
+        for found in JobDescription.objects.values_list("topics", flat=True).iterator():
+            topics.update(found)
+        missing = sorted(t for t in topics if t not in bank.stored_topics())
+        gateway = LLMGateway.from_settings(settings)
+
+        async def generate():
+            try:
+                return await gateway.generate_questions(missing)
+            finally:
+                await gateway.aclose()
+
+        try:
+            questions = asyncio.run(generate())
+        except LLMError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(f"LLM calls: {gateway.stats()}")
+        return bank.add_questions(questions)
+
+    def save(self, batch):
+        with transaction.atomic():
+            JobDescription.objects.bulk_update(batch, ["question_plan"])
+        count = len(batch)
+        batch.clear()
+        return count
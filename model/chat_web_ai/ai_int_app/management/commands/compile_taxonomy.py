@@ -0,0 +1,23 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_int_app.taxonomy import DEFAULT_TAXONOMY_PATH, SkillTaxonomy, default_artifact_path, write_artifact
+
+
+class Command(BaseCommand):
+    help = "Compile the skill taxonomy JSON into the memory-mapped artifact the workers load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", nargs="?", default=DEFAULT_TAXONOMY_PATH)
+        parser.add_argument("--output", help="Artifact path; defaults to the source with a .bin suffix.")
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        artifact = options["output"] or default_artifact_path(source)
+        try:
+            write_artifact(source, artifact)
+            stats = SkillTaxonomy(source, artifact).stats()
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(json.dumps(stats, indent=2))
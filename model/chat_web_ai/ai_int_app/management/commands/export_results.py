@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from ai_int_app.export import EXPORT_FORMATS, export_queryset, iter_export, iter_row_chunks
+
+
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise CommandError(f"Not an ISO 8601 datetime: {value!r}")
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Export interview turns, scores and topics as CSV or Parquet, reading the database in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="File to write, or '-' for stdout (CSV only).")
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_SIZE)
+        parser.add_argument("--since", type=_datetime, help="Only turns answered at or after this time.")
+        parser.add_argument("--until", type=_datetime, help="Only turns answered before this time.")
+        parser.add_argument("--candidate")
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        fmt = options["format"] or ("parquet" if output.endswith(".parquet") else "csv")
+        if output == "-" and fmt != "csv":
+            raise CommandError("Only CSV can be written to stdout.")
+
+        queryset = export_queryset(options["since"], options["until"], options["candidate"])
+        rows = 0
+
+        def counted(chunks):
+            nonlocal rows
+            for chunk in chunks:
+                rows += len(chunk)
+                yield chunk
+
+        try:
+            stream = iter_export(fmt, counted(iter_row_chunks(queryset, chunk_size=options["chunk_size"])))
+        except ImportError as exc:
+            raise CommandError(str(exc))
+        if output == "-":
+            for part in stream:
+                self.stdout.write(part, ending="")
+            return
+        mode, encoding = ("w", "utf-8") if fmt == "csv" else ("wb", None)
+        try:
+            with open(output, mode, encoding=encoding, newline="" if fmt == "csv" else None) as handle:
+                for part in stream:
+                    handle.write(part)
+        except OSError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows} turns to {output}."))
@@ -0,0 +1,33 @@
+import io
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_int_app.ingest import guess_format, ingest_records, iter_jd_records
+
+
+class Command(BaseCommand):
+    help = "Bulk load job descriptions from a JSONL or CSV file and extract their topics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL or CSV file with 'title' and 'description' columns.")
+        parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=settings.JD_INGEST_BATCH_SIZE)
+        parser.add_argument("--processes", type=int, default=settings.JD_INGEST_PROCESSES)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or guess_format(path)
+        try:
+            with io.open(path, newline="", encoding="utf-8") as lines:
+                stats = ingest_records(
+                    iter_jd_records(lines, fmt),
+                    batch_size=options["batch_size"],
+                    processes=options["processes"],
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {stats['created']}, updated {stats['updated']}, skipped {stats['skipped']}."
+        ))
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_int_app.loadtest import LoadTest
+
+
+def _range(value, cast):
+    low, _, high = value.partition(",")
+    return cast(low), cast(high or low)
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the browser's interview protocol (start, turns, save-summary, summary) with many virtual "
+        "candidates against a running server, ramping concurrency, and report throughput, error rate and "
+        "latency percentiles per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--ramp", default="1,5,10,25", help="Comma-separated concurrency of each stage.")
+        parser.add_argument("--duration", type=float, default=60.0,
+                            help="Seconds each stage starts new interviews for; 0 to rely on --interviews.")
+        parser.add_argument("--interviews", type=int, help="Interviews each candidate runs per stage at most.")
+        parser.add_argument("--think-time", default="1,3", help="Seconds before each answer, MIN,MAX.")
+        parser.add_argument("--answer-words", default="15,60", help="Words per answer, MIN,MAX.")
+        parser.add_argument("--jd-file", help="JDs to pick from, one per line; defaults to the index.html JD.")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a request counts as failed.")
+        parser.add_argument("--max-error-rate", type=float, help="Stop ramping once a stage's error rate exceeds this.")
+        parser.add_argument("--no-warmup", action="store_true", help="Skip the unreported warm-up interview.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            stages = [int(n) for n in options["ramp"].split(",")]
+            think_time = _range(options["think_time"], float)
+            answer_words = _range(options["answer_words"], int)
+        except ValueError as exc:
+            raise CommandError(f"Invalid range: {exc}")
+        duration = options["duration"] or None
+        if duration is None and not options["interviews"]:
+            raise CommandError("Give --duration or --interviews.")
+        jds = None
+        if options["jd_file"]:
+            with open(options["jd_file"], encoding="utf-8") as handle:
+                jds = [line.strip() for line in handle if line.strip()]
+
+        load_test = LoadTest(
+            options["base_url"], think_time=think_time, answer_words=answer_words, jds=jds,
+            timeout=options["timeout"], seed=options["seed"],
+        )
+        stages = asyncio.run(load_test.ramp(
+            stages, duration, interviews=options["interviews"],
+            max_error_rate=options["max_error_rate"], warmup=not options["no_warmup"],
+        ))
+        self.stdout.write(json.dumps({"base_url": options["base_url"], "stages": stages}, indent=2))
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai_int_app.llm_gateway import LLMError, LLMGateway
+from ai_int_app.llm_stub import StubServer
+from ai_int_app.skills import SKILL_KEYWORDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate questions for many interviews at once through the LLM gateway and report "
+        "throughput, retries, tokens and latency. Runs against a local stub unless --base-url is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interviews", type=int, default=50)
+        parser.add_argument("--topics", type=int, default=7, help="Topics per interview.")
+        parser.add_argument("--base-url", help="Gateway target; defaults to a stub started for the run.")
+        parser.add_argument("--latency", type=float, default=0.2, help="Stub reply latency in seconds.")
+        parser.add_argument("--error-rate", type=float, default=0.05, help="Share of stub replies that are 503.")
+        parser.add_argument("--concurrency", type=int, default=settings.LLM_MAX_CONCURRENCY)
+        parser.add_argument("--cache", action="store_true", help="Keep the reply cache on (off by default).")
+
+    def handle(self, *args, **options):
+        stub = None
+        base_url = options["base_url"]
+        if not base_url:
+            stub = StubServer(latency=options["latency"], error_rate=options["error_rate"], seed=0).start()
+            base_url = stub.url
+        overrides = {} if options["cache"] else {"cache": None}
+        gateway = LLMGateway.from_settings(
+            settings, base_url=base_url, max_concurrency=options["concurrency"], backoff_base=0.05, **overrides
+        )
+        topics = sorted(SKILL_KEYWORDS)[: options["topics"]]
+
+        async def run():
+            async def interview():
+                try:
+                    return await gateway.generate_questions(topics)
+                except LLMError:
+                    return None
+
+            try:
+                return await asyncio.gather(*(interview() for _ in range(options["interviews"])))
+            finally:
+                await gateway.aclose()
+
+        start = time.perf_counter()
+        try:
+            results = asyncio.run(run())
+        finally:
+            if stub is not None:
+                stub.stop()
+        elapsed = time.perf_counter() - start
+
+        report = {
+            "interviews": options["interviews"],
+            "failed_interviews": sum(result is None for result in results),
+            "seconds": round(elapsed, 3),
+            "interviews_per_second": round(options["interviews"] / elapsed, 2),
+            "calls": gateway.stats(),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from ai_int_app.llm_stub import StubServer
+
+
+class Command(BaseCommand):
+    help = "Serve a local stand-in for the Gemini generateContent API (point LLM_BASE_URL at it)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency", type=float, default=0.2, help="Mean reply latency in seconds.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503.")
+
+    def handle(self, *args, **options):
+        server = StubServer(options["host"], options["port"], options["latency"], options["error_rate"])
+        self.stdout.write(f"LLM stub listening on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,103 @@
+import json
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_int_app.benchmarks import generate_corpus
+from ai_int_app.memory import child_pids, process_memory, summarize_workers
+from ai_int_app.nlp_service import SPACY_MODEL, NLPService, get_nlp_service
+from ai_int_app.prefork import after_fork, preload
+
+
+def _exercise(model_name, jds, preloaded):
+    # What a worker does on its first requests: load its own model unless
+    # the master preloaded one, and extract topics
+    service = get_nlp_service(model_name) if preloaded else NLPService(model_name)
+    service.warm_up()
+    for jd in jds:
+        service.matcher.extract(jd)
+
+
+class Command(BaseCommand):
+    help = (
+        "Report private vs. shared memory per worker: of a running gunicorn master's workers (--master), "
+        "of given processes (--pid), or of workers forked here with and without preloading (--simulate)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--master", type=int, help="Report the workers of this gunicorn master.")
+        parser.add_argument("--pid", type=int, action="append", default=[], help="Report this process.")
+        parser.add_argument("--simulate", type=int, metavar="WORKERS",
+                            help="Fork this many workers, with and without a preloaded model, and compare.")
+        parser.add_argument("--model", default=SPACY_MODEL)
+        parser.add_argument("--jds", type=int, default=50, help="JDs each simulated worker extracts.")
+
+    def handle(self, *args, **options):
+        if not os.path.exists(f"/proc/{os.getpid()}/smaps"):
+            raise CommandError("Memory reports need Linux /proc.")
+        if options["simulate"]:
+            report = self.simulate(options["simulate"], options["model"], options["jds"])
+        else:
+            pids = list(options["pid"])
+            if options["master"]:
+                pids += child_pids(options["master"])
+            if not pids:
+                raise CommandError("Give --master, --pid or --simulate.")
+            try:
+                workers = [process_memory(pid) for pid in pids]
+            except OSError as exc:
+                raise CommandError(str(exc))
+            report = {"workers": workers, "summary": summarize_workers(workers)}
+            if options["master"]:
+                report["master"] = process_memory(options["master"])
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def simulate(self, count, model_name, jds):
+        corpus = [jd for texts in generate_corpus([200, 1000], per_length=max(1, jds // 2)).values() for jd in texts]
+        # Without preloading every worker loads its own model; with it they
+        # share the one loaded here
+        report = {"no_preload": self.fork_workers(count, model_name, corpus, preloaded=False)}
+        report["preload"] = self.fork_workers(count, model_name, corpus, preloaded=True)
+        report["private_mb_saved_per_worker"] = round(
+            report["no_preload"]["summary"]["mean_private_mb"] - report["preload"]["summary"]["mean_private_mb"], 1
+        )
+        return report
+
+    def fork_workers(self, count, model_name, corpus, preloaded):
+        result = {}
+        if preloaded:
+            result["preload"] = preload(model_name)
+        pids, pipes = [], []
+        for worker_id in range(count):
+            ready, done = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(ready)
+                code = 0
+                try:
+                    after_fork(worker_id)
+                    _exercise(model_name, corpus, preloaded)
+                except BaseException:
+                    code = 1
+                os.write(done, bytes([code]))
+                # Stay alive until measured
+                signal.pause()
+                os._exit(code)
+            os.close(done)
+            pids.append(pid)
+            pipes.append(ready)
+        try:
+            failed = [pid for pid, ready in zip(pids, pipes) if os.read(ready, 1) != b"\x00"]
+            if failed:
+                raise CommandError(f"Simulated workers {failed} failed to load model {model_name!r}.")
+            time.sleep(0.1)
+            result["workers"] = [process_memory(pid) for pid in pids]
+            result["summary"] = summarize_workers(result["workers"])
+        finally:
+            for pid, ready in zip(pids, pipes):
+                os.close(ready)
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+        return result
@@ -0,0 +1,19 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai_int_app.nlp_service import get_nlp_service
+
+
+class Command(BaseCommand):
+    help = "Load the shared spaCy pipeline and report its load time and resident memory."
+
+    def handle(self, *args, **options):
+        stats = get_nlp_service().warm_up(
+            load_budget_seconds=settings.NLP_LOAD_BUDGET_SECONDS,
+            rss_budget_mb=settings.NLP_RSS_BUDGET_MB,
+        )
+        stats["load_budget_seconds"] = settings.NLP_LOAD_BUDGET_SECONDS
+        stats["rss_budget_mb"] = settings.NLP_RSS_BUDGET_MB
+        self.stdout.write(json.dumps(stats, indent=2))
@@ -0,0 +1,76 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from ai_int_app import benchmarks, views
+from ai_int_app.nlp_service import SPACY_MODEL, get_nlp_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark topic extraction, interview API latency and the voice loop, "
+        "and write the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+        parser.add_argument("--compare", help="Earlier JSON report to print relative changes against.")
+        parser.add_argument("--model", default=SPACY_MODEL, help="spaCy pipeline, e.g. 'blank:en'.")
+        parser.add_argument("--only", choices=["extraction", "api", "voice"], action="append")
+        parser.add_argument("--jds-per-length", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--turns", type=int, default=20)
+        parser.add_argument("--wav-dir", help="Directory of recorded .wav answers (with optional .txt transcripts).")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        parts = options["only"] or ["extraction", "api", "voice"]
+        service = get_nlp_service(options["model"])
+        try:
+            service.warm_up()
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        report = {"meta": benchmarks.report_metadata(options["model"])}
+        report["meta"]["nlp"] = service.stats()
+
+        if "extraction" in parts:
+            report["extraction"] = benchmarks.bench_extraction(
+                service.matcher, per_length=options["jds_per_length"], seed=options["seed"]
+            )
+        if "api" in parts:
+            report["api"] = self.bench_api(service, options)
+        if "voice" in parts:
+            try:
+                report["voice"] = benchmarks.bench_voice(turns=options["turns"], wav_dir=options["wav_dir"])
+            except (OSError, ValueError) as exc:
+                raise CommandError(str(exc))
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as handle:
+                baseline = json.load(handle)
+            for line in benchmarks.compare(report, baseline):
+                self.stdout.write(line)
+
+    def bench_api(self, service, options):
+        # Run against a throwaway test database so the real one is untouched
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0)
+        old_config = runner.setup_databases()
+        original_service, views.nlp_service = views.nlp_service, service
+        try:
+            return benchmarks.bench_api(requests=options["requests"], seed=options["seed"])
+        finally:
+            views.nlp_service = original_service
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
@@ -0,0 +1,69 @@
+import os
+from typing import Dict, List
+
+# Per-process memory from /proc (Linux): how much of a worker is private to
+# it and how much it shares with the master and its siblings through
+# copy-on-write pages or mapped files.
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty", "Swap")
+
+
+def read_smaps(pid: int) -> Dict[str, int]:
+    """
+    The SMAPS_FIELDS of ``pid`` in kB, summed over all mappings. Reads
+    smaps_rollup where the kernel has it, smaps otherwise.
+    """
+    totals = dict.fromkeys(SMAPS_FIELDS, 0)
+    for name in ("smaps_rollup", "smaps"):
+        try:
+            with open(f"/proc/{pid}/{name}") as smaps:
+                for line in smaps:
+                    field, _, rest = line.partition(":")
+                    if field in totals:
+                        totals[field] += int(rest.split()[0])
+            return totals
+        except FileNotFoundError:
+            if not os.path.exists(f"/proc/{pid}"):
+                raise
+    raise OSError(f"No smaps for process {pid}")
+
+
+def process_memory(pid: int) -> Dict[str, float]:
+    """RSS, PSS, shared and private (USS) memory of ``pid`` in MB."""
+    smaps = read_smaps(pid)
+    return {
+        "pid": pid,
+        "rss_mb": round(smaps["Rss"] / 1024, 1),
+        "pss_mb": round(smaps["Pss"] / 1024, 1),
+        "shared_mb": round((smaps["Shared_Clean"] + smaps["Shared_Dirty"]) / 1024, 1),
+        "private_mb": round((smaps["Private_Clean"] + smaps["Private_Dirty"]) / 1024, 1),
+        "swap_mb": round(smaps["Swap"] / 1024, 1),
+    }
+
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of ``pid``, e.g. the workers of a gunicorn master."""
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as handle:
+                children.extend(int(child) for child in handle.read().split())
+        except FileNotFoundError:
+            continue
+    return sorted(children)
+
+
+def summarize_workers(workers: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Totals over a set of workers. Private memory is what each extra worker
+    costs; PSS sums to the real footprint of the whole group.
+    """
+    count = len(workers)
+    return {
+        "workers": count,
+        "total_rss_mb": round(sum(w["rss_mb"] for w in workers), 1),
+        "total_pss_mb": round(sum(w["pss_mb"] for w in workers), 1),
+        "total_private_mb": round(sum(w["private_mb"] for w in workers), 1),
+        "mean_private_mb": round(sum(w["private_mb"] for w in workers) / count, 1) if count else 0.0,
+        "mean_shared_mb": round(sum(w["shared_mb"] for w in workers) / count, 1) if count else 0.0,
+    }
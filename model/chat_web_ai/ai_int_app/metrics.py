@@ -0,0 +1,210 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Minimal Prometheus-style metrics: counters, histograms and callback gauges,
+# rendered in the text exposition format by the /metrics view. Gauges are
+# only evaluated at scrape time, and with ``registry.enabled`` off every
+# recording call returns at once.
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    # The text exposition format escapes backslash, double quote and newline
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, registry: "Registry", name: str, help: str):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if not self.registry.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_labels(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, registry: "Registry", name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts, +Inf count, sum)
+        self._values: Dict[Labels, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(_labels(labels))
+            return entry[1] if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+        lines = []
+        for labels, (counts, total, value_sum) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', '+Inf'))} {total}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(value_sum)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {total}")
+        return lines
+
+
+class Gauge:
+    """
+    A value read from ``callback`` at scrape time: a number, or a dict of
+    ``{label value: number}`` for the single label ``label``.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, registry: "Registry", name: str, help: str, callback: Callable, label: Optional[str] = None,
+                 kind: str = "gauge"):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.callback = callback
+        self.label = label
+        self.kind = kind
+
+    def samples(self) -> List[str]:
+        value = self.callback()
+        if value is None:
+            return []
+        if self.label is None:
+            return [f"{self.name} {_format_value(value)}"]
+        return [
+            f"{self.name}{_format_labels(((self.label, str(k)),))} {_format_value(v)}"
+            for k, v in sorted(value.items()) if v is not None
+        ]
+
+
+class Registry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._span_hooks: List[Callable[[str, float], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # Re-registering (e.g. a reloaded module) replaces the old metric
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(self, name, help))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help, buckets))
+
+    def gauge(self, name: str, help: str, callback: Callable, label: Optional[str] = None,
+              kind: str = "gauge") -> Gauge:
+        return self._register(Gauge(self, name, help, callback, label, kind))
+
+    def add_span_hook(self, hook: Callable[[str, float], None]):
+        """Call ``hook(phase, seconds)`` whenever a span ends."""
+        self._span_hooks.append(hook)
+
+    def remove_span_hook(self, hook: Callable[[str, float], None]):
+        self._span_hooks.remove(hook)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+PHASE_SECONDS = registry.histogram("interview_phase_seconds", "Time spent in each phase of a request.")
+REQUEST_SECONDS = registry.histogram("http_request_duration_seconds", "Request latency by view and status.")
+INTERVIEW_REQUESTS = registry.counter("interview_api_requests_total", "interview_api calls by call type.")
+ADMISSION_SHED = registry.counter("admission_shed_total", "Calls refused by admission control, by reason and priority.")
+RESULTS_DROPPED = registry.counter("results_dropped_total", "Interview result rows dropped after failed writes, by kind.")
+
+
+@contextmanager
+def _timed_span(phase: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        PHASE_SECONDS.observe(seconds, phase=phase)
+        for hook in registry._span_hooks:
+            hook(phase, seconds)
+
+
+_NULL_SPAN = nullcontext()
+
+
+def span(phase: str):
+    """Context manager timing one phase of a request into PHASE_SECONDS."""
+    if not registry.enabled:
+        return _NULL_SPAN
+    return _timed_span(phase)
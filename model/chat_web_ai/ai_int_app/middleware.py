@@ -0,0 +1,48 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .metrics import REQUEST_SECONDS
+
+
+class TimingMiddleware:
+    """
+    Records the latency of every request by view name, method and status in
+    REQUEST_SECONDS. Works for sync and async views alike; with
+    METRICS_ENABLED off it removes itself from the chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _observe(self, request, response, start):
+        match = request.resolver_match
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            view=match.view_name if match else "unmatched",
+            method=request.method,
+            status=response.status_code,
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, start)
+        return response
@@ -1,5 +1,5 @@
 
-from django.db import migrations
+from django.db import migrations, models
 
 def create_default_jd(apps, schema_editor):
     JobDescription = apps.get_model("ai_int_app", "JobDescription")
@@ -14,6 +14,16 @@ class Migration(migrations.Migration):
         # your dependencies here
     ]
 
+    initial = True
+
     operations = [
+        migrations.CreateModel(
+            name="JobDescription",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("title", models.CharField(max_length=255)),
+                ("description", models.TextField()),
+            ],
+        ),
         migrations.RunPython(create_default_jd),
     ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_int_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobdescription",
+            name="topics",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_int_app', '0002_jobdescription_topics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicCacheEntry',
+            fields=[
+                ('jd_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('keyword_version', models.CharField(max_length=64)),
+                ('topics', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_int_app', '0003_topiccacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Interview',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('candidate', models.CharField(blank=True, db_index=True, max_length=150)),
+                ('topics', models.JSONField(default=list)),
+                ('started_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InterviewTurn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('topic', models.CharField(max_length=255)),
+                ('question', models.TextField(blank=True)),
+                ('response', models.TextField(blank=True)),
+                ('feedback', models.TextField(blank=True)),
+                ('answered_at', models.DateTimeField()),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turns', to='ai_int_app.interview')),
+            ],
+            options={
+                'ordering': ['interview', 'index'],
+                'unique_together': {('interview', 'index')},
+            },
+        ),
+    ]
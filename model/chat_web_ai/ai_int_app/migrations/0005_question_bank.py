@@ -0,0 +1,34 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_int_app', '0004_interview_interviewturn'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdescription',
+            name='question_plan',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='Question',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=255)),
+                ('kind', models.CharField(max_length=32)),
+                ('text', models.TextField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['topic', 'kind'], name='question_topic_kind')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='question',
+            constraint=models.UniqueConstraint(fields=('topic', 'kind', 'text'), name='unique_question'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_int_app', '0005_question_bank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewturn',
+            name='score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
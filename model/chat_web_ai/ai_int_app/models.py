@@ -3,7 +3,60 @@ from django.db import models
 class JobDescription(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
+    topics = models.JSONField(default=list, blank=True)
+    # [{"topic", "kind", "question"}, ...] built from the question bank at ingest
+    question_plan = models.JSONField(default=list, blank=True)
 
     def __str__(self):
         return self.title
 
+
+class Question(models.Model):
+    """A question of the bank, served by topic and question type."""
+    topic = models.CharField(max_length=255)
+    kind = models.CharField(max_length=32)
+    text = models.TextField()
+
+    class Meta:
+        indexes = [models.Index(fields=["topic", "kind"], name="question_topic_kind")]
+        constraints = [models.UniqueConstraint(fields=["topic", "kind", "text"], name="unique_question")]
+
+    def __str__(self):
+        return self.text
+
+
+class TopicCacheEntry(models.Model):
+    """Persistent tier of the JD topic cache (see topic_cache.py)."""
+    jd_hash = models.CharField(max_length=64, primary_key=True)
+    keyword_version = models.CharField(max_length=64)
+    topics = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class Interview(models.Model):
+    """One candidate's interview; the id is the session's interview_id."""
+    id = models.CharField(max_length=32, primary_key=True)
+    candidate = models.CharField(max_length=150, blank=True, db_index=True)
+    topics = models.JSONField(default=list)
+    started_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.candidate or 'anonymous'} ({self.id})"
+
+
+class InterviewTurn(models.Model):
+    """A question, the candidate's answer and the feedback given for it."""
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name="turns")
+    index = models.PositiveIntegerField()
+    topic = models.CharField(max_length=255)
+    question = models.TextField(blank=True)
+    response = models.TextField(blank=True)
+    feedback = models.TextField(blank=True)
+    # AnswerScorer score in [0, 1]; empty for answers sent only with the summary
+    score = models.FloatField(null=True, blank=True)
+    answered_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["interview", "index"]
+        unique_together = [("interview", "index")]
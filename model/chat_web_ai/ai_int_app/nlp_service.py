@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import spacy
+
+from .taxonomy import SkillTaxonomy, TaxonomyMatcher, get_skill_taxonomy
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = "en_core_web_sm"
+
+# Skill extraction only needs the tokenizer, so none of the trained
+# components of en_core_web_sm are loaded
+UNUSED_PIPES = ("tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner")
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Resident set size of this process in MB, or None where it cannot be read.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; ru_maxrss is in KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if peak > 2 ** 32 else peak / 2 ** 10
+
+
+class NLPService:
+    """
+    One trimmed spaCy pipeline and its TaxonomyMatcher, loaded on first use
+    and shared by every caller in the process.
+    """
+
+    def __init__(
+        self,
+        model_name: str = SPACY_MODEL,
+        exclude: Iterable[str] = UNUSED_PIPES,
+        taxonomy: Optional[SkillTaxonomy] = None,
+    ):
+        self.model_name = model_name
+        self.exclude = list(exclude)
+        self.taxonomy = taxonomy or get_skill_taxonomy()
+        self._lock = threading.Lock()
+        self._nlp = None
+        self._matcher = None
+        self._stats: Dict = {"model": model_name, "loaded": False}
+
+    def _load(self):
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        nlp = spacy.load(self.model_name, exclude=self.exclude)
+        matcher = TaxonomyMatcher(nlp, self.taxonomy)
+        taxonomy = self.taxonomy.stats()
+        load_seconds = time.perf_counter() - started
+        rss_after = current_rss_mb()
+
+        self._stats = {
+            "model": self.model_name,
+            "loaded": True,
+            "pipes": nlp.pipe_names,
+            "load_seconds": round(load_seconds, 4),
+            "rss_mb": round(rss_after, 1) if rss_after is not None else None,
+            "rss_delta_mb": round(rss_after - rss_before, 1) if None not in (rss_before, rss_after) else None,
+            "taxonomy_skills": taxonomy["skills"],
+            "taxonomy_phrases": taxonomy["phrases"],
+        }
+        logger.info(
+            "Loaded spaCy model %s in %.2fs (RSS %s MB)", self.model_name, load_seconds, self._stats["rss_mb"]
+        )
+        self._nlp, self._matcher = nlp, matcher
+
+    def _ensure_loaded(self):
+        if self._matcher is None:
+            with self._lock:
+                if self._matcher is None:
+                    self._load()
+
+    @property
+    def nlp(self):
+        self._ensure_loaded()
+        return self._nlp
+
+    @property
+    def matcher(self) -> TaxonomyMatcher:
+        self._ensure_loaded()
+        return self._matcher
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._matcher is not None
+
+    def stats(self) -> Dict:
+        return dict(self._stats)
+
+    def warm_up(self, load_budget_seconds: Optional[float] = None, rss_budget_mb: Optional[float] = None) -> Dict:
+        """
+        Load the pipeline and run one extraction so the first request does not
+        pay for it. Logs a warning when the load time or RSS exceeds a budget.
+        """
+        self.matcher.extract("warm up python")
+        stats = self.stats()
+        if load_budget_seconds is not None and stats["load_seconds"] > load_budget_seconds:
+            logger.warning(
+                "spaCy model %s took %.2fs to load (budget %.2fs)",
+                self.model_name, stats["load_seconds"], load_budget_seconds,
+            )
+        if rss_budget_mb is not None and stats["rss_mb"] is not None and stats["rss_mb"] > rss_budget_mb:
+            logger.warning(
+                "RSS after loading %s is %.1f MB (budget %.1f MB)", self.model_name, stats["rss_mb"], rss_budget_mb
+            )
+        return stats
+
+
+_services: Dict[str, NLPService] = {}
+_services_lock = threading.Lock()
+
+
+def get_nlp_service(model_name: str = SPACY_MODEL) -> NLPService:
+    with _services_lock:
+        if model_name not in _services:
+            _services[model_name] = NLPService(model_name)
+        return _services[model_name]
+
+
+# Topic extraction in pool processes started with "spawn" (see ingest.py):
+# a child imports only this module, never Django's models, and builds its
+# matcher once
+_worker_matcher: Optional[TaxonomyMatcher] = None
+
+
+def init_extraction_worker(model_name: str):
+    global _worker_matcher
+    _worker_matcher = get_nlp_service(model_name).matcher
+
+
+def extract_in_worker(texts: List[str], batch_size: int) -> List[List[str]]:
+    return _worker_matcher.extract_many(texts, batch_size=batch_size)
@@ -0,0 +1,64 @@
+import gc
+import logging
+import time
+from typing import Dict, Optional
+
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+
+from .nlp_service import SPACY_MODEL, get_nlp_service
+
+logger = logging.getLogger(__name__)
+
+# Preforked deployment (see chat_web_ai/gunicorn.conf.py): the master loads
+# everything the workers share, then freezes the garbage collector so the
+# loaded objects stay out of every later collection. A collection writes to
+# the header of each object it visits, which would copy the pages holding
+# the model into every worker.
+
+
+def preload(model_name: str = SPACY_MODEL) -> Dict:
+    """
+    Call once in the master before forking: imports the views and their
+    shared services, loads the spaCy model, maps the skill taxonomy, fills
+    the question bank, then closes database connections and freezes the GC.
+    """
+    started = time.perf_counter()
+    # Importing the URLconf imports views, which builds the process-wide
+    # caches, pools and stores while they are still empty
+    get_resolver().url_patterns
+    from .question_bank import get_question_bank
+
+    service = get_nlp_service(model_name)
+    try:
+        service.warm_up()
+    except OSError:
+        logger.exception("Could not preload the spaCy model; workers will load it themselves")
+
+    bank = get_question_bank()
+    if not bank.is_loaded:
+        try:
+            bank.warm_up()
+        except DatabaseError:
+            logger.warning("Could not preload the question bank")
+
+    # Connections must not be shared with the workers
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    stats = {
+        "preload_seconds": round(time.perf_counter() - started, 3),
+        "frozen_objects": gc.get_freeze_count(),
+        "model_loaded": service.is_loaded,
+    }
+    logger.info("Preloaded for forking in %.2fs, %d objects frozen", stats["preload_seconds"], stats["frozen_objects"])
+    return stats
+
+
+def after_fork(worker_id: Optional[int] = None):
+    """Call in each worker right after the fork."""
+    from .question_bank import get_question_bank
+
+    # Each worker would otherwise draw the same "random" questions
+    get_question_bank().rng.seed()
+    logger.debug("Worker %s ready", worker_id)
@@ -0,0 +1,154 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Leaf functions of threads that are blocked rather than working; their
+# samples would bury the interesting stacks under idle pool workers
+IDLE_FUNCTIONS = frozenset({"wait", "select", "_worker", "_wait_for_tstate_lock"})
+
+FORMATS = {"collapsed": "folded", "pstats": "prof"}
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of every other thread every ``interval``
+    seconds and counts them as collapsed stacks ("thread;file:func;..."),
+    the input format of flamegraph.pl and speedscope. Sampling all threads
+    follows the work of an async view into the CPU pool.
+    """
+
+    def __init__(self, interval: float = 0.005, idle: Iterable[str] = IDLE_FUNCTIONS):
+        self.interval = interval
+        self.idle = frozenset(idle)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own or frame.f_code.co_name in self.idle:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and writes one file per profiled
+    request to ``directory``. A request is profiled when it carries
+    ``header`` set to ``token``, or at random with ``sample_rate``.
+
+    "collapsed" runs a StackSampler over all threads; "pstats" runs
+    cProfile, which only sees the thread the view runs on, so for async
+    views it also counts whatever else the event loop does meanwhile.
+    """
+
+    def __init__(
+        self,
+        directory,
+        sample_rate: float = 0.0,
+        header: str = "X-Profile-Request",
+        token: str = "",
+        fmt: str = "collapsed",
+        interval: float = 0.005,
+        rng: Optional[random.Random] = None,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format {fmt!r}; use one of {sorted(FORMATS)}")
+        self.directory = str(directory)
+        self.sample_rate = sample_rate
+        self.header = header
+        self.token = token
+        self.fmt = fmt
+        self.interval = interval
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_settings(cls, settings, **overrides) -> "RequestProfiler":
+        options = dict(
+            directory=settings.PROFILE_DIR,
+            sample_rate=settings.PROFILE_SAMPLE_RATE,
+            header=settings.PROFILE_HEADER,
+            token=settings.PROFILE_TOKEN,
+            fmt=settings.PROFILE_FORMAT,
+            interval=settings.PROFILE_INTERVAL,
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    @property
+    def active(self) -> bool:
+        return self.sample_rate > 0 or bool(self.token)
+
+    def wanted(self, headers: Dict[str, str]) -> bool:
+        if self.token and headers.get(self.header) == self.token:
+            return True
+        return self.sample_rate > 0 and self.rng.random() < self.sample_rate
+
+    def start(self):
+        if self.fmt == "pstats":
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        return sampler
+
+    @staticmethod
+    def stop(handle):
+        if isinstance(handle, cProfile.Profile):
+            handle.disable()
+        else:
+            handle.stop()
+
+    def write(self, handle, view: str, tag: str, seconds: float) -> str:
+        """Save a stopped profile; the file name carries the view and tag."""
+        tag = re.sub(r"[^A-Za-z0-9_-]", "_", tag)[:32] or "none"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{view}-{tag}-{time.time_ns() % 10**9:09d}.{FORMATS[self.fmt]}"
+        path = os.path.join(self.directory, name)
+        os.makedirs(self.directory, exist_ok=True)
+        if self.fmt == "pstats":
+            handle.dump_stats(path)
+        else:
+            with open(path, "w", encoding="utf-8") as handle_file:
+                handle_file.write(handle.collapsed())
+        logger.info("Profiled %s [%s] in %.1f ms -> %s", view, tag, seconds * 1000, path)
+        return path
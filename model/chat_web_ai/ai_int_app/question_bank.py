@@ -0,0 +1,169 @@
+import logging
+import random
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.db import DatabaseError
+
+from .models import Question
+
+logger = logging.getLogger(__name__)
+
+# One template per question type; LLM-generated questions are added to the
+# bank under the same types
+QUESTION_TEMPLATES = {
+    "experience": "Can you explain your experience with {topic}?",
+    "challenges": "What challenges have you faced while working with {topic}?",
+    "proficiency": "How would you rate your proficiency in {topic} and why?",
+    "project": "Can you share a project where you used {topic}?",
+    "best_practices": "What are some best practices you follow in {topic}?",
+}
+QUESTION_KINDS = tuple(QUESTION_TEMPLATES)
+
+
+def template_questions(topic: str) -> Dict[str, List[str]]:
+    return {kind: [template.format(topic=topic)] for kind, template in QUESTION_TEMPLATES.items()}
+
+
+class QuestionBank:
+    """
+    In-memory copy of the Question table, keyed by topic and question type,
+    so serving a question is a dictionary lookup. ``warm_up`` loads every
+    row at startup; until then a topic is read from the (topic, kind) index
+    on first use. Topics with no stored questions fall back to the
+    templates, which are not kept, so unknown topics sent by clients do not
+    grow the bank.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self._questions: Dict[str, Dict[str, List[str]]] = {}
+        # Topics whose questions come from the table rather than the templates
+        self._stored: Set[str] = set()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once ``warm_up`` ran, after which lookups never touch the database."""
+        return self._loaded
+
+    def _add(self, topic: str, kind: str, text: str):
+        if topic not in self._stored:
+            self._stored.add(topic)
+            self._questions[topic] = {}
+        texts = self._questions[topic].setdefault(kind, [])
+        if text not in texts:
+            texts.append(text)
+
+    def warm_up(self) -> int:
+        """Load the whole bank; returns the number of questions loaded."""
+        rows = list(Question.objects.values_list("topic", "kind", "text"))
+        with self._lock:
+            self._questions, self._stored = {}, set()
+            for topic, kind, text in rows:
+                self._add(topic, kind, text)
+            self._loaded = True
+        return len(rows)
+
+    def _load_topic(self, topic: str) -> Dict[str, List[str]]:
+        rows = []
+        if not self._loaded:
+            try:
+                rows = list(Question.objects.filter(topic=topic).values_list("kind", "text"))
+            except DatabaseError:
+                logger.warning("Question bank lookup failed", exc_info=True)
+        with self._lock:
+            for kind, text in rows:
+                self._add(topic, kind, text)
+            known = self._questions.get(topic)
+        return known if known is not None else template_questions(topic)
+
+    def questions(self, topic: str) -> Dict[str, List[str]]:
+        with self._lock:
+            known = self._questions.get(topic)
+        return known if known is not None else self._load_topic(topic)
+
+    def question(self, topic: str, kind: Optional[str] = None) -> str:
+        by_kind = self.questions(topic)
+        if kind is None or kind not in by_kind:
+            kind = self.rng.choice(sorted(by_kind))
+        return self.rng.choice(by_kind[kind])
+
+    def plan(self, topics: Iterable[str]) -> List[Dict[str, str]]:
+        """
+        One question per topic, rotating through the question types so an
+        interview does not ask the same kind of question twice in a row.
+        """
+        plan = []
+        for i, topic in enumerate(topics):
+            kind = QUESTION_KINDS[i % len(QUESTION_KINDS)]
+            kinds = sorted(self.questions(topic))
+            if kind not in kinds:
+                # e.g. LLM-generated behavioral/technical/situational questions
+                kind = kinds[i % len(kinds)]
+            plan.append({"topic": topic, "kind": kind, "question": self.question(topic, kind)})
+        return plan
+
+    def ensure_topics(self, topics: Iterable[str]) -> int:
+        """
+        Store the template questions of every topic that has none in the
+        table yet; returns the number of questions created.
+        """
+        with self._lock:
+            missing = sorted({t for t in topics if t not in self._stored})
+        if not missing:
+            return 0
+        known = set(Question.objects.filter(topic__in=missing).values_list("topic", flat=True).distinct())
+        new = [
+            Question(topic=topic, kind=kind, text=text)
+            for topic in missing if topic not in known
+            for kind, texts in template_questions(topic).items()
+            for text in texts
+        ]
+        Question.objects.bulk_create(new, ignore_conflicts=True)
+        rows = Question.objects.filter(topic__in=missing).values_list("topic", "kind", "text")
+        with self._lock:
+            for topic, kind, text in rows:
+                self._add(topic, kind, text)
+        return len(new)
+
+    def stored_topics(self) -> Set[str]:
+        with self._lock:
+            return set(self._stored)
+
+    def add_questions(self, questions: Dict[str, List[Dict[str, str]]]) -> int:
+        """
+        Store ``{topic: [{"kind", "question"}, ...]}``, e.g. the output of
+        ``LLMGateway.generate_questions``; returns the number of questions.
+        """
+        new = [
+            Question(topic=topic, kind=entry["kind"], text=entry["question"])
+            for topic, entries in questions.items() for entry in entries
+        ]
+        Question.objects.bulk_create(new, ignore_conflicts=True)
+        with self._lock:
+            for question in new:
+                self._add(question.topic, question.kind, question.text)
+        return len(new)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "topics": len(self._stored),
+                "questions": sum(len(t) for topic in self._stored for t in self._questions[topic].values()),
+            }
+
+
+_bank: Optional[QuestionBank] = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """The process-wide question bank."""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuestionBank()
+        return _bank
@@ -0,0 +1,148 @@
+import atexit
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from .metrics import RESULTS_DROPPED
+from .models import Interview, InterviewTurn
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Collects interview results in memory and writes them to the database in
+    batches, so recording a turn never waits on the database. A background
+    thread flushes every ``flush_interval`` seconds, or as soon as
+    ``batch_size`` rows are pending. ``flush()`` can also be called directly,
+    e.g. before reading results back.
+
+    Rows that fail to write are kept for the next flush. They are dropped,
+    and counted in RESULTS_DROPPED, after ``max_retries`` failed flushes in
+    a row or when keeping them would hold more than ``max_pending`` rows,
+    and at once when the error is not a DatabaseError.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        background: bool = True,
+        max_retries: int = 5,
+        max_pending: int = 10000,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.background = background
+        self.max_retries = max_retries
+        self.max_pending = max_pending
+        self._failures = 0
+        self._interviews: Dict[str, Interview] = {}
+        self._turns: List[InterviewTurn] = []
+        self._completed: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _pending(self) -> int:
+        return len(self._interviews) + len(self._turns) + len(self._completed)
+
+    def _ensure_thread(self):
+        if self.background and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="results-write-behind", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _enqueued(self):
+        self._ensure_thread()
+        if self._pending() >= self.batch_size:
+            self._wakeup.set()
+
+    def start_interview(self, interview_id: str, candidate: str, topics: List[str]):
+        with self._lock:
+            self._interviews[interview_id] = Interview(
+                id=interview_id, candidate=candidate, topics=topics, started_at=timezone.now()
+            )
+            self._enqueued()
+
+    def add_turn(
+        self, interview_id: str, index: int, topic: str, question: str, response: str, feedback: str,
+        score: Optional[float] = None,
+    ):
+        with self._lock:
+            self._turns.append(InterviewTurn(
+                interview_id=interview_id, index=index, topic=topic, question=question or "",
+                response=response, feedback=feedback, score=score, answered_at=timezone.now(),
+            ))
+            self._enqueued()
+
+    def complete(self, interview_id: str):
+        with self._lock:
+            self._completed[interview_id] = timezone.now()
+            self._enqueued()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                interviews, self._interviews = self._interviews, {}
+                turns, self._turns = self._turns, []
+                completed, self._completed = self._completed, {}
+            if not (interviews or turns or completed):
+                return
+
+            try:
+                with transaction.atomic():
+                    Interview.objects.bulk_create(interviews.values(), ignore_conflicts=True)
+                    InterviewTurn.objects.bulk_create(turns, ignore_conflicts=True)
+                    for interview_id, completed_at in completed.items():
+                        Interview.objects.filter(pk=interview_id).update(completed_at=completed_at)
+            except DatabaseError:
+                self._failures += 1
+                if self._failures <= self.max_retries and self._requeue(interviews, turns, completed):
+                    logger.warning(
+                        "Could not write %d interviews, %d turns and %d completions; retrying (%d of %d)",
+                        len(interviews), len(turns), len(completed), self._failures, self.max_retries,
+                        exc_info=True,
+                    )
+                    return
+                self._drop(interviews, turns, completed)
+            except Exception:
+                # Not the database being unavailable, so a retry would fail the same way
+                self._drop(interviews, turns, completed)
+            else:
+                self._failures = 0
+
+    def _drop(self, interviews: Dict[str, Interview], turns: List[InterviewTurn], completed: Dict):
+        # Called from an except block, so the error is logged with the rows
+        self._failures = 0
+        logger.exception(
+            "Dropped %d interviews, %d turns and %d completions that could not be written",
+            len(interviews), len(turns), len(completed),
+        )
+        for kind, rows in (("interview", interviews), ("turn", turns), ("completion", completed)):
+            if rows:
+                RESULTS_DROPPED.inc(len(rows), kind=kind)
+
+    def _requeue(self, interviews: Dict[str, Interview], turns: List[InterviewTurn], completed: Dict) -> bool:
+        """Put a failed batch back ahead of newer rows, unless that holds too many."""
+        with self._lock:
+            if self._pending() + len(interviews) + len(turns) + len(completed) > self.max_pending:
+                return False
+            self._interviews = {**interviews, **self._interviews}
+            self._turns = turns + self._turns
+            self._completed = {**completed, **self._completed}
+            return True
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The thread must outlive a bad batch, or rows pile up until exit
+                logger.exception("Flushing interview results failed")
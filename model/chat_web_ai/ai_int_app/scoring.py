@@ -0,0 +1,249 @@
+import json
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Answer scoring shared by the Django app and the standalone scripts. Answers
+# and rubric points are embedded as TF-IDF vectors over the rubric vocabulary
+# and compared with cosine similarity, so an answer scores by how much of what
+# a good answer covers it actually talks about, not by naming the topic.
+
+# What a good answer to "tell me about your experience with <topic>" covers,
+# whatever the topic. "{topic}" is filled in but never counts as evidence.
+GENERIC_RUBRIC = [
+    "built and shipped a real project with {topic} and explained my role",
+    "described the problem, the design decisions and the trade-offs",
+    "explained challenges, bugs or failures and how I debugged and solved them",
+    "measured results such as performance, reliability, users or time saved",
+    "wrote tests, reviewed code and followed best practices and conventions",
+    "compared {topic} with alternatives and explained when not to use it",
+    "worked with a team, communicated with stakeholders and mentored others",
+    "kept learning: documentation, courses, certifications or side projects",
+]
+
+TOPIC_RUBRICS = {
+    "python": [
+        "used the standard library, virtual environments and packaging with pip",
+        "wrote scripts, automation, web services or data pipelines",
+        "used libraries such as pandas, numpy, django, flask or fastapi",
+        "handled typing, exceptions, generators, decorators and async code",
+    ],
+    "java": [
+        "built services with spring boot, maven or gradle",
+        "used collections, generics, streams and concurrency",
+        "tuned the jvm, garbage collection and memory",
+    ],
+    "javascript": [
+        "used es6 features, promises, async await and closures",
+        "manipulated the dom, handled events and browser apis",
+        "used npm packages, bundlers and typescript",
+    ],
+    "react": [
+        "built components with hooks, props and state",
+        "managed state with context or redux and fetched data",
+        "optimized rendering with memoization and avoided re-renders",
+    ],
+    "sql": [
+        "wrote joins, aggregations, subqueries and window functions",
+        "designed schemas, normalization, keys and indexes",
+        "analyzed query plans and optimized slow queries",
+        "used transactions, isolation levels and locking",
+    ],
+    "docker": [
+        "wrote dockerfiles, multi-stage builds and small images",
+        "ran containers with volumes, networks and docker compose",
+        "pushed images to a registry and deployed them",
+    ],
+    "kubernetes": [
+        "deployed pods, deployments, services and ingress",
+        "configured autoscaling, resource limits and health probes",
+        "used helm charts, config maps and secrets",
+    ],
+    "aws": [
+        "used ec2, s3, lambda, rds and iam",
+        "designed for availability across regions and zones",
+        "managed infrastructure as code with terraform or cloudformation",
+    ],
+    "machine learning": [
+        "prepared data, engineered features and split train and test sets",
+        "trained and tuned models such as regression, trees or neural networks",
+        "evaluated models with metrics like accuracy, precision, recall and auc",
+        "deployed models and monitored drift in production",
+    ],
+    "git": [
+        "used branches, pull requests, merges and rebases",
+        "resolved merge conflicts and kept a clean history",
+    ],
+    "testing": [
+        "wrote unit, integration and end-to-end tests",
+        "used mocks, fixtures and test coverage in continuous integration",
+    ],
+    "api": [
+        "designed endpoints, status codes, versioning and pagination",
+        "handled authentication, rate limiting and documentation",
+    ],
+}
+
+STOP_WORDS = frozenset(
+    "a an and are as at be been but by can could did do does for from had has have how i in into is it "
+    "its me my of on or our so such than that the their them then there these they this to too us was "
+    "we were what when where which while who why will with would you your "
+    "also bit just lot some use used using very work worked working".split()
+)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+GOOD_SCORE = 0.6
+PARTIAL_SCORE = 0.25
+
+
+def _stem(token: str) -> str:
+    # Light suffix stripping so "tested", "tests" and "testing" meet
+    for suffix, min_length in (("ing", 6), ("ed", 5), ("es", 5), ("s", 4)):
+        if token.endswith(suffix) and len(token) >= min_length and not token.endswith("ss"):
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str, exclude: Iterable[str] = ()) -> List[str]:
+    excluded = set(exclude)
+    tokens = (_stem(t.rstrip(".-")) for t in TOKEN_RE.findall(text.lower()))
+    return [t for t in tokens if t and t not in STOP_WORDS and t not in excluded]
+
+
+def features(text: str, exclude: Iterable[str] = ()) -> Counter:
+    """Unigram and bigram counts of the content words of ``text``."""
+    tokens = tokenize(text, exclude)
+    return Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+
+def load_rubrics(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    The built-in topic rubrics, extended or overridden by a JSON file of
+    ``{"topic": ["rubric point", ...]}``.
+    """
+    rubrics = {topic: list(points) for topic, points in TOPIC_RUBRICS.items()}
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            for topic, points in json.load(handle).items():
+                rubrics[topic.lower()] = list(points)
+    return rubrics
+
+
+class AnswerScorer:
+    """
+    Grades answers against a topic's rubric points. The TF-IDF vocabulary
+    and the normalized reference matrix of each topic are computed once, so
+    scoring a turn costs one answer embedding and one matrix-vector product.
+
+    An answer is compared with every rubric point by cosine similarity and
+    ``score`` adds up the similarities of its ``top_k`` closest points,
+    each capped at ``point_cap`` and scaled so that ``full_marks`` gives 1.0:
+    a short answer that echoes one point cannot outscore one that covers
+    several. Words of the topic itself are ignored on both sides, so
+    "I know Python" scores 0. At most ``max_references`` reference matrices
+    are kept, the least recently used dropped first, since topics can come
+    from clients.
+    """
+
+    def __init__(
+        self,
+        rubrics: Optional[Dict[str, List[str]]] = None,
+        generic: Sequence[str] = GENERIC_RUBRIC,
+        top_k: int = 5,
+        full_marks: float = 0.5,
+        point_cap: float = 0.15,
+        good_score: float = GOOD_SCORE,
+        partial_score: float = PARTIAL_SCORE,
+        max_references: int = 1024,
+    ):
+        self.rubrics = {t.lower(): list(p) for t, p in (TOPIC_RUBRICS if rubrics is None else rubrics).items()}
+        self.generic = list(generic)
+        self.top_k = top_k
+        self.full_marks = full_marks
+        self.point_cap = point_cap
+        self.good_score = good_score
+        self.partial_score = partial_score
+        self.max_references = max_references
+
+        documents = [features(point.format(topic="")) for point in self.generic]
+        for topic, points in self.rubrics.items():
+            documents.extend(features(point, tokenize(topic)) for point in points)
+
+        document_frequency: Counter = Counter()
+        for document in documents:
+            document_frequency.update(document.keys())
+        self.vocabulary = {feature: i for i, feature in enumerate(sorted(document_frequency))}
+        n = len(documents)
+        self.idf = np.array(
+            [math.log((1 + n) / (1 + document_frequency[f])) + 1 for f in sorted(document_frequency)],
+            dtype=np.float32,
+        )
+        # Answer words no rubric uses still count towards its length
+        self.unseen_idf = math.log(1 + n) + 1
+
+        self._references: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _vectors(self, texts: Sequence[str], exclude: Iterable[str]) -> np.ndarray:
+        excluded = tokenize(" ".join(exclude))
+        matrix = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        unseen = np.zeros(len(texts), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in features(text, excluded).items():
+                weight = 1 + math.log(count)
+                column = self.vocabulary.get(feature)
+                if column is None:
+                    unseen[row] += (weight * self.unseen_idf) ** 2
+                else:
+                    matrix[row, column] = weight
+        matrix *= self.idf
+        norms = np.sqrt((matrix * matrix).sum(axis=1) + unseen)
+        norms[norms == 0] = 1
+        return matrix / norms[:, None]
+
+    def rubric(self, topic: str) -> List[str]:
+        topic = topic.lower()
+        return [point.format(topic=topic) for point in self.generic] + self.rubrics.get(topic, [])
+
+    def reference(self, topic: str) -> np.ndarray:
+        """The topic's rubric points as rows of unit vectors, cached."""
+        topic = topic.lower()
+        with self._lock:
+            matrix = self._references.get(topic)
+            if matrix is not None:
+                self._references.move_to_end(topic)
+        if matrix is None:
+            matrix = self._vectors(self.rubric(topic), [topic])
+            with self._lock:
+                self._references[topic] = matrix
+                while len(self._references) > self.max_references:
+                    self._references.popitem(last=False)
+        return matrix
+
+    def score_many(self, topic: str, answers: Sequence[str]) -> np.ndarray:
+        if not answers:
+            return np.zeros(0, dtype=np.float32)
+        reference = self.reference(topic)
+        similarities = self._vectors(answers, [topic]) @ reference.T
+        k = min(self.top_k, reference.shape[0])
+        closest = np.minimum(np.partition(similarities, -k, axis=1)[:, -k:], self.point_cap)
+        return np.minimum(closest.sum(axis=1) / self.full_marks, 1.0)
+
+    def score(self, topic: str, answer: str) -> float:
+        return float(self.score_many(topic, [answer])[0])
+
+    def grade(self, score: float) -> str:
+        if score >= self.good_score:
+            return "good"
+        if score >= self.partial_score:
+            return "partial"
+        return "weak"
+
+    def evaluate(self, topic: str, answer: str) -> Tuple[float, str]:
+        score = self.score(topic, answer)
+        return score, self.grade(score)
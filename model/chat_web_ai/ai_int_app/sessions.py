@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class InterviewSession:
+    """
+    Server-side state of one interview. ``turns`` holds
+    (topic, question, response, feedback, score) tuples in the order answered.
+    ``planned`` holds the questions of a precomputed question plan, if any.
+    """
+
+    __slots__ = (
+        "interview_id", "topics", "planned", "index", "question", "next_question", "turns", "touched", "lock",
+    )
+
+    def __init__(self, interview_id: str, topics: List[str], planned: Optional[List[str]] = None):
+        self.interview_id = interview_id
+        self.topics = topics
+        self.planned = planned
+        self.index = 0
+        self.question: Optional[str] = None
+        self.next_question: Optional[Future] = None
+        self.turns: List[Tuple[str, str, str, str, float]] = []
+        self.touched = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def topic(self) -> Optional[str]:
+        return self.topics[self.index] if self.index < len(self.topics) else None
+
+    @property
+    def done(self) -> bool:
+        return self.index >= len(self.topics)
+
+    @property
+    def responses(self) -> Dict[str, str]:
+        return {topic: response for topic, _, response, *_ in self.turns}
+
+
+class SessionStore:
+    """
+    In-process registry of interview sessions keyed by interview id. While
+    the candidate answers one question, the question for the next topic is
+    generated on a background thread, so a turn only has to score the answer.
+    """
+
+    def __init__(
+        self,
+        question_factory: Callable[[str], str],
+        ttl: float = 3600,
+        prefetch_workers: int = 2,
+        on_turn: Optional[Callable[[InterviewSession, int, Tuple[str, str, str, str, float]], None]] = None,
+    ):
+        self.question_factory = question_factory
+        self.on_turn = on_turn
+        self.ttl = ttl
+        self._sessions: Dict[str, InterviewSession] = {}
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+        self._prefetch = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="question-prefetch")
+
+    def _purge_expired(self, now: float):
+        if now - self._last_purge < 60:
+            return
+        self._last_purge = now
+        expired = [key for key, session in self._sessions.items() if now - session.touched > self.ttl]
+        for key in expired:
+            del self._sessions[key]
+
+    def _question_at(self, session: InterviewSession, index: int) -> str:
+        if session.planned is not None:
+            return session.planned[index]
+        return self.question_factory(session.topics[index])
+
+    def _schedule_next(self, session: InterviewSession):
+        following = session.index + 1
+        if session.planned is not None:
+            session.next_question = None
+        elif following < len(session.topics):
+            session.next_question = self._prefetch.submit(self.question_factory, session.topics[following])
+        else:
+            session.next_question = None
+
+    def create(self, topics: List[str], questions: Optional[List[str]] = None) -> InterviewSession:
+        """
+        Start an interview over ``topics``. ``questions``, one per topic,
+        come from a question plan; without them each question is generated
+        by ``question_factory``.
+        """
+        if questions is not None and len(questions) != len(topics):
+            raise ValueError("Expected one planned question per topic.")
+        session = InterviewSession(uuid.uuid4().hex, list(topics), list(questions) if questions else None)
+        if session.topics:
+            session.question = self._question_at(session, 0)
+            self._schedule_next(session)
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            self._sessions[session.interview_id] = session
+        return session
+
+    def get(self, interview_id: Optional[str]) -> Optional[InterviewSession]:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(interview_id)
+            if session is None or now - session.touched > self.ttl:
+                return None
+            session.touched = now
+            return session
+
+    async def answer(
+        self, session: InterviewSession, response: str, evaluate: Callable[[str, str], Awaitable[Tuple[float, str]]]
+    ) -> Optional[Tuple[str, str, str, str, float]]:
+        """
+        Score the answer to the current question with ``await
+        evaluate(topic, response)``, which returns (score, feedback), record
+        it and move on to the next topic, taking its question from the
+        prefetch. Returns the recorded turn, or None when the interview was
+        already finished. Scoring and the prefetch are awaited without the
+        session lock, which is only held to move the session on; if another
+        turn moved it on meanwhile, the answer is scored again.
+        """
+        while True:
+            index = session.index
+            if index >= len(session.topics):
+                return None
+            topic = session.topics[index]
+            score, feedback = await evaluate(topic, response)
+            prefetched = session.next_question
+            if prefetched is not None:
+                await asyncio.wrap_future(prefetched)
+            with session.lock:
+                if session.index != index:
+                    continue
+                turn = (topic, session.question, response, feedback, score)
+                session.turns.append(turn)
+                if self.on_turn is not None:
+                    self.on_turn(session, len(session.turns) - 1, turn)
+                session.index += 1
+                if session.done:
+                    session.question = None
+                    session.next_question = None
+                else:
+                    # Both are ready: the prefetch finished above, a plan is in memory
+                    session.question = prefetched.result() if prefetched else self._question_at(session, session.index)
+                    self._schedule_next(session)
+                return turn
+
+    def discard(self, interview_id: str):
+        with self._lock:
+            self._sessions.pop(interview_id, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,7 @@
+from .taxonomy import load_taxonomy_source
+
+# Canonical skills of the taxonomy in skill_taxonomy.json (shared by the
+# Django app and the standalone scripts in basic_model/ and
+# mic_communication.py). Extraction itself goes through the compiled
+# taxonomy, which also knows each skill's aliases; see taxonomy.py.
+SKILL_KEYWORDS = frozenset(entry["skill"].lower() for entry in load_taxonomy_source())
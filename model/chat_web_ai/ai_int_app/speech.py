@@ -0,0 +1,468 @@
+import math
+import queue
+import threading
+import time
+import wave
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Speech building blocks shared by the voice scripts and the server.
+# speech_recognition (and PyAudio for the microphone) are only imported by
+# the classes that need them, so the offline pieces work without them.
+
+
+class TranscriptionError(Exception):
+    """The recognizer backend could not be reached or failed."""
+
+
+# -------------------- Recognizer backends --------------------
+
+class SpeechRecognitionBackend:
+    """
+    Transcribes one segment of 16-bit PCM audio with a ``recognize_*``
+    method of speech_recognition. Unintelligible audio yields "".
+    """
+
+    method = "recognize_google"
+
+    def __init__(self, language: str = "en-US"):
+        import speech_recognition as sr
+
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+        self.language = language
+
+    def transcribe(self, pcm: bytes, sample_rate: int, sample_width: int) -> str:
+        audio = self._sr.AudioData(pcm, sample_rate, sample_width)
+        try:
+            return getattr(self._recognizer, self.method)(audio, language=self.language)
+        except self._sr.UnknownValueError:
+            return ""
+        except self._sr.RequestError as exc:
+            raise TranscriptionError(str(exc)) from exc
+
+
+class GoogleBackend(SpeechRecognitionBackend):
+    method = "recognize_google"
+
+
+class SphinxBackend(SpeechRecognitionBackend):
+    """Offline recognition through pocketsphinx."""
+    method = "recognize_sphinx"
+
+
+class ScriptedBackend:
+    """
+    Offline stand-in that returns the given transcripts, one per segment, so
+    the capture pipeline can be exercised from WAV fixtures.
+    """
+
+    def __init__(self, transcripts: Iterable[str] = ()):
+        self.transcripts = list(transcripts)
+        self.calls = 0
+
+    def transcribe(self, pcm: bytes, sample_rate: int, sample_width: int) -> str:
+        self.calls += 1
+        return self.transcripts.pop(0) if self.transcripts else ""
+
+
+BACKENDS: Dict[str, Callable] = {
+    "google": GoogleBackend,
+    "sphinx": SphinxBackend,
+    "scripted": ScriptedBackend,
+}
+
+
+def make_backend(name: str, **kwargs):
+    try:
+        return BACKENDS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown speech backend '{name}', expected one of {sorted(BACKENDS)}.")
+
+
+# -------------------- Audio sources --------------------
+
+class MicrophoneSource:
+    """A microphone stream opened once and read chunk by chunk."""
+
+    def __init__(self, device_index: Optional[int] = None, chunk_size: int = 1024):
+        import speech_recognition as sr
+
+        self._mic = sr.Microphone(device_index=device_index, chunk_size=chunk_size)
+        self._mic.__enter__()
+        self.sample_rate = self._mic.SAMPLE_RATE
+        self.sample_width = self._mic.SAMPLE_WIDTH
+        self.chunk_size = self._mic.CHUNK
+
+    def read(self) -> bytes:
+        return self._mic.stream.read(self.chunk_size)
+
+    def discard_pending(self):
+        # Drop audio buffered while nobody was listening (e.g. our own TTS)
+        stream = self._mic.stream.pyaudio_stream
+        pending = stream.get_read_available()
+        if pending:
+            stream.read(pending, exception_on_overflow=False)
+
+    def close(self):
+        self._mic.__exit__(None, None, None)
+
+
+class WavSource:
+    """Reads a 16-bit mono WAV file as if it were a live microphone."""
+
+    def __init__(self, path: str, chunk_size: int = 1024):
+        self._wav = wave.open(path, "rb")
+        if self._wav.getsampwidth() != 2 or self._wav.getnchannels() != 1:
+            raise ValueError("Only 16-bit mono WAV files are supported.")
+        self.sample_rate = self._wav.getframerate()
+        self.sample_width = 2
+        self.chunk_size = chunk_size
+
+    def read(self) -> bytes:
+        return self._wav.readframes(self.chunk_size)
+
+    def discard_pending(self):
+        pass
+
+    def close(self):
+        self._wav.close()
+
+
+def rms(chunk: bytes) -> float:
+    samples = array("h", chunk[: len(chunk) - len(chunk) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+# -------------------- Streaming capture --------------------
+
+class StreamingCapture:
+    """
+    Keeps one audio source open across questions and calibrates for ambient
+    noise once. While the candidate speaks, every stretch of speech followed
+    by a short pause is handed to a recognizer worker, so most of the answer
+    is already transcribed when it ends and ``on_partial`` receives the
+    transcript so far as each segment completes.
+    """
+
+    def __init__(
+        self,
+        source,
+        backend,
+        pause_seconds: float = 0.5,
+        end_seconds: float = 1.2,
+        energy_threshold: Optional[float] = None,
+        min_energy_threshold: float = 50.0,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ):
+        self.source = source
+        self.backend = backend
+        self.pause_seconds = pause_seconds
+        self.end_seconds = end_seconds
+        self.energy_threshold = energy_threshold
+        self.min_energy_threshold = min_energy_threshold
+        self.on_partial = on_partial
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-worker")
+
+    def _chunk_seconds(self, chunk: bytes) -> float:
+        return len(chunk) / self.source.sample_width / self.source.sample_rate
+
+    def calibrate(self, seconds: float = 1.0) -> float:
+        levels, elapsed = [], 0.0
+        while elapsed < seconds:
+            chunk = self.source.read()
+            if not chunk:
+                break
+            levels.append(rms(chunk))
+            elapsed += self._chunk_seconds(chunk)
+        ambient = sum(levels) / len(levels) if levels else 0.0
+        self.energy_threshold = max(ambient * 1.5, self.min_energy_threshold)
+        return self.energy_threshold
+
+    def _submit(self, segment: bytes, futures: List[Future], partials: List[str]):
+        future = self._worker.submit(
+            self.backend.transcribe, bytes(segment), self.source.sample_rate, self.source.sample_width
+        )
+        futures.append(future)
+        if self.on_partial is not None:
+            future.add_done_callback(lambda _: self._report_partial(futures, partials))
+
+    def _report_partial(self, futures: List[Future], partials: List[str]):
+        # Only the contiguous run of finished segments, in order
+        texts = []
+        for future in list(futures):
+            if not future.done() or future.exception() is not None:
+                break
+            if future.result():
+                texts.append(future.result())
+        text = " ".join(texts)
+        if text and (not partials or text != partials[-1]):
+            partials.append(text)
+            self.on_partial(text)
+
+    def listen(self, timeout: Optional[float] = 5, phrase_time_limit: Optional[float] = None) -> str:
+        """
+        Capture one answer and return its transcript, or "" when nobody
+        spoke within ``timeout`` seconds. Raises TranscriptionError when the
+        backend fails.
+        """
+        if self.energy_threshold is None:
+            self.calibrate()
+        self.source.discard_pending()
+
+        futures: List[Future] = []
+        partials: List[str] = []
+        segment = bytearray()
+        preroll = b""
+        voiced = started = False
+        waited = spoken = silent_for = 0.0
+
+        while True:
+            chunk = self.source.read()
+            if not chunk:
+                break
+            seconds = self._chunk_seconds(chunk)
+            loud = rms(chunk) > self.energy_threshold
+
+            if not started:
+                if not loud:
+                    waited += seconds
+                    preroll = chunk
+                    if timeout is not None and waited >= timeout:
+                        return ""
+                    continue
+                started = True
+                segment += preroll
+
+            spoken += seconds
+            if loud:
+                segment += chunk
+                voiced = True
+                silent_for = 0.0
+            else:
+                silent_for += seconds
+                if voiced:
+                    segment += chunk
+
+            if silent_for >= self.end_seconds:
+                break
+            if phrase_time_limit is not None and spoken >= phrase_time_limit:
+                break
+            if voiced and silent_for >= self.pause_seconds:
+                self._submit(segment, futures, partials)
+                segment, voiced = bytearray(), False
+
+        if voiced:
+            self._submit(segment, futures, partials)
+        return " ".join(text for text in (future.result() for future in futures) if text)
+
+    def close(self):
+        self._worker.shutdown(wait=True)
+        self.source.close()
+
+
+# -------------------- Uploaded audio --------------------
+
+class Segmenter:
+    """
+    Cuts 16-bit mono PCM fed in chunks of any size into segments at pauses,
+    so each stretch of speech can be transcribed while the rest of the
+    answer is still arriving. A segment is also cut once it reaches
+    ``max_segment_seconds``, which bounds what is buffered. Leading silence
+    is dropped except for one frame of preroll.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        sample_width: int = 2,
+        energy_threshold: float = 300.0,
+        pause_seconds: float = 0.5,
+        max_segment_seconds: float = 15.0,
+        frame_seconds: float = 0.03,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.energy_threshold = energy_threshold
+        self.pause_seconds = pause_seconds
+        self.max_segment_seconds = max_segment_seconds
+        self.frame_seconds = frame_seconds
+        self.frame_bytes = max(1, int(sample_rate * frame_seconds)) * sample_width
+        self._pending = bytearray()
+        self._segment = bytearray()
+        self._preroll = b""
+        self._voiced = False
+        self._silent_for = 0.0
+
+    def _segment_seconds(self) -> float:
+        return len(self._segment) / self.sample_width / self.sample_rate
+
+    def _cut(self) -> bytes:
+        segment = bytes(self._segment)
+        self._segment = bytearray()
+        self._voiced = False
+        self._silent_for = 0.0
+        return segment
+
+    def _frame(self, frame: bytes) -> Optional[bytes]:
+        loud = rms(frame) > self.energy_threshold
+        if not self._voiced and not loud:
+            self._preroll = frame
+            return None
+        if not self._voiced:
+            self._segment += self._preroll
+            self._voiced = True
+        self._segment += frame
+        self._silent_for = 0.0 if loud else self._silent_for + self.frame_seconds
+        if self._silent_for >= self.pause_seconds or self._segment_seconds() >= self.max_segment_seconds:
+            return self._cut()
+        return None
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """The segments completed by this chunk."""
+        self._pending += pcm
+        segments = []
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[: self.frame_bytes])
+            del self._pending[: self.frame_bytes]
+            segment = self._frame(frame)
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> Optional[bytes]:
+        """The last segment, at the end of the audio, if it holds any speech."""
+        if self._voiced:
+            self._segment += self._pending
+        self._pending = bytearray()
+        return self._cut() if self._voiced else None
+
+
+_process_backends: Dict[str, object] = {}
+
+
+def transcribe_segment(backend: str, pcm: bytes, sample_rate: int, sample_width: int = 2) -> str:
+    """
+    Transcribe one segment with the named backend, created once per process.
+    Module level so it can be sent to a process pool.
+    """
+    instance = _process_backends.get(backend)
+    if instance is None:
+        instance = _process_backends[backend] = make_backend(backend)
+    return instance.transcribe(pcm, sample_rate, sample_width)
+
+
+# -------------------- Speech output --------------------
+
+class SilentEngine:
+    """
+    Offline pyttsx3 stand-in: "speaks" one word every ``word_seconds`` and
+    fires the started-word callbacks, without producing audio.
+    """
+
+    def __init__(self, word_seconds: float = 0.0):
+        self.word_seconds = word_seconds
+        self.spoken: List[str] = []
+        self._callbacks: List[Callable] = []
+        self._pending = ""
+        self._stopped = False
+
+    def connect(self, topic: str, callback: Callable):
+        if topic == "started-word":
+            self._callbacks.append(callback)
+
+    def say(self, text: str):
+        self._pending = text
+
+    def stop(self):
+        self._stopped = True
+
+    def runAndWait(self):
+        self._stopped = False
+        words = []
+        for word in self._pending.split():
+            for callback in self._callbacks:
+                callback(None, 0, len(word))
+            if self._stopped:
+                break
+            words.append(word)
+            if self.word_seconds:
+                time.sleep(self.word_seconds)
+        self.spoken.append(" ".join(words))
+
+
+class SpeechWorker:
+    """
+    Speaks queued text on a background thread so callers do not block in
+    ``runAndWait``. ``say`` returns a Future that resolves to True when the
+    text was spoken in full and False when it was cut off or dropped by
+    ``cancel`` (barge-in); use ``add_done_callback`` for completion hooks.
+
+    ``engine_factory`` builds a pyttsx3-style engine; it is called on the
+    worker thread, which is the only thread that touches the engine.
+    """
+
+    def __init__(self, engine_factory: Callable):
+        self.engine_factory = engine_factory
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._speaking: Optional[int] = None
+        self._thread = threading.Thread(target=self._run, name="speech-output", daemon=True)
+        self._thread.start()
+
+    def say(self, text: str) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self._queue.put((text, future, self._generation))
+        return future
+
+    def cancel(self):
+        """Stop the current utterance and drop everything queued so far."""
+        with self._lock:
+            self._generation += 1
+
+    def wait_idle(self):
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _stale(self, generation: int) -> bool:
+        with self._lock:
+            return generation != self._generation
+
+    def _on_word(self, name, location, length):
+        if self._speaking is not None and self._stale(self._speaking):
+            self._engine.stop()
+
+    def _run(self):
+        self._engine = self.engine_factory()
+        self._engine.connect("started-word", self._on_word)
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                text, future, generation = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if self._stale(generation):
+                    future.set_result(False)
+                    continue
+                self._speaking = generation
+                try:
+                    self._engine.say(text)
+                    self._engine.runAndWait()
+                except Exception as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(not self._stale(generation))
+                finally:
+                    self._speaking = None
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,47 @@
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Work done once a server starts (chat_web_ai/wsgi.py when it is imported,
+# the lifespan startup event in chat_web_ai/asgi.py), not in
+# AppConfig.ready(), which also runs for every management command: migrate
+# on a fresh database, test, shell and so on.
+
+
+def warm_up():
+    """Load what the first requests would otherwise wait for."""
+    if settings.QUESTION_BANK_WARM_UP:
+        warm_question_bank()
+    if settings.NLP_WARM_UP:
+        warm_nlp()
+
+
+def warm_nlp():
+    from .nlp_service import get_nlp_service
+
+    try:
+        get_nlp_service().warm_up(
+            load_budget_seconds=settings.NLP_LOAD_BUDGET_SECONDS,
+            rss_budget_mb=settings.NLP_RSS_BUDGET_MB,
+        )
+    except OSError:
+        # The model is loaded again on first use, where the error surfaces
+        logger.exception("Could not warm up the spaCy model")
+
+
+def warm_question_bank():
+    from .question_bank import get_question_bank
+
+    bank = get_question_bank()
+    if bank.is_loaded:
+        return
+    try:
+        count = bank.warm_up()
+    except DatabaseError:
+        # Not migrated yet; topics are then read from the table on first use
+        logger.warning("Could not warm up the question bank")
+    else:
+        logger.info("Loaded %d questions into the question bank", count)
@@ -0,0 +1,353 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The skill taxonomy: canonical skills with a category and aliases, kept as
+# JSON and compiled into a binary artifact that every worker memory-maps, so
+# the pages are shared through the OS page cache and a worker only adds the
+# PhraseMatcher it extracts with. Both paths can be overridden with the
+# SKILL_TAXONOMY_PATH and SKILL_TAXONOMY_ARTIFACT environment variables.
+DEFAULT_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+)
+
+# Artifact layout (little-endian): header, the phrase table, the skill
+# table, the category table and one UTF-8 blob that the tables point into.
+# Phrases are every skill name and alias, tokenized and lowercased the way
+# the matcher sees text, with tokens joined by single spaces, in sorted order.
+MAGIC = b"SKTAXv2\0"
+_HEADER = struct.Struct("<8s32sIII")  # magic, fingerprint, phrases, skills, categories
+_PHRASE = struct.Struct("<III")  # blob offset, length, skill index
+_SKILL = struct.Struct("<III")  # blob offset, length, category index
+_CATEGORY = struct.Struct("<II")  # blob offset, length
+
+
+def default_artifact_path(source: str) -> str:
+    return os.getenv("SKILL_TAXONOMY_ARTIFACT") or os.path.splitext(source)[0] + ".bin"
+
+
+def load_taxonomy_source(path: str = DEFAULT_TAXONOMY_PATH) -> List[Dict]:
+    """Read ``{"skills": [{"skill", "category", "aliases"}, ...]}``."""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    skills = data["skills"] if isinstance(data, dict) else data
+    for entry in skills:
+        if not isinstance(entry, dict) or not entry.get("skill"):
+            raise ValueError(f"Taxonomy entries need a 'skill': {entry!r}")
+    return skills
+
+
+def _default_tokenize() -> Callable[[str], List[str]]:
+    import spacy
+
+    tokenizer = spacy.blank("en").tokenizer
+    return lambda text: [token.lower_ for token in tokenizer(text)]
+
+
+def compile_taxonomy(skills: Iterable[Dict], tokenize: Optional[Callable[[str], List[str]]] = None) -> bytes:
+    """
+    Compile taxonomy entries into the artifact format. Every skill matches
+    its own name and its aliases; a phrase claimed by two skills is an error.
+    """
+    tokenize = tokenize or _default_tokenize()
+    categories: Dict[str, int] = {}
+    names: List[str] = []
+    skill_categories: List[int] = []
+    phrases: Dict[bytes, int] = {}
+
+    for entry in sorted(skills, key=lambda e: e["skill"].lower()):
+        name = entry["skill"].lower().strip()
+        category = (entry.get("category") or "").lower().strip()
+        index = len(names)
+        names.append(name)
+        skill_categories.append(categories.setdefault(category, len(categories)))
+        for phrase in [name, *entry.get("aliases", [])]:
+            tokens = tokenize(phrase.lower())
+            if not tokens:
+                continue
+            key = " ".join(tokens).encode("utf-8")
+            if phrases.get(key, index) != index:
+                owner = names[phrases[key]]
+                raise ValueError(
+                    f"Skill {name!r} is listed twice" if owner == name
+                    else f"{phrase!r} belongs to both {owner!r} and {name!r}"
+                )
+            phrases[key] = index
+
+    blob = bytearray()
+
+    def store(data: bytes) -> Tuple[int, int]:
+        offset = len(blob)
+        blob.extend(data)
+        return offset, len(data)
+
+    tables = bytearray()
+    for key in sorted(phrases):
+        tables += _PHRASE.pack(*store(key), phrases[key])
+    for name, category in zip(names, skill_categories):
+        tables += _SKILL.pack(*store(name.encode("utf-8")), category)
+    for category in categories:
+        tables += _CATEGORY.pack(*store(category.encode("utf-8")))
+
+    body = bytes(tables) + bytes(blob)
+    fingerprint = hashlib.sha256(body).digest()
+    header = _HEADER.pack(MAGIC, fingerprint, len(phrases), len(names), len(categories))
+    return header + body
+
+
+def write_artifact(source: str, artifact: str, tokenize: Optional[Callable[[str], List[str]]] = None) -> str:
+    """
+    Compile ``source`` into ``artifact``, replacing it atomically. The
+    artifact takes the source's mtime, which is how workers tell whether it
+    is current.
+    """
+    source_mtime = os.stat(source).st_mtime_ns
+    data = compile_taxonomy(load_taxonomy_source(source), tokenize)
+    directory = os.path.dirname(os.path.abspath(artifact))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.utime(tmp, ns=(source_mtime, source_mtime))
+        os.replace(tmp, artifact)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return artifact
+
+
+class _MappedTaxonomy:
+    """Read-only view of one mapped artifact."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            self.buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if len(self.buffer) < _HEADER.size:
+            raise ValueError(f"{path} is not a compiled skill taxonomy of this version")
+        magic, fingerprint, self.phrases, self.skills, self.categories = _HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled skill taxonomy of this version")
+        self.fingerprint = fingerprint.hex()
+        self._phrase_table = _HEADER.size
+        self._skill_table = self._phrase_table + self.phrases * _PHRASE.size
+        self._category_table = self._skill_table + self.skills * _SKILL.size
+        self._blob = self._category_table + self.categories * _CATEGORY.size
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._blob + offset
+        return self.buffer[start:start + length]
+
+    def entries(self) -> Iterator[Tuple[bytes, int]]:
+        """(phrase, skill index) of every phrase, in phrase order."""
+        for index in range(self.phrases):
+            offset, length, skill = _PHRASE.unpack_from(self.buffer, self._phrase_table + index * _PHRASE.size)
+            yield self._string(offset, length), skill
+
+    def skill(self, index: int) -> Tuple[str, int]:
+        offset, length, category = _SKILL.unpack_from(self.buffer, self._skill_table + index * _SKILL.size)
+        return self._string(offset, length).decode("utf-8"), category
+
+    def category(self, index: int) -> str:
+        offset, length = _CATEGORY.unpack_from(self.buffer, self._category_table + index * _CATEGORY.size)
+        return self._string(offset, length).decode("utf-8")
+
+
+class SkillTaxonomy:
+    """
+    Memory-mapped skill taxonomy. Reads go to the artifact in place; at
+    most every ``check_interval`` seconds the source and artifact are
+    stat'ed, the artifact is recompiled when the source has changed, and a
+    changed artifact (e.g. rebuilt by another worker) is mapped again.
+    ``fingerprint`` changes with the content, so caches of extracted topics
+    can key on it.
+    """
+
+    def __init__(
+        self,
+        source: str = DEFAULT_TAXONOMY_PATH,
+        artifact: Optional[str] = None,
+        check_interval: float = 2.0,
+        tokenize: Optional[Callable[[str], List[str]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.source = str(source)
+        self.artifact = str(artifact) if artifact else default_artifact_path(self.source)
+        self.check_interval = check_interval
+        self.tokenize = tokenize
+        self.clock = clock
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._mapped: Optional[_MappedTaxonomy] = None
+        self._checked = float("-inf")
+
+    def _stale(self) -> bool:
+        try:
+            artifact_mtime = os.stat(self.artifact).st_mtime_ns
+        except FileNotFoundError:
+            return True
+        try:
+            return os.stat(self.source).st_mtime_ns != artifact_mtime
+        except FileNotFoundError:
+            # Deployed with only the compiled artifact
+            return False
+
+    def _refresh(self):
+        if self._stale():
+            write_artifact(self.source, self.artifact, self.tokenize)
+            logger.info("Compiled skill taxonomy %s into %s", self.source, self.artifact)
+        stat = os.stat(self.artifact)
+        mapped = self._mapped
+        if mapped is None or mapped.identity != (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+            try:
+                fresh = _MappedTaxonomy(self.artifact)
+            except ValueError:
+                if not os.path.exists(self.source):
+                    raise
+                # Compiled by a version with another artifact format
+                write_artifact(self.source, self.artifact, self.tokenize)
+                fresh = _MappedTaxonomy(self.artifact)
+            # Readers holding the old mapping keep using it until they finish
+            self._mapped = fresh
+            if mapped is not None:
+                self.reloads += 1
+                logger.info("Reloaded skill taxonomy (%d phrases)", self._mapped.phrases)
+
+    def _current(self) -> _MappedTaxonomy:
+        now = self.clock()
+        if self._mapped is None or now - self._checked >= self.check_interval:
+            with self._lock:
+                if self._mapped is None or now - self._checked >= self.check_interval:
+                    try:
+                        self._refresh()
+                    except (OSError, ValueError):
+                        if self._mapped is None:
+                            raise
+                        logger.exception("Could not reload the skill taxonomy; keeping the loaded one")
+                    self._checked = now
+        return self._mapped
+
+    @property
+    def fingerprint(self) -> str:
+        return self._current().fingerprint
+
+    def __len__(self):
+        return self._current().skills
+
+    def skills(self) -> Iterator[str]:
+        mapped = self._current()
+        for index in range(mapped.skills):
+            yield mapped.skill(index)[0]
+
+    def phrases(self) -> Iterator[Tuple[str, str]]:
+        """(tokenized phrase, canonical skill) of every name and alias."""
+        mapped = self._current()
+        for phrase, skill in mapped.entries():
+            yield phrase.decode("utf-8"), mapped.skill(skill)[0]
+
+    def stats(self) -> Dict:
+        mapped = self._current()
+        return {
+            "source": self.source,
+            "artifact": self.artifact,
+            "fingerprint": mapped.fingerprint,
+            "skills": mapped.skills,
+            "phrases": mapped.phrases,
+            "categories": mapped.categories,
+            "bytes": len(mapped.buffer),
+            "reloads": self.reloads,
+        }
+
+
+class TaxonomyMatcher:
+    """
+    Skill extraction backed by a SkillTaxonomy: texts are tokenized with
+    ``nlp`` and run through a PhraseMatcher holding every phrase of the
+    mapped artifact, aliases labelled with their canonical skill. The
+    PhraseMatcher is rebuilt when the taxonomy's fingerprint changes; under
+    a preforking server it is built once in the master (see prefork.py) and
+    shared with the workers.
+
+    Only blank texts skip the matcher. The substring prefilter the keyword
+    matcher had is gone: over this taxonomy it cost more than tokenizing
+    and matching the text it was meant to spare.
+    """
+
+    def __init__(self, nlp, taxonomy: SkillTaxonomy):
+        self.nlp = nlp
+        self.taxonomy = taxonomy
+        self._lock = threading.Lock()
+        self._compiled: Optional[Tuple[str, object]] = None
+
+    @property
+    def fingerprint(self) -> str:
+        return self.taxonomy.fingerprint
+
+    def _build(self):
+        from spacy.matcher import PhraseMatcher
+        from spacy.tokens import Doc
+
+        # Phrases are stored tokenized, so their docs skip the tokenizer
+        patterns: Dict[str, List] = {}
+        for phrase, skill in self.taxonomy.phrases():
+            patterns.setdefault(skill, []).append(Doc(self.nlp.vocab, words=phrase.split(" ")))
+        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        for skill, docs in patterns.items():
+            matcher.add(skill, docs)
+        return matcher
+
+    @property
+    def matcher(self):
+        fingerprint = self.taxonomy.fingerprint
+        compiled = self._compiled
+        if compiled is None or compiled[0] != fingerprint:
+            with self._lock:
+                compiled = self._compiled
+                if compiled is None or compiled[0] != fingerprint:
+                    compiled = self._compiled = (fingerprint, self._build())
+        return compiled[1]
+
+    def match_doc(self, doc) -> List[str]:
+        strings = self.nlp.vocab.strings
+        return sorted({strings[match_id] for match_id, _, _ in self.matcher(doc)})
+
+    def extract(self, text: str) -> List[str]:
+        if not text.strip():
+            return []
+        return self.match_doc(self.nlp.make_doc(text.lower()))
+
+    def extract_many(self, texts: Iterable[str], batch_size: int = 256) -> List[List[str]]:
+        """
+        Batched ``extract``: non-blank texts are tokenized together through
+        ``nlp.pipe`` with every pipeline component disabled.
+        """
+        texts = [text.lower() for text in texts]
+        results: List[List[str]] = [[] for _ in texts]
+        candidates = [i for i, text in enumerate(texts) if text.strip()]
+        docs = self.nlp.pipe(
+            (texts[i] for i in candidates), batch_size=batch_size, disable=self.nlp.pipe_names
+        )
+        for i, doc in zip(candidates, docs):
+            results[i] = self.match_doc(doc)
+        return results
+
+
+_taxonomies: Dict[str, SkillTaxonomy] = {}
+_taxonomies_lock = threading.Lock()
+
+
+def get_skill_taxonomy(source: str = DEFAULT_TAXONOMY_PATH) -> SkillTaxonomy:
+    with _taxonomies_lock:
+        if source not in _taxonomies:
+            _taxonomies[source] = SkillTaxonomy(source)
+        return _taxonomies[source]
@@ -1,5 +1,5 @@
-let currentTopicIndex = 0;
-    let topics = [];
+let interviewId = null;
+    let currentTopic = null;
     let jobDescription = "AI/ML development, focusing on LLMs, LangChain, or Agentic AI.Strong proficiency in Python and AI frameworks like LangChain, Hugging Face, OpenAI, and other LLM APIs.Hands-on experience in NLP, prompt engineering, embeddings, and vector search.Familiarity with multi-agent AI architectures and retrieval-augmented generation (RAG).Experience with database systems (SQL, NoSQL, or vector databases like Pinecone, ChromaDB, or FAISS).Strong problem-solving and analytical skills.Understanding of API development and integration with backend systems.";
 
     function startInterview() {
@@ -10,39 +10,30 @@ let currentTopicIndex = 0;
       fetch("/interview/", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ jd: jobDescription }),
+        body: JSON.stringify({ action: "start", jd: jobDescription }),
       })
         .then((res) => res.json())
         .then((data) => {
           if (data.topics && data.topics.length > 0) {
-            topics = data.topics;
-            askNextQuestion();
+            interviewId = data.interview_id;
+            showQuestion(data);
           } else {
             speak("No skills found in job description.");
           }
         });
     }
 
-    function askNextQuestion() {
-      if (currentTopicIndex >= topics.length) {
+    function showQuestion(data) {
+      if (data.done) {
         speak("Interview complete. Great job!");
         document.getElementById("question").innerText = "Interview finished.";
         document.getElementById("wave").style.display = "none";
         return;
       }
 
-      const topic = topics[currentTopicIndex];
-
-      fetch("/interview/", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ topic: topic }),
-      })
-        .then((res) => res.json())
-        .then((data) => {
-          document.getElementById("question").innerText = data.question;
-          speak(data.question);
-        });
+      currentTopic = data.topic;
+      document.getElementById("question").innerText = data.question;
+      speak(data.question);
     }
 
     function recordAnswer() {
@@ -56,21 +47,20 @@ let currentTopicIndex = 0;
         document.getElementById("wave").style.display = "none";
 
         const response = event.results[0][0].transcript;
-        const topic = topics[currentTopicIndex];
 
+        // One round trip: feedback for this answer plus the next question
         fetch("/interview/", {
           method: "POST",
           headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ response: response, topic: topic }),
+          body: JSON.stringify({ action: "turn", interview_id: interviewId, response: response }),
         })
           .then((res) => res.json())
           .then((data) => {
             document.getElementById("feedback").innerText = data.feedback;
             document.getElementById("feedback").style.backgroundColor = "#d1f2eb";
             speak(data.feedback);
-            currentTopicIndex += 1;
             setTimeout(() => {
-              askNextQuestion();
+              showQuestion(data);
             }, 3000);
           });
       };
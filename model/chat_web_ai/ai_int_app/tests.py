@@ -1,3 +1,1513 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gc
+import importlib.util
+import math
+import multiprocessing
+import io
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from unittest import mock, skipIf
 
-# Create your tests here.
+import spacy
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+from . import benchmarks, nlp_service, speech, startup, views
+from .admission import IN_PROGRESS, NEW, AdmissionController, Rejected
+from .audio_upload import UploadStore
+from .benchmarks import write_wav
+from .cpu_pool import CPUPool
+from .export import EXPORT_COLUMNS, export_queryset, iter_csv, iter_row_chunks
+from .ingest import ingest_records, iter_jd_records
+from .latency import percentile
+from .loadtest import LoadTest
+from .models import Interview, InterviewTurn, JobDescription, Question, TopicCacheEntry
+from .llm_cache import LLMCache, cache_key
+from .llm_gateway import LLMError, LLMGateway
+from .llm_stub import StubServer
+from .memory import child_pids, process_memory, summarize_workers
+from .metrics import ADMISSION_SHED, INTERVIEW_REQUESTS, PHASE_SECONDS, RESULTS_DROPPED, Registry, registry, span
+from .nlp_service import NLPService
+from . import prefork
+from .profiling import RequestProfiler, StackSampler
+from .question_bank import QUESTION_KINDS, QuestionBank
+from .results_store import WriteBehindBuffer
+from .scoring import AnswerScorer
+from .sessions import SessionStore
+from .taxonomy import SkillTaxonomy, TaxonomyMatcher, compile_taxonomy, get_skill_taxonomy
+from .websocket import IDLE_CLOSE_CODE, InterviewSocket
+from .speech import ScriptedBackend, Segmenter, SilentEngine, SpeechWorker, StreamingCapture, WavSource
+from .topic_cache import TopicCache
+
+
+class TaxonomyMatcherTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.taxonomy = get_skill_taxonomy()
+        cls.matcher = TaxonomyMatcher(spacy.blank("en"), cls.taxonomy)
+
+    def test_single_and_multi_word_skills(self):
+        found = self.matcher.extract("Machine Learning with Python, CI/CD and problem solving.")
+        self.assertEqual(found, ["ci/cd", "machine learning", "problem solving", "python"])
+
+    def test_matches_whole_tokens_only(self):
+        self.assertEqual(self.matcher.extract("We maintain javascript"), ["javascript"])
+
+    def test_text_without_keywords(self):
+        self.assertEqual(self.matcher.extract("nothing relevant here"), [])
+
+    def test_batched_extraction_agrees(self):
+        texts = ["Full-stack work in ReactJS, node js and k8s", "Python3 and NoSQL", "", "no skills"]
+        expected = [self.matcher.extract(t) for t in texts]
+        self.assertEqual(expected[0], ["fullstack", "javascript", "kubernetes", "node.js", "react"])
+        self.assertEqual(expected[2:], [[], []])
+        self.assertEqual(self.matcher.extract_many(texts), expected)
+
+    def test_only_blank_texts_skip_the_tokenizer(self):
+        # There is no substring prefilter: text without skills is tokenized too
+        with mock.patch.object(self.matcher.nlp, "make_doc", wraps=self.matcher.nlp.make_doc) as make_doc:
+            self.assertEqual(self.matcher.extract("  \n"), [])
+            make_doc.assert_not_called()
+            self.assertEqual(self.matcher.extract("nothing relevant here"), [])
+            make_doc.assert_called_once_with("nothing relevant here")
+
+
+class SkillTaxonomyTests(SimpleTestCase):
+    SKILLS = [
+        {"skill": "Kubernetes", "category": "devops", "aliases": ["k8s"]},
+        {"skill": "node.js", "category": "frameworks", "aliases": ["nodejs", "node js"]},
+        {"skill": "ci/cd", "category": "devops", "aliases": ["continuous integration"]},
+        {"skill": "sql", "category": "languages", "aliases": ["postgres"]},
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = os.path.join(self.tmp.name, "taxonomy.json")
+        self.write_source(self.SKILLS)
+        self.taxonomy = SkillTaxonomy(self.source, check_interval=0)
+
+    def write_source(self, skills):
+        with open(self.source, "w", encoding="utf-8") as handle:
+            json.dump({"skills": skills}, handle)
+
+    def test_aliases_resolve_to_canonical_skills(self):
+        matcher = TaxonomyMatcher(spacy.blank("en"), self.taxonomy)
+        found = matcher.extract("K8s, NodeJS and Postgres with continuous integration; node js too")
+        self.assertEqual(found, ["ci/cd", "kubernetes", "node.js", "sql"])
+        self.assertEqual(matcher.extract("continuous delivery of nothing"), [])
+        self.assertIn(("k8s", "kubernetes"), set(self.taxonomy.phrases()))
+        self.assertEqual(sorted(self.taxonomy.skills()), ["ci/cd", "kubernetes", "node.js", "sql"])
+        self.assertEqual(self.taxonomy.stats()["phrases"], 9)
+
+    def test_phrase_claimed_twice_is_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_taxonomy([{"skill": "go", "aliases": ["golang"]}, {"skill": "golang"}])
+
+    def test_source_changes_are_picked_up_without_restart(self):
+        before = self.taxonomy.fingerprint
+        self.assertNotIn("docker", set(self.taxonomy.skills()))
+        self.write_source(self.SKILLS + [{"skill": "docker", "category": "devops"}])
+        # Make sure the mtime changes on filesystems with coarse timestamps
+        os.utime(self.source, ns=(time.time_ns() + 10**9,) * 2)
+
+        self.assertIn("docker", set(self.taxonomy.skills()))
+        self.assertNotEqual(self.taxonomy.fingerprint, before)
+        self.assertEqual(self.taxonomy.reloads, 1)
+        self.assertEqual(SkillTaxonomy(self.source).fingerprint, self.taxonomy.fingerprint)
+
+    def test_artifact_of_another_format_is_recompiled(self):
+        fingerprint = self.taxonomy.fingerprint
+        stat = os.stat(self.taxonomy.artifact)
+        with open(self.taxonomy.artifact, "wb") as handle:
+            handle.write(b"old format")
+        os.utime(self.taxonomy.artifact, ns=(stat.st_mtime_ns, stat.st_mtime_ns))
+        self.assertEqual(SkillTaxonomy(self.source).fingerprint, fingerprint)
+
+    def test_reload_retires_cached_topics(self):
+        service = NLPService("blank:en", taxonomy=self.taxonomy)
+        cache = TopicCache(version=self.taxonomy.fingerprint, persistent=False)
+        cache.put("Docker and k8s", ["kubernetes"])
+        with mock.patch.object(views, "nlp_service", service), mock.patch.object(views, "topic_cache", cache):
+            self.assertEqual(views.extract_skills_from_jd("Docker and k8s"), ["kubernetes"])
+            self.write_source(self.SKILLS + [{"skill": "docker"}])
+            os.utime(self.source, ns=(time.time_ns() + 10**9,) * 2)
+            self.assertEqual(views.extract_skills_from_jd("Docker and k8s"), ["docker", "kubernetes"])
+
+
+class NLPServiceTests(SimpleTestCase):
+    def test_loads_lazily_and_reports_stats(self):
+        service = NLPService("blank:en")
+        self.assertFalse(service.is_loaded)
+        self.assertFalse(service.stats()["loaded"])
+
+        stats = service.warm_up(load_budget_seconds=60)
+        self.assertTrue(service.is_loaded)
+        self.assertEqual(stats["pipes"], [])
+        self.assertGreaterEqual(stats["load_seconds"], 0)
+        self.assertEqual(service.matcher.extract("Docker"), ["docker"])
+
+
+class AnswerScorerTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.scorer = AnswerScorer()
+
+    def test_naming_the_topic_is_not_enough(self):
+        self.assertEqual(self.scorer.score("python", "Python, python and more Python"), 0.0)
+        self.assertEqual(self.scorer.grade(self.scorer.score("machine learning", "I know machine learning")), "weak")
+
+    def test_detailed_answers_score_higher(self):
+        vague = self.scorer.score("sql", "I have written queries with joins.")
+        detailed = self.scorer.score("sql", (
+            "I designed the schema and indexes, wrote joins and window functions, "
+            "and optimized slow queries by reading query plans."
+        ))
+        self.assertEqual(self.scorer.grade(vague), "partial")
+        self.assertEqual(self.scorer.grade(detailed), "good")
+        self.assertGreater(detailed, vague)
+
+    def test_batch_matches_single_scores(self):
+        answers = ["I wrote dockerfiles", "nothing", "I deployed images to a registry"]
+        batch = self.scorer.score_many("docker", answers)
+        self.assertEqual([round(float(x), 5) for x in batch],
+                         [round(self.scorer.score("docker", a), 5) for a in answers])
+        self.assertIs(self.scorer.reference("docker"), self.scorer.reference("Docker"))
+
+    def test_reference_cache_is_bounded(self):
+        scorer = AnswerScorer(max_references=2)
+        for topic in ["docker", "sql", "made up 1", "made up 2"]:
+            scorer.reference(topic)
+        self.assertEqual(list(scorer._references), ["made up 1", "made up 2"])
+
+
+class BulkIngestTests(TestCase):
+    def test_jsonl_and_csv_records_are_created_and_updated(self):
+        matcher = TaxonomyMatcher(spacy.blank("en"), get_skill_taxonomy())
+        existing = JobDescription.objects.create(title="Old", description="Nothing")
+
+        jsonl = [
+            '{"title": "ML", "description": "Machine learning and Python"}\n',
+            '{"id": %d, "description": "Docker and Kubernetes"}\n' % existing.pk,
+            '{"title": "Empty", "description": ""}\n',
+        ]
+        bank = QuestionBank()
+        stats = ingest_records(iter_jd_records(jsonl, "jsonl"), batch_size=2, matcher=matcher, question_bank=bank)
+        self.assertEqual(stats, {"created": 1, "updated": 1, "skipped": 1})
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.title, "Old")
+        self.assertEqual(existing.topics, ["docker", "kubernetes"])
+        self.assertEqual(JobDescription.objects.get(title="ML").topics, ["machine learning", "python"])
+        self.assertEqual([q["topic"] for q in existing.question_plan], ["docker", "kubernetes"])
+        self.assertEqual(Question.objects.filter(topic="kubernetes").count(), len(QUESTION_KINDS))
+
+        csv_lines = ["title,description\n", "Ops,CI/CD on Linux\n"]
+        stats = ingest_records(iter_jd_records(csv_lines, "csv"), matcher=matcher, question_bank=bank)
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(JobDescription.objects.get(title="Ops").topics, ["ci/cd", "linux"])
+
+    def test_worker_processes_are_spawned(self):
+        records = [{"title": f"JD {n}", "description": "Docker and Python"} for n in range(3)]
+        with mock.patch("multiprocessing.get_context", wraps=multiprocessing.get_context) as get_context:
+            stats = ingest_records(
+                records, batch_size=1, processes=2, model_name="blank:en", question_bank=QuestionBank()
+            )
+        get_context.assert_called_once_with("spawn")
+        self.assertEqual(stats["created"], 3)
+        self.assertEqual(JobDescription.objects.get(title="JD 2").topics, ["docker", "python"])
+
+    def test_endpoint_is_for_staff_with_a_csrf_token(self):
+        upload = {"file": io.BytesIO(b'{"title": "Ops", "description": "Docker"}\n'), "format": "jsonl"}
+        self.assertEqual(self.client.post("/interview/bulk/", upload).status_code, 302)
+        self.assertFalse(JobDescription.objects.filter(title="Ops").exists())
+
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(User.objects.create(username="admin", is_staff=True))
+        upload["file"].seek(0)
+        self.assertEqual(client.post("/interview/bulk/", upload).status_code, 403)
+
+
+class QuestionBankTests(TestCase):
+    def test_stored_questions_replace_templates(self):
+        bank = QuestionBank()
+        self.assertIn("graphql", bank.question("graphql", "experience"))
+        Question.objects.create(topic="graphql", kind="experience", text="How did you design your schema?")
+
+        bank.warm_up()
+        self.assertEqual(bank.questions("graphql"), {"experience": ["How did you design your schema?"]})
+        self.assertEqual(bank.stats(), {"loaded": True, "topics": 1, "questions": 1})
+        with self.assertNumQueries(0):
+            bank.question("graphql")
+            bank.question("rust")
+
+    def test_template_fallbacks_are_not_kept(self):
+        bank = QuestionBank()
+        bank.warm_up()
+        for n in range(3):
+            self.assertIn(f"made-up topic {n}", bank.question(f"made-up topic {n}"))
+        self.assertFalse([topic for topic in bank._questions if topic.startswith("made-up")])
+
+    def test_plan_rotates_question_kinds(self):
+        bank = QuestionBank()
+        self.assertEqual(bank.ensure_topics(["python", "sql"]), 2 * len(QUESTION_KINDS))
+        self.assertEqual(bank.ensure_topics(["python"]), 0)
+        plan = bank.plan(["python", "sql", "python"])
+        self.assertEqual([entry["kind"] for entry in plan], list(QUESTION_KINDS[:3]))
+        self.assertEqual(plan[1]["question"], "What challenges have you faced while working with sql?")
+
+    def test_llm_questions_are_planned_by_their_own_kinds(self):
+        bank = QuestionBank()
+        bank.add_questions({"rust": [
+            {"kind": "behavioral", "question": "Tell me about a borrow checker fight."},
+            {"kind": "technical", "question": "When would you use Rc over Arc?"},
+        ]})
+        plan = bank.plan(["rust", "rust"])
+        self.assertEqual([entry["kind"] for entry in plan], ["behavioral", "technical"])
+        self.assertEqual(Question.objects.filter(topic="rust").count(), 2)
+
+
+class TopicCacheTests(TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def extract(self, text):
+        self.calls.append(text)
+        return ["python"]
+
+    def test_memory_then_persistent_hits(self):
+        cache = TopicCache(version="v1", max_size=1)
+        self.assertEqual(cache.get_or_extract("Python  developer", self.extract), ["python"])
+        self.assertEqual(cache.get_or_extract("python developer\n", self.extract), ["python"])
+        self.assertEqual(self.calls, ["python developer"])
+
+        # Evicted from the LRU, still served from the table
+        cache.get_or_extract("something else", self.extract)
+        cache.get_or_extract("Python developer", self.extract)
+        self.assertEqual(len(self.calls), 2)
+        stats = cache.stats()
+        self.assertEqual((stats["memory_hits"], stats["persistent_hits"], stats["misses"]), (1, 1, 2))
+
+    def test_keyword_change_invalidates(self):
+        cache = TopicCache(version="v1")
+        cache.get_or_extract("Python developer", self.extract)
+        cache.version = "v2"
+        cache.get_or_extract("Python developer", self.extract)
+        self.assertEqual(len(self.calls), 2)
+
+        cache.get_or_extract("Java developer", self.extract)
+        TopicCacheEntry.objects.update(keyword_version="v1")
+        cache.invalidate()
+        self.assertEqual(TopicCacheEntry.objects.count(), 0)
+
+
+@mock.patch.object(views, "results_buffer", WriteBehindBuffer(background=False))
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+@mock.patch.object(views, "question_bank", QuestionBank())
+class InterviewSessionApiTests(TestCase):
+    def post(self, payload):
+        return self.client.post("/interview/", json.dumps(payload), content_type="application/json")
+
+    def test_start_then_one_call_per_turn(self):
+        data = self.post({"action": "start", "jd": "Python and Docker"}).json()
+        self.assertEqual(data["topics"], ["docker", "python"])
+        self.assertEqual(data["topic"], "docker")
+        self.assertIn("docker", data["question"])
+        interview_id = data["interview_id"]
+
+        answer = "I wrote multi-stage dockerfiles to keep our images small and ran the services with docker compose"
+        data = self.post({"action": "turn", "interview_id": interview_id, "response": answer}).json()
+        self.assertIn(data["feedback"], views.POSITIVE_REMARKS)
+        self.assertGreaterEqual(data["score"], views.answer_scorer.good_score)
+        self.assertEqual(data["topic"], "python")
+        self.assertIn("python", data["question"])
+        self.assertFalse(data["done"])
+
+        data = self.post({"action": "turn", "interview_id": interview_id, "response": "Some scripting"}).json()
+        self.assertTrue(data["done"])
+        self.assertIsNone(data["question"])
+
+        session = views.interview_sessions.get(interview_id)
+        self.assertEqual([turn[1] for turn in session.turns], [
+            "Can you explain your experience with docker?",
+            "What challenges have you faced while working with python?",
+        ])
+        self.assertEqual(session.responses, {"docker": answer, "python": "Some scripting"})
+        self.assertEqual(self.post({"action": "turn", "interview_id": interview_id, "response": "x"}).status_code, 409)
+
+    async def test_async_client_topics(self):
+        response = await self.async_client.post(
+            "/interview/", json.dumps({"jd": "Kubernetes and Git"}), content_type="application/json"
+        )
+        self.assertEqual(response.json(), {"topics": ["git", "kubernetes"]})
+        response = await self.async_client.get("/interview/")
+        self.assertEqual(response.status_code, 405)
+
+    def test_unknown_interview(self):
+        response = self.post({"action": "turn", "interview_id": "missing", "response": "x"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_start_from_ingested_question_plan(self):
+        plan = [{"topic": "sql", "kind": "project", "question": "Which query did you tune last?"}]
+        job = JobDescription.objects.create(title="DBA", description="SQL", topics=["sql"], question_plan=plan)
+
+        data = self.post({"action": "start", "job_id": job.pk}).json()
+        self.assertEqual(data["question"], "Which query did you tune last?")
+        self.assertEqual(self.post({"action": "start", "job_id": job.pk + 1}).status_code, 404)
+
+    def test_start_from_job_without_question_plan(self):
+        # The bank is cold, so the plan is read from the table off the loop
+        job = JobDescription.objects.create(title="Dev", description="", topics=["python", "docker"])
+        data = self.post({"action": "start", "job_id": str(job.pk)}).json()
+        self.assertEqual(data["topic"], "python")
+        self.assertIn("python", data["question"])
+        self.assertIn("docker", views.interview_sessions.get(data["interview_id"]).planned[1])
+
+    async def test_concurrent_turns_score_each_topic(self):
+        store = SessionStore(lambda topic: f"What about {topic}?")
+        session = store.create(["git", "sql"])
+        evaluated = []
+
+        async def evaluate(topic, response):
+            evaluated.append(topic)
+            await asyncio.sleep(0)
+            return 1.0, f"{topic}: {response}"
+
+        turns = await asyncio.gather(store.answer(session, "a", evaluate), store.answer(session, "b", evaluate))
+        # The slower turn finds the session moved on and is scored for sql
+        self.assertEqual([turn[3] for turn in turns], ["git: a", "sql: b"])
+        self.assertEqual(evaluated, ["git", "git", "sql"])
+        self.assertEqual(session.turns[1][1], "What about sql?")
+        self.assertIsNone(await store.answer(session, "c", evaluate))
+
+    def test_start_with_malformed_job_id(self):
+        for job_id in ("abc", [1], True):
+            response = self.post({"action": "start", "job_id": job_id})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"error": "job_id must be an integer."})
+
+
+class MetricsTests(SimpleTestCase):
+    def test_render_counters_histograms_and_gauges(self):
+        metrics = Registry()
+        requests = metrics.counter("requests_total", "Requests.")
+        latency = metrics.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        metrics.gauge("queue", "Queue depth.", lambda: {"a": 2, "b": None}, label="pool")
+        requests.inc(call_type="topics")
+        requests.inc(2, call_type="topics")
+        for value in (0.05, 0.5, 3):
+            latency.observe(value, phase="score")
+
+        text = metrics.render()
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        self.assertIn('requests_total{call_type="topics"} 3', text)
+        self.assertIn('latency_seconds_bucket{phase="score",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{phase="score",le="1.0"} 2', text)
+        self.assertIn('latency_seconds_bucket{phase="score",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{phase="score"} 3', text)
+        self.assertIn('queue{pool="a"} 2', text)
+        self.assertNotIn('pool="b"', text)
+
+    def test_label_values_are_escaped(self):
+        metrics = Registry()
+        metrics.counter("requests_total", "Requests.").inc(view='say "hi"\\now\n')
+        self.assertIn('requests_total{view="say \\"hi\\"\\\\now\\n"} 1', metrics.render())
+
+    def test_disabled_registry_records_nothing(self):
+        seen = []
+        registry.add_span_hook(lambda phase, seconds: seen.append(phase))
+        self.addCleanup(registry._span_hooks.clear)
+        with mock.patch.object(registry, "enabled", False):
+            before = PHASE_SECONDS.count(phase="idle")
+            with span("idle"):
+                pass
+            self.assertEqual(PHASE_SECONDS.count(phase="idle"), before)
+        with span("idle"):
+            pass
+        self.assertEqual(PHASE_SECONDS.count(phase="idle"), before + 1)
+        self.assertEqual(seen, ["idle"])
+
+
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+class MetricsEndpointTests(TestCase):
+    def test_scrape_after_requests(self):
+        before = INTERVIEW_REQUESTS.value(call_type="topics")
+        self.client.post("/interview/", json.dumps({"jd": "Redis and Go"}), content_type="application/json")
+        self.assertEqual(INTERVIEW_REQUESTS.value(call_type="topics"), before + 1)
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        text = response.content.decode()
+        self.assertIn('http_request_duration_seconds_count{method="POST",status="200",view="ai_int_app.views.interview_api"}', text)
+        self.assertIn('interview_phase_seconds_count{phase="extract"}', text)
+        self.assertIn('interview_phase_seconds_count{phase="serialize"}', text)
+        self.assertIn("cpu_pool_waiting 0", text)
+        self.assertIn('topic_cache_events_total{outcome="misses"}', text)
+
+        with mock.patch.object(registry, "enabled", False):
+            self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+class RequestProfilerTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def post(self, payload, **headers):
+        return self.client.post("/interview/", json.dumps(payload), content_type="application/json", **headers)
+
+    def test_token_header_writes_a_profile_named_after_the_jd(self):
+        profiler = RequestProfiler(self.tmp.name, token="secret", interval=0.001)
+        with mock.patch.multiple(views.request_profiler, **vars(profiler)):
+            self.post({"jd": "Python and SQL"})
+            self.post({"jd": "Python and SQL"}, HTTP_X_PROFILE_REQUEST="wrong")
+            self.post({"jd": "Python  and sql"}, HTTP_X_PROFILE_REQUEST="secret")
+
+        files = os.listdir(self.tmp.name)
+        self.assertEqual(len(files), 1)
+        digest = views.jd_hash(views.normalize_jd("Python and SQL"))[:16]
+        self.assertIn(f"-interview_api-{digest}-", files[0])
+        self.assertTrue(files[0].endswith(".folded"))
+
+    def test_sample_rate_and_pstats(self):
+        profiler = RequestProfiler(self.tmp.name, sample_rate=1.0, fmt="pstats")
+        with mock.patch.multiple(views.request_profiler, **vars(profiler)):
+            self.post({"topic": "python"})
+        [name] = os.listdir(self.tmp.name)
+        self.assertIn("-interview_api-none-", name)
+        self.assertIsNotNone(pstats.Stats(os.path.join(self.tmp.name, name)))
+
+    def test_sampler_collapses_busy_threads_and_skips_idle_ones(self):
+        stop = threading.Event()
+        busy = threading.Thread(target=lambda: [sum(range(1000)) for _ in iter(stop.is_set, True)], name="busy")
+        idle = threading.Thread(target=stop.wait, name="idle")
+        busy.start()
+        idle.start()
+        sampler = StackSampler()
+        for _ in range(20):
+            sampler.sample()
+        stop.set()
+        busy.join()
+        idle.join()
+
+        stacks = sampler.collapsed().splitlines()
+        self.assertTrue(any(line.startswith("busy;") for line in stacks))
+        self.assertFalse(any(line.startswith("idle;") for line in stacks))
+        self.assertEqual(sum(int(line.rsplit(" ", 1)[1]) for line in stacks), sum(sampler.stacks.values()))
+
+
+@mock.patch.object(views, "results_buffer", WriteBehindBuffer(background=False))
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+class InterviewResultsTests(TestCase):
+    def post(self, client, url, payload):
+        return client.post(url, json.dumps(payload), content_type="application/json").json()
+
+    def test_results_are_stored_per_candidate(self):
+        data = self.post(self.client, "/interview/", {"action": "start", "jd": "Python"})
+        interview_id = data["interview_id"]
+        self.post(self.client, "/interview/", {"action": "turn", "interview_id": interview_id, "response": "python!"})
+        self.post(self.client, "/save-summary/", {"interview_id": interview_id, "responses": {"python": "python!"}})
+
+        summary = self.client.get("/summary/").context["summary"]
+        self.assertEqual(list(summary), ["python"])
+        self.assertEqual(summary["python"]["response"], "python!")
+        self.assertIsNotNone(Interview.objects.get(pk=interview_id).completed_at)
+        self.assertEqual(InterviewTurn.objects.get(interview_id=interview_id).score, 0.0)
+
+        other = self.client_class()
+        self.post(other, "/save-summary/", {"responses": {"java": "legacy answer"}})
+        self.assertEqual(list(other.get("/summary/").context["summary"]), ["java"])
+        self.assertEqual(list(self.client.get("/summary/").context["summary"]), ["python"])
+
+    def test_write_behind_flushes_in_batches(self):
+        buffer = WriteBehindBuffer(background=False)
+        buffer.start_interview("abc", "interview_01", ["git"])
+        buffer.add_turn("abc", 0, "git", "Q?", "A.", "Well said!")
+        self.assertFalse(Interview.objects.exists())
+        buffer.flush()
+        self.assertEqual(InterviewTurn.objects.get(interview_id="abc").feedback, "Well said!")
+
+    def test_failed_writes_are_retried_then_dropped(self):
+        buffer = WriteBehindBuffer(background=False, max_retries=1)
+        buffer.start_interview("abc", "interview_01", ["git"])
+        buffer.add_turn("abc", 0, "git", "Q?", "A.", "Well said!")
+        with mock.patch.object(InterviewTurn.objects, "bulk_create", side_effect=DatabaseError("locked")):
+            buffer.flush()
+        buffer.complete("abc")
+        buffer.flush()
+        self.assertIsNotNone(Interview.objects.get(pk="abc").completed_at)
+        self.assertEqual(InterviewTurn.objects.filter(interview_id="abc").count(), 1)
+
+        before = RESULTS_DROPPED.value(kind="turn")
+        buffer.add_turn("abc", 1, "git", "Q?", "A.", "Well said!")
+        with mock.patch.object(InterviewTurn.objects, "bulk_create", side_effect=DatabaseError("locked")):
+            buffer.flush()
+            buffer.flush()
+        self.assertEqual(RESULTS_DROPPED.value(kind="turn"), before + 1)
+        self.assertEqual(buffer._pending(), 0)
+
+    def test_other_errors_drop_the_batch_and_the_flusher_survives(self):
+        buffer = WriteBehindBuffer(background=False)
+        buffer.add_turn("abc", 0, "git", "Q?", "A.", "Well said!")
+        before = RESULTS_DROPPED.value(kind="turn")
+        with mock.patch.object(InterviewTurn.objects, "bulk_create", side_effect=TypeError("bad row")):
+            buffer.flush()
+        self.assertEqual(RESULTS_DROPPED.value(kind="turn"), before + 1)
+        self.assertEqual(buffer._pending(), 0)
+
+        flushes, flushed = [], threading.Event()
+
+        def flush():
+            flushes.append(1)
+            if len(flushes) == 1:
+                raise RuntimeError("boom")
+            flushed.set()
+
+        buffer = WriteBehindBuffer(flush_interval=0.05)
+        with mock.patch.object(buffer, "flush", side_effect=flush):
+            buffer._ensure_thread()
+            self.assertTrue(flushed.wait(2))
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        started = timezone.now()
+        for n in range(5):
+            interview = Interview.objects.create(
+                id=f"i{n}", candidate=f"interview_0{n % 2 + 1}", topics=["git", "sql"], started_at=started
+            )
+            for index, topic in enumerate(interview.topics):
+                InterviewTurn.objects.create(
+                    interview=interview, index=index, topic=topic, question=f"About {topic}?",
+                    response="An answer, with a comma", feedback="Well said!", score=0.5, answered_at=started,
+                )
+
+    def test_chunks_cover_every_turn_once(self):
+        chunks = list(iter_row_chunks(chunk_size=3))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 3, 1])
+        self.assertEqual(len({(row["interview_id"], row["turn_index"]) for chunk in chunks for row in chunk}), 10)
+
+    def test_csv_endpoint_streams_for_staff_only(self):
+        self.assertEqual(self.client.get("/interview/export/").status_code, 302)
+        self.client.force_login(User.objects.create(username="admin", is_staff=True))
+
+        response = self.client.get("/interview/export/", {"candidate": "interview_02"})
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], ",".join(EXPORT_COLUMNS))
+        self.assertEqual(len(lines), 5)
+        self.assertIn('"[""git"", ""sql""]"', lines[1])
+        self.assertIn('"An answer, with a comma",Well said!,0.5', lines[1])
+        self.assertEqual(self.client.get("/interview/export/", {"format": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get("/interview/export/", {"since": "yesterday"}).status_code, 400)
+
+    def test_csv_cells_are_never_formulas(self):
+        formula = '=HYPERLINK("https://evil.example","Click")'
+        InterviewTurn.objects.filter(interview_id="i0", index=0).update(response=formula, topic="-git")
+        text = "".join(iter_csv(iter_row_chunks(export_queryset(candidate="interview_01"))))
+        rows = list(csv.reader(text.splitlines()))
+        row = dict(zip(rows[0], rows[1]))
+        self.assertEqual((row["response"], row["topic"], row["score"]), ("'" + formula, "'-git", "0.5"))
+
+    async def test_asgi_gets_an_async_stream(self):
+        user = await User.objects.acreate(username="admin", is_staff=True)
+        await sync_to_async(self.client.force_login)(user)
+        self.async_client.cookies = self.client.cookies
+        response = await self.async_client.get("/interview/export/")
+        self.assertTrue(response.is_async)
+        lines = b"".join([part async for part in response.streaming_content]).decode().splitlines()
+        self.assertEqual(len(lines), 11)
+
+    def test_command_writes_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            call_command("export_results", path, chunk_size=4, stdout=io.StringIO())
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(len(handle.read().splitlines()), 11)
+
+    @skipIf(pq is None, "pyarrow is not installed")
+    def test_command_writes_parquet(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.parquet")
+            call_command("export_results", path, chunk_size=4, stdout=io.StringIO())
+            parquet = pq.ParquetFile(path)
+            self.assertEqual((parquet.metadata.num_rows, parquet.num_row_groups), (10, 3))
+
+
+@skipIf(not os.path.exists("/proc/self/smaps"), "needs Linux /proc")
+class PreforkTests(SimpleTestCase):
+    @override_settings(NLP_WARM_UP=False, QUESTION_BANK_WARM_UP=True)
+    def test_server_start_warms_up_what_settings_ask_for(self):
+        with mock.patch.object(startup, "warm_nlp") as warm_nlp, \
+                mock.patch.object(startup, "warm_question_bank") as warm_question_bank:
+            startup.warm_up()
+        warm_nlp.assert_not_called()
+        warm_question_bank.assert_called_once_with()
+
+    def test_worker_memory_is_split_into_private_and_shared(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+        self.assertIn(child.pid, child_pids(os.getpid()))
+
+        memory = process_memory(child.pid)
+        self.assertGreater(memory["rss_mb"], 0)
+        self.assertAlmostEqual(memory["private_mb"] + memory["shared_mb"], memory["rss_mb"], delta=0.2)
+        summary = summarize_workers([memory, memory])
+        self.assertEqual(summary["total_private_mb"], round(2 * memory["private_mb"], 1))
+
+    def test_preload_loads_the_model_and_freezes_the_heap(self):
+        service = NLPService("blank:en")
+        bank = mock.Mock(is_loaded=True)
+        self.addCleanup(gc.unfreeze)
+        with mock.patch.object(prefork, "get_nlp_service", return_value=service), \
+                mock.patch("ai_int_app.question_bank.get_question_bank", return_value=bank):
+            stats = prefork.preload("blank:en")
+            prefork.after_fork()
+        self.assertTrue(stats["model_loaded"])
+        self.assertGreater(stats["frozen_objects"], 0)
+        bank.rng.seed.assert_called_once_with()
+
+
+class AdmissionTests(SimpleTestCase):
+    async def test_token_bucket_per_interview(self):
+        now = [0.0]
+        admission = AdmissionController(rate=1.0, burst=2, clock=lambda: now[0])
+        for _ in range(2):
+            admission.release(await admission.acquire(IN_PROGRESS, "a"))
+        with self.assertRaises(Rejected) as caught:
+            await admission.acquire(IN_PROGRESS, "a")
+        self.assertEqual((caught.exception.status, caught.exception.retry_after_header), (429, "1"))
+        # Other interviews have their own bucket, and tokens come back
+        admission.release(await admission.acquire(IN_PROGRESS, "b"))
+        now[0] = 1.0
+        admission.release(await admission.acquire(IN_PROGRESS, "a"))
+        self.assertEqual(admission.shed, {"rate_limited": 1})
+
+    async def test_turns_go_before_new_starts(self):
+        admission = AdmissionController(max_in_flight=1)
+        ticket = await admission.acquire(NEW)
+        order = []
+
+        async def call(priority, name):
+            async with admission.admitted(priority):
+                order.append(name)
+
+        waiting = [asyncio.ensure_future(call(NEW, "start")), asyncio.ensure_future(call(IN_PROGRESS, "turn"))]
+        await asyncio.sleep(0)
+        self.assertEqual(admission.queued, {"in_progress": 1, "new": 1})
+        admission.release(ticket)
+        await asyncio.gather(*waiting)
+        self.assertEqual(order, ["turn", "start"])
+        self.assertEqual(admission.in_flight, 0)
+
+    async def test_full_queue_sheds_starts_first(self):
+        shed = []
+        admission = AdmissionController(max_in_flight=1, max_queue=1, on_shed=lambda *args: shed.append(args))
+        ticket = await admission.acquire(NEW)
+        start = asyncio.ensure_future(admission.acquire(NEW))
+        await asyncio.sleep(0)
+        with self.assertRaises(Rejected) as caught:
+            await admission.acquire(NEW)
+        self.assertEqual((caught.exception.status, caught.exception.reason), (503, "queue_full"))
+
+        turn = asyncio.ensure_future(admission.acquire(IN_PROGRESS))
+        with self.assertRaises(Rejected) as caught:
+            await start
+        self.assertEqual(caught.exception.reason, "evicted")
+        admission.release(ticket)
+        admission.release(await turn)
+        self.assertEqual(shed, [("queue_full", "new"), ("evicted", "new")])
+        self.assertEqual(admission.in_flight, 0)
+
+    async def test_deadline(self):
+        admission = AdmissionController(max_in_flight=1, deadline=0.05)
+        ticket = await admission.acquire(NEW)
+        with self.assertRaises(Rejected) as caught:
+            await admission.acquire(IN_PROGRESS)
+        self.assertEqual(caught.exception.reason, "deadline")
+        self.assertEqual(admission.queued, {"in_progress": 0, "new": 0})
+
+        # Once calls are known to be slow, a hopeless wait is refused at once
+        admission.service_time = 1.0
+        started = time.perf_counter()
+        with self.assertRaises(Rejected):
+            await admission.acquire(NEW)
+        self.assertLess(time.perf_counter() - started, 0.01)
+        admission.release(ticket)
+        self.assertEqual(admission.in_flight, 0)
+
+    async def test_cancelled_waiter_passes_its_slot_on(self):
+        admission = AdmissionController(max_in_flight=1)
+        ticket = await admission.acquire(NEW)
+        first = asyncio.ensure_future(admission.acquire(NEW))
+        second = asyncio.ensure_future(admission.acquire(NEW))
+        await asyncio.sleep(0)
+        first.cancel()
+        admission.release(ticket)
+        admission.release(await second)
+        self.assertEqual(admission.in_flight, 0)
+
+
+@mock.patch.object(views, "results_buffer", WriteBehindBuffer(background=False))
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+class AdmissionApiTests(TestCase):
+    def post(self, payload):
+        return self.client.post("/interview/", json.dumps(payload), content_type="application/json")
+
+    def test_busy_server_answers_fast_with_retry_after(self):
+        before = ADMISSION_SHED.value(reason="queue_full", priority="new")
+        with mock.patch.multiple(views.admission, in_flight=views.admission.max_in_flight, max_queue=0):
+            response = self.post({"action": "start", "jd": "Python"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertEqual(ADMISSION_SHED.value(reason="queue_full", priority="new"), before + 1)
+        self.assertEqual(views.admission.in_flight, 0)
+
+    def test_turns_are_rate_limited_per_interview(self):
+        interview_id = self.post({"action": "start", "jd": "Python and Docker"}).json()["interview_id"]
+        turn = {"action": "turn", "interview_id": interview_id, "response": "x"}
+        with mock.patch.object(views.admission, "burst", 1):
+            self.assertEqual(self.post(turn).status_code, 200)
+            response = self.post(turn)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_unknown_interviews_and_topic_calls_are_new_calls_of_the_client(self):
+        def post(payload):
+            return self.client.post(
+                "/interview/", json.dumps(payload), content_type="application/json", REMOTE_ADDR="10.0.0.7"
+            )
+
+        with mock.patch.object(views.admission, "limits", {"client": (0.01, 2)}):
+            responses = [
+                post({"action": "turn", "interview_id": uuid.uuid4().hex, "response": "x"}),
+                post({"topic": "python"}),
+                post({"action": "turn", "interview_id": uuid.uuid4().hex, "response": "x"}),
+            ]
+        self.assertEqual([r.status_code for r in responses], [404, 200, 429])
+        request = RequestFactory().post(
+            "/interview/", json.dumps({"action": "turn", "interview_id": "made-up"}),
+            content_type="application/json", REMOTE_ADDR="10.0.0.7",
+        )
+        self.assertEqual(views._admission_class(request), (NEW, "client:10.0.0.7"))
+
+
+class CPUPoolTests(SimpleTestCase):
+    async def test_concurrency_limit(self):
+        pool = CPUPool(max_workers=4, max_concurrency=2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work(value):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return value * 2
+
+        results = await asyncio.gather(*(pool.run(work, i) for i in range(6)))
+        self.assertEqual(results, [0, 2, 4, 6, 8, 10])
+        self.assertEqual(peak[0], 2)
+        self.assertEqual((pool.waiting, pool.running), (0, 0))
+        pool.shutdown()
+
+
+class StreamingCaptureTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def capture(self, pattern, transcripts, **kwargs):
+        path = os.path.join(self.tmp.name, "answer.wav")
+        write_wav(path, pattern)
+        partials = []
+        capture = StreamingCapture(
+            WavSource(path), ScriptedBackend(transcripts), on_partial=partials.append, **kwargs
+        )
+        self.addCleanup(capture.close)
+        return capture, partials
+
+    def test_segments_are_transcribed_while_speaking(self):
+        capture, partials = self.capture(
+            [(0.5, 20), (0.6, 5000), (0.7, 20), (0.6, 5000), (1.5, 20)], ["hello world", "second part"]
+        )
+        capture.calibrate(0.3)
+        self.assertEqual(capture.listen(timeout=2), "hello world second part")
+        self.assertEqual(partials, ["hello world", "hello world second part"])
+        self.assertEqual(capture.backend.calls, 2)
+
+    def test_timeout_without_speech(self):
+        capture, partials = self.capture([(3.0, 20)], ["unused"])
+        capture.calibrate(0.3)
+        self.assertEqual(capture.listen(timeout=1), "")
+        self.assertEqual(capture.backend.calls, 0)
+
+
+def pcm(*parts, rate=16000):
+    """16-bit mono audio from (seconds, amplitude) parts of a 440 Hz tone."""
+    samples = array("h")
+    for seconds, amplitude in parts:
+        samples.extend(int(amplitude * math.sin(2 * math.pi * 440 * i / rate)) for i in range(int(seconds * rate)))
+    return samples.tobytes()
+
+
+class SegmenterTests(SimpleTestCase):
+    def test_cuts_at_pauses_whatever_the_chunk_size(self):
+        audio = pcm((0.3, 0), (0.5, 8000), (0.6, 0), (0.4, 8000), (0.2, 0))
+        for size in (999, 4096, len(audio)):
+            segmenter = Segmenter(16000, pause_seconds=0.5)
+            segments = [s for start in range(0, len(audio), size) for s in segmenter.feed(audio[start:start + size])]
+            self.assertEqual(len(segments), 1)
+            segments.append(segmenter.flush())
+            # Speech plus the trailing pause and one frame of preroll
+            self.assertAlmostEqual(len(segments[0]) / 32000, 1.05, delta=0.05)
+            self.assertAlmostEqual(len(segments[1]) / 32000, 0.63, delta=0.03)
+
+    def test_long_speech_is_cut_and_silence_yields_nothing(self):
+        segmenter = Segmenter(16000, max_segment_seconds=1.0)
+        self.assertEqual(len(segmenter.feed(pcm((2.5, 8000)))), 2)
+        segmenter = Segmenter(16000)
+        self.assertEqual(segmenter.feed(pcm((1.0, 50))), [])
+        self.assertIsNone(segmenter.flush())
+
+
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+@mock.patch.object(views, "question_bank", QuestionBank())
+@mock.patch.object(views, "results_buffer", WriteBehindBuffer(background=False))
+@mock.patch.object(views, "stt_pool", CPUPool("thread", max_workers=2))
+@override_settings(SPEECH_BACKEND="scripted")
+class AudioUploadTests(TestCase):
+    def setUp(self):
+        self.backend = ScriptedBackend(["I built the docker images", "and ran them with compose"])
+        patcher = mock.patch.dict(speech._process_backends, {"scripted": self.backend})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        store = UploadStore(views._transcribe, max_uploads=1, pause_seconds=0.5)
+        patcher = mock.patch.object(views, "audio_uploads", store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start(self):
+        # Not in setUp: the class's patches only cover the test methods
+        self.interview_id = self.client.post(
+            "/interview/", json.dumps({"action": "start", "jd": "Python and Docker"}), content_type="application/json"
+        ).json()["interview_id"]
+
+    def send(self, seq, body, final=False, interview_id=None):
+        query = f"interview_id={interview_id or self.interview_id}&seq={seq}" + ("&final=1" if final else "")
+        return self.client.post(f"/interview/audio/?{query}", body, content_type="application/octet-stream")
+
+    def test_chunks_are_transcribed_as_they_arrive_and_scored(self):
+        self.start()
+        response = self.send(0, pcm((0.2, 0), (0.6, 8000), (0.6, 0)))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["segments"], 1)
+        self.send(1, pcm((0.5, 8000)))
+
+        data = self.send(2, pcm((0.1, 8000)), final=True).json()
+        self.assertEqual(data["transcript"], "I built the docker images and ran them with compose")
+        self.assertEqual(self.backend.calls, 2)
+        self.assertIn("feedback", data)
+        self.assertEqual(data["topic"], "python")
+        self.assertEqual(views.interview_sessions.get(self.interview_id).turns[0][2], data["transcript"])
+
+    def test_rejected_chunks(self):
+        self.start()
+        self.assertEqual(self.send(1, pcm((0.1, 0))).status_code, 404)
+        self.assertEqual(self.send(0, pcm((0.1, 0)), interview_id="missing").status_code, 404)
+        self.send(0, pcm((0.1, 0)))
+        self.assertEqual(self.send(2, pcm((0.1, 0))).status_code, 409)
+
+        other = views.interview_sessions.create(["git"])
+        self.assertEqual(self.send(0, pcm((0.1, 0)), interview_id=other.interview_id).status_code, 503)
+
+        with override_settings(AUDIO_MAX_CHUNK_BYTES=100):
+            self.assertEqual(self.send(1, pcm((0.1, 0))).status_code, 413)
+
+    def test_chunks_go_through_admission(self):
+        self.start()
+        with mock.patch.multiple(views.admission, in_flight=views.admission.max_in_flight, max_queue=0):
+            self.assertEqual(self.send(0, pcm((0.1, 0))).status_code, 503)
+        with mock.patch.dict(views.admission.limits, {"audio": (0.001, 2)}):
+            self.assertEqual(self.send(0, pcm((0.1, 0))).status_code, 202)
+            self.assertEqual(self.send(1, pcm((0.1, 0))).status_code, 202)
+            self.assertEqual(self.send(2, pcm((0.1, 0))).status_code, 429)
+
+    def test_silence_is_not_an_answer(self):
+        self.start()
+        response = self.send(0, pcm((1.0, 0)), final=True)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.backend.calls, 0)
+
+
+class SocketClient:
+    """Drives an ASGI WebSocket application the way a server would."""
+
+    def __init__(self, app, path="/ws/interview/", headers=(), client=None):
+        self.inbound, self.outbound = asyncio.Queue(), asyncio.Queue()
+        scope = {"type": "websocket", "path": path, "headers": [(k.encode(), v.encode()) for k, v in headers]}
+        if client is not None:
+            scope["client"] = client
+        self.task = asyncio.ensure_future(app(scope, self.inbound.get, self.outbound.put))
+
+    async def connect(self):
+        await self.inbound.put({"type": "websocket.connect"})
+        return await self.next()
+
+    async def next(self):
+        return await asyncio.wait_for(self.outbound.get(), 5)
+
+    async def send(self, payload):
+        await self.inbound.put({"type": "websocket.receive", "text": json.dumps(payload)})
+
+    async def send_bytes(self, data):
+        await self.inbound.put({"type": "websocket.receive", "bytes": data})
+
+    async def receive(self):
+        return json.loads((await self.next())["text"])
+
+    async def close(self):
+        await self.inbound.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 5)
+
+
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+@mock.patch.object(views, "question_bank", QuestionBank())
+@mock.patch.object(views, "results_buffer", WriteBehindBuffer(background=False))
+@mock.patch.object(views, "stt_pool", CPUPool("thread", max_workers=2))
+@override_settings(SPEECH_BACKEND="scripted")
+class InterviewSocketTests(TestCase):
+    async def test_text_interview_over_one_socket(self):
+        from chat_web_ai.asgi import application
+
+        await sync_to_async(self.client.post)(
+            "/personal_login/", {"username": "interview_01", "password": "123@interview"}
+        )
+        cookie = f"sessionid={self.client.cookies['sessionid'].value}"
+        socket = SocketClient(application, headers=[("cookie", cookie)])
+        self.assertEqual((await socket.connect())["type"], "websocket.accept")
+
+        await socket.send({"type": "start", "jd": "Python and Docker"})
+        question = await socket.receive()
+        self.assertEqual((question["type"], question["topics"], question["topic"]), ("question", ["docker", "python"], "docker"))
+
+        await socket.send({"type": "answer", "text": (
+            "I wrote multi-stage dockerfiles to keep our images small and ran the services with docker compose"
+        )})
+        feedback = await socket.receive()
+        self.assertEqual((feedback["type"], feedback["topic"]), ("feedback", "docker"))
+        self.assertIn(feedback["feedback"], views.POSITIVE_REMARKS)
+        self.assertEqual((await socket.receive())["topic"], "python")
+
+        await socket.send({"type": "ping"})
+        self.assertEqual(await socket.receive(), {"type": "pong"})
+        await socket.send({"type": "answer", "text": "Some scripting"})
+        self.assertEqual((await socket.receive())["type"], "feedback")
+        done = await socket.receive()
+        self.assertEqual(done["type"], "done")
+        await socket.close()
+
+        self.assertIsNone(views.interview_sessions.get(done["interview_id"]))
+        summary = (await sync_to_async(self.client.get)("/summary/")).context["summary"]
+        self.assertEqual(list(summary), ["docker", "python"])
+        self.assertEqual(summary["python"]["response"], "Some scripting")
+
+    async def test_spoken_answer_streams_partial_transcripts(self):
+        backend = ScriptedBackend(["I built the docker images", "and ran them with compose"])
+        socket = SocketClient(InterviewSocket())
+        await socket.connect()
+        with mock.patch.dict(speech._process_backends, {"scripted": backend}):
+            await socket.send({"type": "start", "jd": "Docker"})
+            await socket.receive()
+            await socket.send({"type": "audio", "rate": 16000})
+            await socket.send_bytes(pcm((0.2, 0), (0.6, 8000), (0.6, 0)))
+            await socket.send_bytes(pcm((0.5, 8000)))
+            await socket.send({"type": "audio_end"})
+
+            messages = [await socket.receive() for _ in range(4)]
+        self.assertEqual([m["type"] for m in messages], ["partial", "partial", "feedback", "done"])
+        self.assertEqual(messages[0]["transcript"], "I built the docker images")
+        self.assertEqual(messages[2]["transcript"], "I built the docker images and ran them with compose")
+        await socket.close()
+
+    async def test_errors_keep_the_socket_open(self):
+        socket = SocketClient(InterviewSocket())
+        await socket.connect()
+        await socket.send({"type": "answer", "text": "hello"})
+        self.assertEqual((await socket.receive())["status"], 404)
+        await socket.send_bytes(b"\0" * 10)
+        self.assertEqual((await socket.receive())["status"], 409)
+        await socket.send({"type": "dance"})
+        self.assertEqual((await socket.receive())["type"], "error")
+        await socket.send({"type": "ping"})
+        self.assertEqual(await socket.receive(), {"type": "pong"})
+        await socket.close()
+
+    async def test_answers_before_start_are_limited_per_client(self):
+        sockets = [SocketClient(InterviewSocket(), client=(address, 1)) for address in ("10.0.0.8", "10.0.0.9")]
+        for socket in sockets:
+            await socket.connect()
+        with mock.patch.dict(views.admission.limits, {"client": (0.001, 1)}):
+            for status in (404, 429):
+                await sockets[0].send({"type": "answer", "text": "hello"})
+                self.assertEqual((await sockets[0].receive())["status"], status)
+            # Another client's bucket is untouched
+            await sockets[1].send({"type": "answer", "text": "hello"})
+            self.assertEqual((await sockets[1].receive())["status"], 404)
+        for socket in sockets:
+            await socket.close()
+
+    async def test_heartbeats_then_idle_close(self):
+        socket = SocketClient(InterviewSocket(heartbeat=0.05, idle_timeout=0.12))
+        await socket.connect()
+        self.assertEqual(await socket.receive(), {"type": "ping"})
+        self.assertEqual(await socket.receive(), {"type": "ping"})
+        self.assertEqual(await socket.next(), {"type": "websocket.close", "code": IDLE_CLOSE_CODE})
+        await asyncio.wait_for(socket.task, 5)
+
+    async def test_heartbeat_keeps_the_pending_receive(self):
+        received = []
+
+        async def receive():
+            # A receive that must not be cancelled: the message it takes
+            # from the transport would be lost
+            if not received:
+                received.append("connect")
+                return {"type": "websocket.connect"}
+            try:
+                await asyncio.sleep(0.12)
+            except asyncio.CancelledError:
+                received.append("cancelled")
+                raise
+            received.append("ping")
+            return {"type": "websocket.receive", "text": json.dumps({"type": "ping"})}
+
+        sent = asyncio.Queue()
+        task = asyncio.ensure_future(InterviewSocket(heartbeat=0.05, idle_timeout=1)(
+            {"type": "websocket", "headers": []}, receive, sent.put,
+        ))
+        messages = [await asyncio.wait_for(sent.get(), 2) for _ in range(4)]
+        task.cancel()
+        self.assertEqual([m.get("text") for m in messages[1:]], [
+            json.dumps({"type": "ping"}), json.dumps({"type": "ping"}), json.dumps({"type": "pong"}),
+        ])
+        self.assertEqual(received[:2], ["connect", "ping"])
+
+    async def test_refused_before_accepting(self):
+        from chat_web_ai.asgi import application
+
+        for app, kwargs in [
+            (application, {"path": "/ws/elsewhere/"}),
+            (InterviewSocket(), {"headers": [("origin", "https://evil.example")]}),
+            (InterviewSocket(max_connections=0), {}),
+        ]:
+            socket = SocketClient(app, **kwargs)
+            self.assertEqual(await socket.connect(), {"type": "websocket.close"})
+        with override_settings(ALLOWED_HOSTS=["localhost"]):
+            socket = SocketClient(InterviewSocket(), headers=[("origin", "http://localhost:8000")])
+            self.assertEqual((await socket.connect())["type"], "websocket.accept")
+        await socket.close()
+
+    async def test_lifespan_startup_warms_up(self):
+        from chat_web_ai import asgi
+
+        messages = asyncio.Queue()
+        for message in ({"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}):
+            messages.put_nowait(message)
+        sent = []
+
+        async def send(message):
+            sent.append(message["type"])
+
+        with mock.patch.object(asgi, "warm_up") as warm_up:
+            await asgi.application({"type": "lifespan"}, messages.get, send)
+        warm_up.assert_called_once_with()
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+
+
+class SpeechWorkerTests(SimpleTestCase):
+    def setUp(self):
+        self.engine = SilentEngine(word_seconds=0.01)
+        self.worker = SpeechWorker(lambda: self.engine)
+        self.addCleanup(self.worker.close)
+
+    def test_say_does_not_block_and_reports_completion(self):
+        done = []
+        first = self.worker.say("one two three")
+        first.add_done_callback(lambda future: done.append(future.result()))
+        self.assertFalse(first.done())
+        self.assertTrue(self.worker.say("four").result(timeout=2))
+        self.assertEqual(done, [True])
+        self.assertEqual(self.engine.spoken, ["one two three", "four"])
+
+    def test_cancel_interrupts_and_drops_queue(self):
+        long = self.worker.say(" ".join(["word"] * 50))
+        queued = self.worker.say("never spoken")
+        time.sleep(0.05)
+        self.worker.cancel()
+        self.assertFalse(long.result(timeout=2))
+        self.assertFalse(queued.result(timeout=2))
+        self.assertTrue(self.worker.say("after barge-in").result(timeout=2))
+        self.assertLess(len(self.engine.spoken[0].split()), 50)
+        self.assertEqual(self.engine.spoken[-1], "after barge-in")
+
+
+def load_basic_model():
+    """basic_model/model.py, which loads its spaCy pipeline on import."""
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "basic_model", "model.py")
+    spec = importlib.util.spec_from_file_location("basic_model_model", path)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.object(nlp_service, "get_nlp_service", lambda: NLPService("blank:en")):
+        spec.loader.exec_module(module)
+    return module
+
+
+class SpeculativeQuestionsTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model = load_basic_model()
+
+    def speculative(self, generate):
+        speculative = self.model.SpeculativeQuestions(generate, workers=1)
+        self.addCleanup(speculative.close)
+        return speculative
+
+    def test_take_hands_over_a_prefetched_question_once(self):
+        calls = []
+
+        def generate(topic, context):
+            calls.append((topic, context))
+            return f"About {topic}?"
+
+        speculative = self.speculative(generate)
+        speculative.prefetch([("git", ""), ("git", "")])
+        self.assertEqual(speculative.take("git"), "About git?")
+        self.assertIsNone(speculative.take("git"))
+        self.assertIsNone(speculative.take("sql"))
+        self.assertEqual(calls, [("git", "")])
+
+    def test_keep_only_drops_drafts_that_will_not_be_asked(self):
+        release, calls = threading.Event(), []
+
+        def generate(topic, context):
+            calls.append(topic)
+            release.wait(2)
+            return topic
+
+        speculative = self.speculative(generate)
+        # One worker: sql waits behind git and is cancelled before it starts
+        speculative.prefetch([("git", ""), ("sql", "")])
+        speculative.keep_only([("git", "")])
+        release.set()
+        self.assertIsNone(speculative.take("sql"))
+        self.assertEqual(speculative.take("git"), "git")
+        self.assertEqual(calls, ["git"])
+
+    def test_likely_next_prefers_a_deep_dive(self):
+        self.assertEqual(self.model.likely_next(["git", "sql", "go"], []), [("git", ""), ("sql", "")])
+        self.assertEqual(self.model.likely_next(["git"], ["rebase"]), [("rebase", "rebase")])
+
+
+@mock.patch.object(views, "results_buffer", WriteBehindBuffer(background=False))
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+class BenchmarkTests(TestCase):
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertEqual(percentile([5], 99), 5)
+
+    def test_corpus_is_reproducible(self):
+        self.assertEqual(benchmarks.generate_corpus([20], 3, seed=1), benchmarks.generate_corpus([20], 3, seed=1))
+
+    def test_small_run_reports_every_part(self):
+        extraction = benchmarks.bench_extraction(views.nlp_service.matcher, lengths=(20,), per_length=3)
+        api = benchmarks.bench_api(requests=2, jd_words=30)
+        voice = benchmarks.bench_voice(turns=2)
+
+        self.assertEqual(extraction["20"]["jds"], 3)
+        self.assertEqual(set(api), {
+            "topics_fresh", "topics_cached", "question", "feedback", "session_start", "session_turn",
+        })
+        self.assertEqual(api["question"]["count"], 2)
+        self.assertEqual(voice["listen"]["count"], 2)
+        self.assertIn("p99_ms", voice["turn"])
+        json.dumps({"extraction": extraction, "api": api, "voice": voice})
+
+    def test_api_run_is_not_rate_limited(self):
+        with mock.patch.dict(views.admission.limits, {"client": (0.001, 3)}):
+            api = benchmarks.bench_api(requests=2, jd_words=30)
+        self.assertEqual(api["session_start"]["count"], 2)
+        self.assertTrue(views.admission.enabled)
+
+    def test_failed_api_run_still_writes_its_results(self):
+        with mock.patch.object(benchmarks, "_post", side_effect=[{"topics": []}, RuntimeError("boom")]):
+            with mock.patch.object(views.results_buffer, "flush") as flush:
+                with self.assertRaises(RuntimeError):
+                    benchmarks.bench_api(requests=1, jd_words=10)
+        flush.assert_called_once_with()
+
+    def test_compare_reports_relative_change(self):
+        lines = benchmarks.compare({"api": {"question": {"p50_ms": 2.0}}}, {"api": {"question": {"p50_ms": 1.0}}})
+        self.assertEqual(lines, ["api.question.p50_ms: 1.0 -> 2.0 (+100.0%)"])
+
+
+@skipIf(httpx is None, "httpx is not installed")
+@mock.patch.object(views, "results_buffer", WriteBehindBuffer(background=False))
+@mock.patch.object(views, "nlp_service", NLPService("blank:en"))
+@mock.patch.object(views, "question_bank", QuestionBank())
+class LoadTestTests(TransactionTestCase):
+    # Requests are served on asgiref's thread, so the data must be committed
+    def load_test(self, transport, **kwargs):
+        return LoadTest(
+            "http://testserver", think_time=(0, 0), answer_words=(5, 10),
+            jds=["Python and Docker"], transport=transport, **kwargs,
+        )
+
+    def test_replays_the_browser_protocol(self):
+        from django.core.asgi import get_asgi_application
+
+        load_test = self.load_test(httpx.ASGITransport(app=get_asgi_application()))
+        stages = asyncio.run(load_test.ramp([1, 2], duration=None, interviews=2))
+
+        self.assertEqual([stage["concurrency"] for stage in stages], [1, 2])
+        self.assertEqual([stage["interviews"] for stage in stages], [2, 4])
+        endpoints = stages[1]["endpoints"]
+        self.assertEqual({name: e["requests"] for name, e in endpoints.items()}, {
+            "start": 4, "turn": 8, "save_summary": 4, "summary": 4,
+        })
+        self.assertEqual(stages[1]["error_rate"], 0.0)
+        self.assertIn("p99_ms", endpoints["turn"])
+        # The summary pages were served from each candidate's own session
+        self.assertEqual(Interview.objects.filter(completed_at__isnull=False).count(), 7)
+
+    def test_counts_errors_and_stops_ramping(self):
+        def handler(request):
+            if json.loads(request.content or b"{}").get("action") == "turn":
+                return httpx.Response(503)
+            return httpx.Response(200, json={
+                "interview_id": "x", "topics": ["python"], "topic": "python", "question": "Q", "done": False,
+            })
+
+        load_test = self.load_test(httpx.MockTransport(handler))
+        stages = asyncio.run(load_test.ramp([1, 2], duration=None, interviews=1, max_error_rate=0.1, warmup=False))
+
+        self.assertEqual(len(stages), 1)
+        self.assertEqual(stages[0]["failed_interviews"], 1)
+        self.assertEqual(stages[0]["endpoints"]["turn"]["error_reasons"], {"status 503": 1})
+        self.assertEqual(stages[0]["error_rate"], 0.5)
+
+
+def gemini_reply(text, prompt_tokens=10, completion_tokens=5):
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}]}}],
+        "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": completion_tokens},
+    }
+
+
+@skipIf(httpx is None, "httpx is not installed")
+class LLMGatewayTests(SimpleTestCase):
+    def gateway(self, handler, **kwargs):
+        kwargs.setdefault("backoff_base", 0)
+        return LLMGateway(api_key="test", transport=httpx.MockTransport(handler), **kwargs)
+
+    def run_async(self, gateway, coro):
+        async def run():
+            try:
+                return await coro
+            finally:
+                await gateway.aclose()
+        return asyncio.run(run())
+
+    def test_retries_then_accounts_tokens(self):
+        statuses = [503, 429, 200]
+
+        def handler(request):
+            self.assertEqual((request.headers["x-goog-api-key"], request.url.query), ("test", b""))
+            status = statuses.pop(0)
+            return httpx.Response(status, json=gemini_reply("Rating: Good") if status == 200 else {})
+
+        gateway = self.gateway(handler)
+        text = self.run_async(gateway, gateway.evaluate_answer("Q?", "A.", "python"))
+        self.assertEqual(text, "Rating: Good")
+        stats = gateway.stats()["evaluation"]
+        self.assertEqual((stats["calls"], stats["retries"], stats["failures"]), (1, 2, 0))
+        self.assertEqual((stats["prompt_tokens"], stats["completion_tokens"]), (10, 5))
+
+    def test_backoff_does_not_hold_a_concurrency_slot(self):
+        prompts = []
+
+        def handler(request):
+            prompt = json.loads(request.content)["contents"][0]["parts"][0]["text"]
+            prompts.append(prompt)
+            if prompts == ["first"]:
+                return httpx.Response(503, headers={"Retry-After": "0.1"}, json={})
+            return httpx.Response(200, json=gemini_reply("ok"))
+
+        gateway = self.gateway(handler, max_concurrency=1)
+
+        async def calls():
+            first = asyncio.ensure_future(gateway.generate("first"))
+            await asyncio.sleep(0.01)
+            return await asyncio.gather(first, gateway.generate("second"))
+
+        self.run_async(gateway, calls())
+        self.assertEqual(prompts, ["first", "second", "first"])
+
+    def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, json={"error": "bad request"})
+
+        gateway = self.gateway(handler)
+        with self.assertRaises(LLMError):
+            self.run_async(gateway, gateway.follow_up("Q?", "A.", "testing"))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(gateway.stats()["follow_up"]["failures"], 1)
+
+    def test_topics_are_batched_and_fanned_out_under_the_cap(self):
+        active, peak, prompts = [0], [0], []
+
+        async def handler(request):
+            prompt = json.loads(request.content)["contents"][0]["parts"][0]["text"]
+            prompts.append(prompt)
+            topics = json.loads(prompt.rsplit("Topics: ", 1)[1])
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.02)
+            active[0] -= 1
+            reply = {t: [{"kind": "technical", "question": f"About {t}?"}] for t in topics}
+            return httpx.Response(200, json=gemini_reply("```json\n%s\n```" % json.dumps(reply)))
+
+        gateway = self.gateway(handler, topics_per_request=3, max_concurrency=2)
+        topics = ["a", "b", "c", "d", "e", "f", "g"]
+        questions = self.run_async(gateway, gateway.generate_questions(topics))
+        self.assertEqual(sorted(questions), topics)
+        self.assertEqual(questions["g"], [{"kind": "technical", "question": "About g?"}])
+        self.assertEqual(len(prompts), 3)
+        self.assertEqual(peak[0], 2)
+
+    def test_cached_topics_are_not_asked_for_again(self):
+        prompts = []
+
+        def handler(request):
+            prompt = json.loads(request.content)["contents"][0]["parts"][0]["text"]
+            prompts.append(prompt)
+            if "Topics: " not in prompt:
+                return httpx.Response(200, json=gemini_reply("Strong candidate."))
+            topics = json.loads(prompt.rsplit("Topics: ", 1)[1])
+            reply = {t: [{"kind": "technical", "question": f"About {t}?"}] for t in topics}
+            return httpx.Response(200, json=gemini_reply(json.dumps(reply)))
+
+        gateway = self.gateway(handler, cache=LLMCache())
+
+        async def interviews():
+            await gateway.generate_questions(["sql", "python"])
+            questions = await gateway.generate_questions(["python", "docker", "sql"])
+            await gateway.summarize("Engineer", [("Q", "A", "Good")])
+            await gateway.summarize("Engineer", [("Q", "A", "Good")])
+            await gateway.summarize("Engineer", [("Q", "A", "Good")], use_cache=False)
+            return questions
+
+        questions = self.run_async(gateway, interviews())
+        self.assertEqual(questions["docker"], [{"kind": "technical", "question": "About docker?"}])
+        self.assertEqual(sum("Topics: " in p for p in prompts), 2)
+        self.assertIn('Topics: ["docker"]', prompts[1])
+        self.assertEqual(len(prompts), 4)
+        self.assertEqual(gateway.stats()["questions"]["cache_hits"], 2)
+        self.assertEqual(gateway.stats()["summary"]["cache_hits"], 1)
+
+    def test_against_local_stub(self):
+        stub = StubServer(latency=0.001, seed=0).start()
+        self.addCleanup(stub.stop)
+        gateway = LLMGateway(base_url=stub.url)
+
+        async def interview():
+            topics = await gateway.extract_topics("We need Python and SQL")
+            return topics, await gateway.generate_questions(topics)
+
+        topics, questions = self.run_async(gateway, interview())
+        self.assertEqual(sorted(questions), topics)
+        self.assertEqual(len(questions["python"]), 3)
+        self.assertEqual(stub.requests, 2)
+
+
+class LLMCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def cache(self, **kwargs):
+        return LLMCache(directory=self.tmp.name, clock=lambda: self.now, **kwargs)
+
+    def test_keys_ignore_whitespace_but_not_parameters(self):
+        self.assertEqual(cache_key("m", "Rate  this\nanswer"), cache_key("m", " Rate this answer "))
+        self.assertNotEqual(cache_key("m", "p"), cache_key("m", "p", {"json": True}))
+        self.assertNotEqual(cache_key("m", "p"), cache_key("other", "p"))
+
+    def test_disk_tier_outlives_the_process_until_ttl(self):
+        self.cache(ttls={"summary": 60}).put("k", "summary", {"text": "ok"})
+        fresh = self.cache(ttls={"summary": 60})
+        self.assertEqual(fresh.get("k"), {"text": "ok"})
+        self.assertEqual(fresh.get("k"), {"text": "ok"})
+        self.assertEqual((fresh.counters["disk_hits"], fresh.counters["memory_hits"]), (1, 1))
+
+        self.now += 61
+        self.assertIsNone(fresh.get("k"))
+        self.assertIsNone(self.cache().get("k"))
+
+    def test_zero_ttl_is_not_cached_and_disk_is_bounded(self):
+        cache = self.cache(max_entries=2, max_disk_entries=3)
+        cache.put("e", "evaluation", {"text": "x"})
+        self.assertIsNone(cache.get("e"))
+
+        for i in range(5):
+            cache.put(f"k{i}", "questions", {"text": str(i)})
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertEqual(cache.prune(), 2)
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(self.tmp.name)), 3)
+
+    async def test_async_access_prunes_in_the_background(self):
+        cache = self.cache(max_disk_entries=3, prune_every=5)
+        for i in range(5):
+            await cache.aput(f"k{i}", "questions", {"text": str(i)})
+        await asyncio.to_thread(cache._pruner.join, 5)
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(self.tmp.name)), 3)
+
+        await cache.aput("last", "questions", {"text": "last"})
+        fresh = self.cache()
+        self.assertEqual(await fresh.aget("last"), {"text": "last"})
+        self.assertIsNone(await fresh.aget("missing"))
+        self.assertEqual((fresh.counters["disk_hits"], fresh.counters["misses"]), (1, 1))
@@ -0,0 +1,122 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from django.db import DatabaseError
+
+from .models import TopicCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_jd(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def jd_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class TopicCache:
+    """
+    Caches extracted topics under the hash of the normalized JD text. Lookups
+    go to a bounded in-process LRU first, then to the TopicCacheEntry table,
+    which outlives restarts and is shared by every worker on the database.
+    Entries are tagged with the keyword version they were extracted with, so
+    changing the skill keywords invalidates them.
+    """
+
+    def __init__(self, version: str, max_size: int = 1024, persistent: bool = True):
+        self._version = version
+        self.max_size = max_size
+        self.persistent = persistent
+        self._lru: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @version.setter
+    def version(self, version: str):
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._lru.clear()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _remember(self, key: str, topics: List[str]):
+        with self._lock:
+            self._lru[key] = topics
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def _load_persistent(self, key: str) -> Optional[List[str]]:
+        try:
+            entry = TopicCacheEntry.objects.filter(jd_hash=key, keyword_version=self._version).first()
+        except DatabaseError:
+            logger.warning("Topic cache lookup failed", exc_info=True)
+            return None
+        return entry.topics if entry else None
+
+    def _store_persistent(self, key: str, topics: List[str]):
+        try:
+            TopicCacheEntry.objects.update_or_create(
+                jd_hash=key, defaults={"keyword_version": self._version, "topics": topics}
+            )
+        except DatabaseError:
+            logger.warning("Topic cache write failed", exc_info=True)
+
+    def get(self, text: str) -> Optional[List[str]]:
+        key = jd_hash(normalize_jd(text))
+
+        with self._lock:
+            topics = self._lru.get(key)
+            if topics is not None:
+                self._lru.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return list(topics)
+
+        if self.persistent:
+            topics = self._load_persistent(key)
+            if topics is not None:
+                self._count("persistent_hits")
+                self._remember(key, topics)
+                return list(topics)
+
+        self._count("misses")
+        return None
+
+    def put(self, text: str, topics: List[str]):
+        key = jd_hash(normalize_jd(text))
+        self._remember(key, list(topics))
+        if self.persistent:
+            self._store_persistent(key, list(topics))
+
+    def get_or_extract(self, text: str, extract: Callable[[str], List[str]]) -> List[str]:
+        topics = self.get(text)
+        if topics is None:
+            topics = extract(normalize_jd(text))
+            self.put(text, topics)
+        return topics
+
+    def invalidate(self):
+        """
+        Drop every in-memory entry and the persisted entries of other keyword
+        versions.
+        """
+        with self._lock:
+            self._lru.clear()
+        if self.persistent:
+            TopicCacheEntry.objects.exclude(keyword_version=self._version).delete()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters, size=len(self._lru), max_size=self.max_size)
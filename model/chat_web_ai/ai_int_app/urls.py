@@ -1,12 +1,16 @@
 from django.urls import path
 from .views import interview_api
-from .views import index, interview_api,personal_login,interview_dashboard,save_summary,show_summary
+from .views import index, interview_api,personal_login,interview_dashboard,save_summary,show_summary,bulk_ingest,metrics_view,export_results,interview_audio
 
 urlpatterns = [ 
     # path("", index),
     path('personal_login/',personal_login, name='personal_login'),
     path("interview/", interview_api),
+    path("interview/audio/", interview_audio, name="interview_audio"),
+    path("interview/bulk/", bulk_ingest, name="bulk_ingest"),
+    path("interview/export/", export_results, name="export_results"),
     path('interview_dashboard/', interview_dashboard, name='interview_dashboard'),
     path('save-summary/',save_summary),       # <-- new route to save results
     path('summary/', show_summary, name="summary"),
+    path("metrics", metrics_view, name="metrics"),   # Prometheus scrape target
 ]
\ No newline at end of file
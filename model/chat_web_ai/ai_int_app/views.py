@@ -1,26 +1,51 @@
+import asyncio
+import codecs
 import json
 import random
-from django.http import JsonResponse
+import uuid
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 from django.shortcuts import render, redirect
-import spacy
-from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from datetime import datetime
-import pandas as pd
-from io import BytesIO
-import base64
-
-nlp = spacy.load("en_core_web_sm")
-
-SKILL_KEYWORDS = {
-    "python", "java", "javascript", "react", "node.js", "aws", "azure", "gcp", "sql", "nosql",
-    "docker", "kubernetes", "git", "api", "rest", "graphql", "frontend", "backend", "fullstack",
-    "machine learning", "ai", "deep learning", "data science", "cloud", "agile", "scrum", "devops",
-    "testing", "security", "linux", "windows", "mobile", "web", "database", "design patterns",
-    "architecture", "communication", "teamwork", "problem solving", "leadership", "management",
-    "analytical", "critical thinking", "collaboration", "mentoring", "debugging", "scalability",
-    "performance", "optimization", "microservices", "ci/cd", "data structures", "algorithms", "oop"
-}
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .admission import IN_PROGRESS, NEW, AdmissionController
+from .audio_upload import UploadError, UploadStore
+from .cpu_pool import CPUPool
+from .decorators import async_admitted, async_csrf_exempt, async_profiled, async_require_POST
+from .export import EXPORT_FORMATS, export_queryset, iter_export, iter_row_chunks
+from .ingest import guess_format, ingest_records, iter_jd_records
+from .metrics import ADMISSION_SHED, INTERVIEW_REQUESTS, registry, span
+from .models import Interview, JobDescription
+from .nlp_service import get_nlp_service
+from .profiling import RequestProfiler
+from .question_bank import get_question_bank
+from .results_store import WriteBehindBuffer
+from .scoring import AnswerScorer, load_rubrics
+from .sessions import SessionStore
+from .speech import TranscriptionError, transcribe_segment
+from .topic_cache import TopicCache, jd_hash, normalize_jd
+
+nlp_service = get_nlp_service()
+
+question_bank = get_question_bank()
+
+topic_cache = TopicCache(
+    version=nlp_service.taxonomy.fingerprint,
+    max_size=settings.TOPIC_CACHE_SIZE,
+    persistent=settings.TOPIC_CACHE_PERSISTENT,
+)
+
+cpu_pool = CPUPool(
+    kind=settings.CPU_POOL_KIND,
+    max_workers=settings.CPU_POOL_WORKERS,
+    max_concurrency=settings.CPU_POOL_CONCURRENCY,
+)
 
 POSITIVE_REMARKS = [
     "Great explanation!", "Excellent clarity!", "That's a strong answer!",
@@ -28,61 +53,353 @@ POSITIVE_REMARKS = [
 ]
 
 
+def _extract_uncached(text):
+    return nlp_service.matcher.extract(text)
+
+def _sync_taxonomy_version():
+    # A reloaded taxonomy changes the fingerprint, which retires cached topics
+    topic_cache.version = nlp_service.taxonomy.fingerprint
+
 def extract_skills_from_jd(text):
-    doc = nlp(text.lower())
-    found = set()
-    for token in doc:
-        if token.text in SKILL_KEYWORDS:
-            found.add(token.text)
-    for chunk in doc.noun_chunks:
-        if chunk.text.strip() in SKILL_KEYWORDS:
-            found.add(chunk.text.strip())
-    return sorted(found)
+    # The model is only touched on a cache miss
+    _sync_taxonomy_version()
+    return topic_cache.get_or_extract(text, _extract_uncached)
+
+async def extract_skills_from_jd_async(text):
+    _sync_taxonomy_version()
+    topics = await sync_to_async(topic_cache.get)(text)
+    if topics is None:
+        with span("extract"):
+            topics = await cpu_pool.run(_extract_uncached, normalize_jd(text))
+        await sync_to_async(topic_cache.put)(text, topics)
+    return topics
 
 def generate_question(topic):
-    templates = [
-        f"Can you explain your experience with {topic}?",
-        f"What challenges have you faced while working with {topic}?",
-        f"How would you rate your proficiency in {topic} and why?",
-        f"Can you share a project where you used {topic}?",
-        f"What are some best practices you follow in {topic}?"
-    ]
-    return random.choice(templates)
-
-def is_response_good(topic, response):
-    keywords = topic.split()
-    return all(word.lower() in response.lower() for word in keywords)
-
-def provide_feedback(is_good):
-    if is_good:
+    return question_bank.question(topic)
+
+async def _from_question_bank(func, *args):
+    # A warm bank is pure memory; a cold one reads the table
+    if question_bank.is_loaded:
+        return func(*args)
+    return await sync_to_async(func)(*args)
+
+answer_scorer = AnswerScorer(load_rubrics(settings.SCORING_RUBRIC_PATH))
+
+def score_response(topic, response):
+    return answer_scorer.score(topic, response)
+
+def provide_feedback(score):
+    grade = answer_scorer.grade(score)
+    if grade == "good":
         return random.choice(POSITIVE_REMARKS)
-    else:
+    elif grade == "partial":
         return "That's a good start! Consider including more specific details or examples."
+    else:
+        return "Could you go deeper? Talk about what you built, the problems you solved and the results."
 
-@csrf_exempt
-@require_POST
-def interview_api(request):
+def assess_response(topic, response):
+    score = score_response(topic, response)
+    return round(score, 3), provide_feedback(score)
+
+def evaluate_response(topic, response):
+    return assess_response(topic, response)[1]
+
+results_buffer = WriteBehindBuffer(
+    batch_size=settings.RESULTS_BATCH_SIZE,
+    flush_interval=settings.RESULTS_FLUSH_INTERVAL,
+    max_retries=settings.RESULTS_MAX_RETRIES,
+    max_pending=settings.RESULTS_MAX_PENDING,
+)
+
+def _record_turn(session, index, turn):
+    results_buffer.add_turn(session.interview_id, index, *turn)
+
+interview_sessions = SessionStore(
+    generate_question,
+    ttl=settings.INTERVIEW_SESSION_TTL,
+    prefetch_workers=settings.QUESTION_PREFETCH_WORKERS,
+    on_turn=_record_turn,
+)
+
+def _session_payload(session, **extra):
+    return {
+        "interview_id": session.interview_id,
+        "topic": session.topic,
+        "question": session.question,
+        "done": session.done,
+        **extra,
+    }
+
+def _bind_interview(http_session, session):
+    results_buffer.start_interview(session.interview_id, http_session.get("candidate", ""), session.topics)
+    http_session["interview_id"] = session.interview_id
+
+def _job_pk(job_id):
+    # bool is an int, but never a job id
+    if isinstance(job_id, bool) or not isinstance(job_id, (int, str)):
+        raise ValueError("job_id must be an integer.")
+    try:
+        return int(job_id)
+    except ValueError:
+        raise ValueError("job_id must be an integer.") from None
+
+async def _create_session(jd_text, job_id=None):
+    """
+    A new interview session, or None for an unknown job id. Raises
+    ValueError for a job id that is not an integer.
+    """
+    plan = None
+    if job_id is not None:
+        # Ingested JDs come with their topics and question plan
+        job = await JobDescription.objects.filter(pk=_job_pk(job_id)).values("topics", "question_plan").afirst()
+        if job is None:
+            return None
+        topics = job["topics"]
+        if len(job["question_plan"]) == len(topics):
+            plan = job["question_plan"]
+    else:
+        topics = await extract_skills_from_jd_async(jd_text)
+    if plan is None:
+        # Also for JDs ingested before the bank knew their topics
+        with span("question"):
+            plan = await _from_question_bank(question_bank.plan, topics)
+    return interview_sessions.create(topics, [entry["question"] for entry in plan])
+
+def _json_response(payload, status=200):
+    with span("serialize"):
+        return JsonResponse(payload, status=status)
+
+async def _start_session(request, jd_text, job_id=None):
+    try:
+        session = await _create_session(jd_text, job_id)
+    except ValueError as exc:
+        return _json_response({"error": str(exc)}, status=400)
+    if session is None:
+        return _json_response({"error": "Unknown job description."}, status=404)
+    # Session data lives in the database, which cannot be touched from async code
+    await sync_to_async(_bind_interview)(request.session, session)
+    return _json_response(_session_payload(session, topics=session.topics))
+
+async def _answer_turn(interview_id, user_response):
+    """The payload and HTTP status of one answered turn."""
+    session = interview_sessions.get(interview_id)
+    if session is None:
+        return {"error": "Unknown or expired interview."}, 404
+    if not user_response:
+        return {"error": "Missing response."}, 400
+
+    async def scored(topic, response):
+        with span("score"):
+            return await cpu_pool.run(assess_response, topic, response)
+
+    turn = await interview_sessions.answer(session, user_response, scored)
+    if turn is None:
+        return {"error": "Interview already finished."}, 409
+    _, _, _, feedback, score = turn
+    return _session_payload(session, feedback=feedback, score=score), 200
+
+async def _session_turn(interview_id, user_response, **extra):
+    payload, status = await _answer_turn(interview_id, user_response)
+    if status == 200:
+        payload.update(extra)
+    return _json_response(payload, status=status)
+
+# Bursts (a whole cohort starting at once) queue for a bounded number of
+# slots, turns of running interviews first, and are refused fast past the
+# deadline rather than slowing down everyone
+admission = AdmissionController.from_settings(
+    settings, on_shed=lambda reason, priority: ADMISSION_SHED.inc(reason=reason, priority=priority),
+)
+
+def _interview_bucket(interview_id):
+    return f"interview:{interview_id}"
+
+def _client_bucket(address):
+    return f"client:{address or 'unknown'}"
+
+def _admission_class(request):
+    # Only ids of running interviews count as turns, so a made-up id neither
+    # jumps the queue nor gets a fresh token bucket; everything else is rate
+    # limited by client address
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and data.get("action") == "turn":
+        interview_id = data.get("interview_id")
+        if isinstance(interview_id, str) and interview_sessions.get(interview_id) is not None:
+            return IN_PROGRESS, _interview_bucket(interview_id)
+    return NEW, _client_bucket(request.META.get("REMOTE_ADDR"))
+
+def _audio_bucket(interview_id):
+    return f"audio:{interview_id}"
+
+def _audio_admission_class(request):
+    # An answer arrives as several chunks a second, so a running interview's
+    # chunks have a looser bucket of their own
+    interview_id = request.GET.get("interview_id")
+    if interview_id and interview_sessions.get(interview_id) is not None:
+        return IN_PROGRESS, _audio_bucket(interview_id)
+    return NEW, _client_bucket(request.META.get("REMOTE_ADDR"))
+
+# Spoken answers: speech is transcribed on its own pool while the rest of the
+# answer is still uploading
+stt_pool = CPUPool(kind=settings.STT_POOL_KIND, max_workers=settings.STT_POOL_WORKERS)
+
+def _transcribe(segment, sample_rate):
+    return stt_pool.submit(transcribe_segment, settings.SPEECH_BACKEND, segment, sample_rate)
+
+audio_uploads = UploadStore(
+    _transcribe,
+    max_uploads=settings.AUDIO_MAX_UPLOADS,
+    ttl=settings.AUDIO_UPLOAD_TTL,
+    max_seconds=settings.AUDIO_MAX_SECONDS,
+    energy_threshold=settings.AUDIO_ENERGY_THRESHOLD,
+    pause_seconds=settings.AUDIO_PAUSE_SECONDS,
+)
+
+@async_csrf_exempt
+@async_require_POST
+@async_admitted(admission, _audio_admission_class)
+async def interview_audio(request):
+    # Body: raw 16-bit mono PCM. Query: interview_id, seq (0, 1, ...), rate,
+    # and final=1 on the last chunk, which answers like an "action": "turn"
+    INTERVIEW_REQUESTS.inc(call_type="audio")
+    interview_id = request.GET.get("interview_id")
+    try:
+        seq = int(request.GET.get("seq", "0"))
+        sample_rate = int(request.GET.get("rate", settings.AUDIO_SAMPLE_RATE))
+    except ValueError:
+        return _json_response({"error": "seq and rate must be integers."}, status=400)
+    if interview_sessions.get(interview_id) is None:
+        return _json_response({"error": "Unknown or expired interview."}, status=404)
+    if len(request.body) > settings.AUDIO_MAX_CHUNK_BYTES:
+        return _json_response({"error": "Audio chunk is too large."}, status=413)
+
+    try:
+        # Segmenting a chunk at pauses is CPU work; keep it off the loop
+        upload = await asyncio.to_thread(audio_uploads.chunk, interview_id, seq, request.body, sample_rate)
+    except UploadError as exc:
+        return _json_response({"error": str(exc)}, status=exc.status)
+    if request.GET.get("final") != "1":
+        return _json_response({
+            "received_seconds": round(upload.seconds, 2),
+            "segments": len(upload.futures),
+            "partial": upload.partial(),
+        }, status=202)
+
+    audio_uploads.pop(interview_id)
+    with span("transcribe"):
+        try:
+            transcript = await upload.transcript()
+        except TranscriptionError as exc:
+            return _json_response({"error": f"Transcription failed: {exc}"}, status=502)
+    if not transcript:
+        return _json_response({"error": "No speech recognized.", "transcript": ""}, status=422)
+    return await _session_turn(interview_id, transcript, transcript=transcript)
+
+request_profiler = RequestProfiler.from_settings(settings)
+
+def _profile_tag(request):
+    # Profiles of JD calls are named after the JD hash the topic cache uses
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return "invalid"
+    if not isinstance(data, dict):
+        return "invalid"
+    if data.get("jd"):
+        return jd_hash(normalize_jd(str(data["jd"])))[:16]
+    if data.get("job_id"):
+        return f"job{data['job_id']}"
+    return str(data.get("interview_id") or "none")
+
+@async_csrf_exempt
+@async_require_POST
+@async_admitted(admission, _admission_class)
+@async_profiled(request_profiler, _profile_tag)
+async def interview_api(request):
     data = json.loads(request.body)
     jd_text = data.get("jd")
     user_response = data.get("response")
     topic = data.get("topic")
+    action = data.get("action")
+
+    # SESSION PROTOCOL: "start" (with a JD text or the id of an ingested JD)
+    # returns the topics and first question, each "turn" submits an answer
+    # and returns its feedback plus the next question
+    if action == "start" and (jd_text or data.get("job_id")):
+        INTERVIEW_REQUESTS.inc(call_type="start")
+        return await _start_session(request, jd_text, data.get("job_id"))
+
+    if action == "turn":
+        INTERVIEW_REQUESTS.inc(call_type="turn")
+        return await _session_turn(data.get("interview_id"), user_response)
 
     # FIRST CALL: Get all topics
     if jd_text and not topic:
-        skills = extract_skills_from_jd(jd_text)
-        return JsonResponse({"topics": skills})
+        INTERVIEW_REQUESTS.inc(call_type="topics")
+        skills = await extract_skills_from_jd_async(jd_text)
+        return _json_response({"topics": skills})
 
     # LATER CALLS: Ask or respond to each topic
     if topic and not user_response:
-        question = generate_question(topic)
-        return JsonResponse({"question": question})
+        INTERVIEW_REQUESTS.inc(call_type="question")
+        with span("question"):
+            question = await _from_question_bank(generate_question, topic)
+        return _json_response({"question": question})
 
     if topic and user_response:
-        good = is_response_good(topic, user_response)
-        feedback = provide_feedback(good)
-        return JsonResponse({"feedback": feedback})
+        INTERVIEW_REQUESTS.inc(call_type="feedback")
+        with span("score"):
+            score, feedback = await cpu_pool.run(assess_response, topic, user_response)
+        return _json_response({"feedback": feedback, "score": score})
+
+    INTERVIEW_REQUESTS.inc(call_type="invalid")
+    return _json_response({"error": "Invalid input."}, status=400)
+
+# Gauges are read when /metrics is scraped, never on the request path
+registry.gauge(
+    "topic_cache_events_total", "Topic cache lookups by outcome.",
+    lambda: {k: v for k, v in topic_cache.stats().items() if k.endswith(("hits", "misses"))},
+    label="outcome", kind="counter",
+)
+registry.gauge("topic_cache_entries", "Entries in the in-memory topic cache.", lambda: topic_cache.stats()["size"])
+registry.gauge("cpu_pool_waiting", "Calls queued for the CPU pool.", lambda: cpu_pool.waiting)
+registry.gauge("cpu_pool_running", "Calls running on the CPU pool.", lambda: cpu_pool.running)
+registry.gauge("interview_sessions_active", "Live interview sessions.", lambda: len(interview_sessions))
+registry.gauge("audio_uploads_active", "Answers being uploaded as audio.", lambda: len(audio_uploads))
+registry.gauge("stt_pool_running", "Speech segments being transcribed.", lambda: stt_pool.running)
+registry.gauge("admission_in_flight", "Calls holding an admission slot.", lambda: admission.in_flight)
+registry.gauge("admission_queue_depth", "Calls waiting for an admission slot.", lambda: admission.queued, label="priority")
+registry.gauge(
+    "nlp_model_load_seconds", "Time taken to load the spaCy model.",
+    lambda: nlp_service.stats().get("load_seconds"),
+)
+
+def metrics_view(request):
+    if not registry.enabled:
+        raise Http404
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
-    return JsonResponse({"error": "Invalid input."}, status=400)
+@staff_member_required
+@require_POST
+def bulk_ingest(request):
+    upload = request.FILES.get("file")
+    if upload is None:
+        return JsonResponse({"error": "Upload a JSONL or CSV file as 'file'."}, status=400)
+
+    fmt = request.POST.get("format") or guess_format(upload.name)
+    try:
+        stats = ingest_records(
+            iter_jd_records(codecs.iterdecode(upload, "utf-8"), fmt),
+            batch_size=settings.JD_INGEST_BATCH_SIZE,
+            processes=settings.JD_INGEST_PROCESSES,
+            matcher=nlp_service.matcher,
+        )
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(stats)
 
 
 from django.shortcuts import render
@@ -103,6 +420,7 @@ def personal_login(request):
         }
 
         if credentials.get(username) == password:
+            request.session["candidate"] = username
             return redirect('interview_dashboard')
         else:
             return render(request, 'ai_int_app/branch_login.html', {'error': 'Invalid credentials'})
@@ -112,20 +430,84 @@ def personal_login(request):
 def interview_dashboard(request):
     return render(request, "ai_int_app/index.html")
 
-from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse
-import json
+def _save_summary(request, data):
+    interview_id = data.get("interview_id")
 
-# Store interview results temporarily (demo purpose)
-INTERVIEW_SUMMARY = {}
+    if interview_id and interview_id == request.session.get("interview_id"):
+        # Turns were already recorded as they were answered
+        interview_sessions.discard(interview_id)
+    else:
+        # Older clients only send their {topic: response} dictionary
+        responses = data.get("responses", {})
+        interview_id = uuid.uuid4().hex
+        results_buffer.start_interview(interview_id, request.session.get("candidate", ""), list(responses))
+        for index, (topic, response) in enumerate(responses.items()):
+            results_buffer.add_turn(interview_id, index, topic, "", response, "")
+        request.session["interview_id"] = interview_id
 
-@csrf_exempt
-@require_POST
-def save_summary(request):
-    global INTERVIEW_SUMMARY
+    results_buffer.complete(interview_id)
+    return interview_id
+
+@async_csrf_exempt
+@async_require_POST
+@async_profiled(request_profiler, _profile_tag)
+async def save_summary(request):
     data = json.loads(request.body)
-    INTERVIEW_SUMMARY = data.get("responses", {})
-    return JsonResponse({"status": "success"})
+    interview_id = await sync_to_async(_save_summary)(request, data)
+    return JsonResponse({"status": "success", "interview_id": interview_id})
+
+def _load_summary(request):
+    interview_id = request.session.get("interview_id")
+    if not interview_id:
+        return {}
+    # Make sure this candidate's buffered turns are visible
+    results_buffer.flush()
+    interview = Interview.objects.filter(pk=interview_id).prefetch_related("turns").first()
+    if interview is None:
+        return {}
+    return {
+        turn.topic: {"question": turn.question, "response": turn.response, "feedback": turn.feedback}
+        for turn in interview.turns.all()
+    }
+
+async def _aiter_sync(iterator):
+    # Each step runs on the sync thread, so each chunk's query does too
+    sentinel = object()
+    while True:
+        item = await sync_to_async(next)(iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
+
+@staff_member_required
+def export_results(request):
+    fmt = request.GET.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return JsonResponse({"error": f"Unknown format; use one of {sorted(EXPORT_FORMATS)}."}, status=400)
+    bounds = {}
+    for name in ("since", "until"):
+        value = request.GET.get(name)
+        if value:
+            bounds[name] = parse_datetime(value)
+            if bounds[name] is None:
+                return JsonResponse({"error": f"'{name}' must be an ISO 8601 datetime."}, status=400)
+
+    results_buffer.flush()
+    queryset = export_queryset(candidate=request.GET.get("candidate"), **bounds)
+    chunks = iter_row_chunks(queryset, chunk_size=settings.EXPORT_CHUNK_SIZE)
+    try:
+        stream = iter_export(fmt, chunks)
+    except ImportError as exc:
+        return JsonResponse({"error": str(exc)}, status=501)
+    if isinstance(request, ASGIRequest):
+        # Django would read a sync iterator to the end before sending it
+        stream = _aiter_sync(stream)
+
+    content_type, extension = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="interview_results.{extension}"'
+    return response
 
-def show_summary(request):
-    return render(request, "ai_int_app/summary.html", {"summary": INTERVIEW_SUMMARY})
\ No newline at end of file
+async def show_summary(request):
+    summary = await sync_to_async(_load_summary)(request)
+    return render(request, "ai_int_app/summary.html", {"summary": summary})
@@ -0,0 +1,314 @@
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+from importlib import import_module
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import parse_cookie
+from django.http.request import validate_host
+
+from . import views
+from .admission import IN_PROGRESS, NEW, Rejected
+from .audio_upload import SAMPLE_RATES, AudioUpload, UploadError
+from .metrics import INTERVIEW_REQUESTS, registry, span
+from .speech import TranscriptionError
+
+# A whole interview over one WebSocket, mounted at /ws/interview/ by
+# chat_web_ai/asgi.py, instead of one POST per step. Text frames carry JSON
+# messages with a "type"; binary frames carry 16-bit mono PCM of a spoken
+# answer. Plain ASGI, so any ASGI server runs it without extra packages.
+#
+#   client                                     server
+#   {"type": "start", "jd": ...}          ->   {"type": "question", "topics": [...], ...}
+#   {"type": "answer", "text": ...}       ->   {"type": "feedback", ...}, then "question" or "done"
+#   {"type": "audio", "rate": 16000},
+#   binary frames, {"type": "audio_end"}  ->   {"type": "partial", ...} per segment, then as "answer"
+#   {"type": "resume", "interview_id": ...} -> {"type": "question", ...}
+#   {"type": "ping"}                      ->   {"type": "pong"}
+#                                         <-   {"type": "ping"} every WS_HEARTBEAT_INTERVAL seconds
+#
+# A connection costs one coroutine waiting on its socket; scoring runs on the
+# views' CPU pool and transcription on their speech pool, as for HTTP.
+
+IDLE_CLOSE_CODE = 4408
+
+
+def _headers(scope) -> Dict[str, str]:
+    return {name.decode("latin1").lower(): value.decode("latin1") for name, value in scope.get("headers", [])}
+
+
+def origin_allowed(origin: Optional[str]) -> bool:
+    """Browsers send their Origin; it must be one of ALLOWED_HOSTS."""
+    if origin is None:
+        return True
+    host = urlsplit(origin).hostname
+    if host is None:
+        return False
+    allowed = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed:
+        # What Django allows in DEBUG with an empty ALLOWED_HOSTS
+        allowed = [".localhost", "127.0.0.1", "[::1]"]
+    return validate_host(f"[{host}]" if ":" in host else host, allowed)
+
+
+class InterviewConnection:
+    """One open socket and the interview running over it."""
+
+    def __init__(self, scope, receive, send, heartbeat: float, idle_timeout: float):
+        self.scope = scope
+        self.receive = receive
+        self.send = send
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self.headers = _headers(scope)
+        self.client = (scope.get("client") or [None])[0]
+        self.interview_id: Optional[str] = None
+        self.upload: Optional[AudioUpload] = None
+        self.last_seen = time.monotonic()
+        self._partial = ""
+
+    async def send_json(self, payload: Dict):
+        with span("serialize"):
+            text = json.dumps(payload)
+        await self.send({"type": "websocket.send", "text": text})
+
+    async def error(self, message: str, status: int = 400, **extra):
+        await self.send_json({"type": "error", "error": message, "status": status, **extra})
+
+    def admitted(self, priority: int, key: str):
+        # The same admission control as interview_api
+        return views.admission.admitted(priority, key) if views.admission.enabled else nullcontext()
+
+    def turn_class(self):
+        # As for interview_api, only a running interview's turns are in
+        # progress; before that the client address is the bucket
+        if self.interview_id is not None and views.interview_sessions.get(self.interview_id) is not None:
+            return IN_PROGRESS, views._interview_bucket(self.interview_id)
+        return NEW, views._client_bucket(self.client)
+
+    async def rejected(self, exc: Rejected):
+        await self.error(str(exc), exc.status, retry_after=exc.retry_after_header)
+
+    async def run(self):
+        await self.send({"type": "websocket.accept"})
+        # One receive outlives heartbeats: cancelling it could lose a frame
+        # that arrives just as the heartbeat is due
+        receiving = None
+        try:
+            while True:
+                if receiving is None:
+                    receiving = asyncio.ensure_future(self.receive())
+                done, _ = await asyncio.wait({receiving}, timeout=self.heartbeat)
+                if not done:
+                    if time.monotonic() - self.last_seen >= self.idle_timeout:
+                        await self.send({"type": "websocket.close", "code": IDLE_CLOSE_CODE})
+                        return
+                    await self.send_json({"type": "ping"})
+                    continue
+                message, receiving = receiving.result(), None
+                if message["type"] == "websocket.disconnect":
+                    return
+                self.last_seen = time.monotonic()
+                if message.get("bytes") is not None:
+                    await self.on_frame(message["bytes"])
+                elif message.get("text") is not None:
+                    await self.on_text(message["text"])
+        finally:
+            if receiving is not None:
+                receiving.cancel()
+            if self.upload is not None:
+                self.upload.cancel()
+
+    async def on_text(self, text: str):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return await self.error("Messages are JSON objects.")
+        handler = {
+            "start": self.on_start,
+            "resume": self.on_resume,
+            "answer": self.on_answer,
+            "audio": self.on_audio,
+            "audio_end": self.on_audio_end,
+            "ping": self.on_ping,
+            "pong": self.on_pong,
+        }.get(data.get("type"))
+        if handler is None:
+            return await self.error(f"Unknown message type {data.get('type')!r}.")
+        await handler(data)
+
+    # -------------------- Interview --------------------
+
+    def _http_session(self):
+        # The browser's Django session, so /summary/ finds the interview
+        key = parse_cookie(self.headers.get("cookie", "")).get(settings.SESSION_COOKIE_NAME)
+        return import_module(settings.SESSION_ENGINE).SessionStore(key)
+
+    def _bind(self, session):
+        http_session = self._http_session()
+        views._bind_interview(http_session, session)
+        if http_session.session_key:
+            http_session.save()
+
+    def _complete(self, interview_id: str):
+        views.interview_sessions.discard(interview_id)
+        views.results_buffer.complete(interview_id)
+
+    async def send_state(self, payload: Dict):
+        """The next question, or "done" once every topic is answered."""
+        if not payload["done"]:
+            return await self.send_json({"type": "question", **payload})
+        await sync_to_async(self._complete)(payload["interview_id"])
+        self.interview_id = None
+        await self.send_json({"type": "done", "interview_id": payload["interview_id"], "summary_url": "/summary/"})
+
+    async def on_start(self, data: Dict):
+        INTERVIEW_REQUESTS.inc(call_type="start")
+        if not (data.get("jd") or data.get("job_id")):
+            return await self.error("Give a jd or a job_id.")
+        try:
+            async with self.admitted(NEW, views._client_bucket(self.client)):
+                session = await views._create_session(data.get("jd"), data.get("job_id"))
+        except Rejected as exc:
+            return await self.rejected(exc)
+        except ValueError as exc:
+            return await self.error(str(exc))
+        if session is None:
+            return await self.error("Unknown job description.", 404)
+        await sync_to_async(self._bind)(session)
+        self.interview_id = session.interview_id
+        await self.send_state(views._session_payload(session, topics=session.topics))
+
+    async def on_resume(self, data: Dict):
+        session = views.interview_sessions.get(data.get("interview_id"))
+        if session is None:
+            return await self.error("Unknown or expired interview.", 404)
+        self.interview_id = session.interview_id
+        await self.send_state(views._session_payload(session, topics=session.topics))
+
+    async def answer(self, text: str, **extra):
+        INTERVIEW_REQUESTS.inc(call_type="turn")
+        answered = views.interview_sessions.get(self.interview_id)
+        topic = answered.topic if answered is not None else None
+        try:
+            async with self.admitted(*self.turn_class()):
+                payload, status = await views._answer_turn(self.interview_id, text)
+        except Rejected as exc:
+            return await self.rejected(exc)
+        if status != 200:
+            return await self.error(payload["error"], status)
+        await self.send_json({
+            "type": "feedback", "topic": topic,
+            "feedback": payload.pop("feedback"), "score": payload.pop("score"), **extra,
+        })
+        await self.send_state(payload)
+
+    async def on_answer(self, data: Dict):
+        await self.answer(data.get("text"))
+
+    # -------------------- Spoken answers --------------------
+
+    async def on_audio(self, data: Dict):
+        if self.interview_id is None:
+            return await self.error("Start or resume an interview first.", 409)
+        rate = data.get("rate", settings.AUDIO_SAMPLE_RATE)
+        if not isinstance(rate, int) or rate not in SAMPLE_RATES:
+            return await self.error(f"Unsupported sample rate {rate}.")
+        if self.upload is not None:
+            self.upload.cancel()
+        self.upload = AudioUpload(
+            self.interview_id, views._transcribe, rate, settings.AUDIO_MAX_SECONDS,
+            energy_threshold=settings.AUDIO_ENERGY_THRESHOLD, pause_seconds=settings.AUDIO_PAUSE_SECONDS,
+        )
+        self._partial = ""
+
+    async def send_partial(self):
+        partial = self.upload.partial() if self.upload is not None else ""
+        if partial and partial != self._partial:
+            self._partial = partial
+            await self.send_json({"type": "partial", "transcript": partial})
+
+    async def on_frame(self, pcm: bytes):
+        if self.upload is None:
+            return await self.error('Send {"type": "audio"} before audio frames.', 409)
+        if len(pcm) > settings.AUDIO_MAX_CHUNK_BYTES:
+            return await self.error("Audio frame is too large.", 413)
+        try:
+            # Segmenting at pauses is CPU work; keep it off the loop
+            await asyncio.to_thread(self.upload.add, self.upload.next_seq, pcm)
+        except UploadError as exc:
+            return await self.error(str(exc), exc.status)
+        await self.send_partial()
+
+    async def on_audio_end(self, data: Dict):
+        if self.upload is None:
+            return await self.error('Send {"type": "audio"} before "audio_end".', 409)
+        INTERVIEW_REQUESTS.inc(call_type="audio")
+        try:
+            # Report each segment as it finishes
+            for future in self.upload.finish():
+                await asyncio.wrap_future(future)
+                await self.send_partial()
+            transcript = await self.upload.transcript()
+        except TranscriptionError as exc:
+            return await self.error(f"Transcription failed: {exc}", 502)
+        finally:
+            self.upload = None
+        if not transcript:
+            return await self.error("No speech recognized.", 422)
+        await self.answer(transcript, transcript=transcript)
+
+    # -------------------- Heartbeats --------------------
+
+    async def on_ping(self, data: Dict):
+        await self.send_json({"type": "pong"})
+
+    async def on_pong(self, data: Dict):
+        pass
+
+
+class InterviewSocket:
+    """
+    ASGI application for the interview WebSocket. Refuses connections from
+    other origins and beyond ``max_connections`` before accepting them.
+    """
+
+    def __init__(self, heartbeat: float = 20, idle_timeout: float = 60, max_connections: int = 5000):
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.connections = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "InterviewSocket":
+        return cls(
+            heartbeat=settings.WS_HEARTBEAT_INTERVAL,
+            idle_timeout=settings.WS_IDLE_TIMEOUT,
+            max_connections=settings.WS_MAX_CONNECTIONS,
+        )
+
+    async def __call__(self, scope, receive, send):
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+        origin = _headers(scope).get("origin")
+        if self.connections >= self.max_connections or not origin_allowed(origin):
+            # Closing before accepting answers the handshake with a 403
+            await send({"type": "websocket.close"})
+            return
+        self.connections += 1
+        try:
+            await InterviewConnection(scope, receive, send, self.heartbeat, self.idle_timeout).run()
+        finally:
+            self.connections -= 1
+
+
+interview_socket = InterviewSocket.from_settings(settings)
+
+registry.gauge("websocket_connections", "Open interview WebSockets.", lambda: interview_socket.connections)
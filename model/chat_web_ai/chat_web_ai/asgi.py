@@ -2,6 +2,11 @@
 ASGI config for chat_web_ai project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSockets at /ws/interview/ go to the interview channel
+(see ai_int_app/websocket.py), and the lifespan startup event warms up the
+shared services (see ai_int_app/startup.py). Serve with any ASGI server, e.g.
+
+    uvicorn chat_web_ai.asgi:application
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -13,4 +18,38 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chat_web_ai.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up
+from asgiref.sync import sync_to_async  # noqa: E402
+from ai_int_app.startup import warm_up  # noqa: E402
+from ai_int_app.websocket import interview_socket  # noqa: E402
+
+WEBSOCKET_ROUTES = {
+    "/ws/interview/": interview_socket,
+}
+
+
+async def lifespan(receive, send):
+    # The server's startup event, so warming up never blocks a request
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await sync_to_async(warm_up)()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+    if scope["type"] == "websocket":
+        route = WEBSOCKET_ROUTES.get(scope["path"])
+        if route is None:
+            await receive()
+            await send({"type": "websocket.close"})
+            return
+        return await route(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,31 @@
+"""
+Preforked deployment: the master loads the spaCy model, skill taxonomy and
+question bank once and the workers share those pages copy-on-write.
+
+    cd model/chat_web_ai
+    gunicorn -c chat_web_ai/gunicorn.conf.py chat_web_ai.wsgi
+
+Compare worker memory with ``python manage.py memory_report --master <pid>``.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+# Import the Django application in the master, before forking
+preload_app = True
+
+
+def when_ready(server):
+    from ai_int_app.prefork import preload
+
+    server.log.info("Preloaded shared state: %s", preload())
+
+
+def post_fork(server, worker):
+    from ai_int_app.prefork import after_fork
+
+    after_fork(worker.pid)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ai_int_app.middleware.TimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,6 +80,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests (and for the results
+        # write-behind thread) instead of reconnecting every time
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -126,3 +132,130 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 STATICFILES_DIRS = [
     BASE_DIR / "ai_int_app/templates/static",
 ]
+
+# Bulk JD ingestion (see ai_int_app/ingest.py): records per nlp.pipe batch and
+# number of worker processes used for topic extraction
+JD_INGEST_BATCH_SIZE = 200
+JD_INGEST_PROCESSES = 1
+
+# Shared spaCy pipeline (see ai_int_app/nlp_service.py): load it when a
+# server starts (ai_int_app/startup.py) instead of on the first request, and
+# warn when the cold start or the worker RSS goes over budget
+NLP_WARM_UP = True
+NLP_LOAD_BUDGET_SECONDS = 2.0
+NLP_RSS_BUDGET_MB = 300
+
+# JD topic cache (see ai_int_app/topic_cache.py): entries kept in the
+# in-process LRU, and whether misses are also stored in the database
+TOPIC_CACHE_SIZE = 1024
+TOPIC_CACHE_PERSISTENT = True
+
+# Server-side interview sessions (see ai_int_app/sessions.py): idle seconds
+# before a session expires, and threads generating the next question ahead
+INTERVIEW_SESSION_TTL = 60 * 60
+QUESTION_PREFETCH_WORKERS = 2
+
+# Interview results write-behind (see ai_int_app/results_store.py): rows
+# pending before an early flush, seconds between background flushes, and
+# how many failed flushes in a row, or pending rows, before a failed batch
+# is dropped
+RESULTS_BATCH_SIZE = 100
+RESULTS_FLUSH_INTERVAL = 1.0
+RESULTS_MAX_RETRIES = 5
+RESULTS_MAX_PENDING = 10000
+
+# Pool for CPU-bound work of the async views (see ai_int_app/cpu_pool.py):
+# "thread" or "process", worker count, and how many calls may be submitted
+# at once per event loop before the rest queue
+CPU_POOL_KIND = "thread"
+CPU_POOL_WORKERS = 4
+CPU_POOL_CONCURRENCY = 8
+
+# Answer scoring (see ai_int_app/scoring.py): optional JSON file of
+# {"topic": ["rubric point", ...]} added to the built-in rubrics
+SCORING_RUBRIC_PATH = None
+
+# Question bank (see ai_int_app/question_bank.py): load every question into
+# memory when a server starts (ai_int_app/startup.py) so serving one is a
+# dictionary lookup
+QUESTION_BANK_WARM_UP = True
+
+# Gemini gateway (see ai_int_app/llm_gateway.py). LLM_BASE_URL can point at
+# the local stub (manage.py llm_stub_server) for offline runs and load tests
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
+LLM_MAX_CONCURRENCY = 8
+LLM_MAX_CONNECTIONS = 16
+LLM_TIMEOUT = 30.0
+LLM_MAX_RETRIES = 3
+LLM_TOPICS_PER_REQUEST = 5
+
+# LLM reply cache (see ai_int_app/llm_cache.py): in-process LRU entries, a
+# disk tier shared by the workers of one host (None to disable it), and TTLs
+# in seconds per call type overriding llm_cache.DEFAULT_TTLS
+LLM_CACHE_ENABLED = True
+LLM_CACHE_SIZE = 1024
+LLM_CACHE_DIR = BASE_DIR / "llm_cache"
+LLM_CACHE_DISK_ENTRIES = 50000
+LLM_CACHE_TTLS = {}
+
+# Request timing and the Prometheus /metrics route (see ai_int_app/metrics.py).
+# When off, the middleware removes itself and spans do nothing
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Request profiling of interview_api and save_summary (see
+# ai_int_app/profiling.py): the fraction of requests sampled, plus any request
+# whose PROFILE_HEADER equals PROFILE_TOKEN (header profiling is off while the
+# token is empty). PROFILE_FORMAT is "collapsed" (stack samples of every
+# thread, for flamegraphs) or "pstats" (cProfile of the view's thread)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = "X-Profile-Request"
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "collapsed")
+PROFILE_INTERVAL = 0.005
+PROFILE_DIR = BASE_DIR / "profiles"
+
+# Results export (see ai_int_app/export.py): interview turns read per query
+EXPORT_CHUNK_SIZE = 2000
+
+# Spoken answers uploaded in chunks (see ai_int_app/audio_upload.py): the
+# speech.BACKENDS entry that transcribes them, the pool it runs on, and the
+# limits of each upload. Speech is cut into segments at pauses of
+# AUDIO_PAUSE_SECONDS below AUDIO_ENERGY_THRESHOLD (RMS of 16-bit samples)
+SPEECH_BACKEND = os.getenv("SPEECH_BACKEND", "google")
+STT_POOL_KIND = "process"
+STT_POOL_WORKERS = 2
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_MAX_SECONDS = 180
+AUDIO_MAX_CHUNK_BYTES = 512 * 1024
+AUDIO_MAX_UPLOADS = 32
+AUDIO_UPLOAD_TTL = 300
+AUDIO_ENERGY_THRESHOLD = 300.0
+AUDIO_PAUSE_SECONDS = 0.5
+
+# Interview WebSocket at /ws/interview/ (see ai_int_app/websocket.py): seconds
+# between server pings, seconds without a client message before the socket
+# is closed, and open sockets per process
+WS_HEARTBEAT_INTERVAL = 20
+WS_IDLE_TIMEOUT = 60
+WS_MAX_CONNECTIONS = 5000
+
+# Admission control of interview_api and the interview WebSocket (see
+# ai_int_app/admission.py): calls doing work at once, calls queued behind
+# them, seconds a call may wait before it is refused with a 503, and each
+# interview's token bucket (calls per second, burst) beyond which a 429.
+# Starts and calls that are not turns of a running interview share a looser
+# bucket per client address, which many candidates behind one NAT or a load
+# test from one host may need to raise. The audio chunks of an answer, sent
+# several a second, have a bucket of their own per interview.
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+ADMISSION_MAX_IN_FLIGHT = CPU_POOL_CONCURRENCY
+ADMISSION_MAX_QUEUE = 64
+ADMISSION_DEADLINE = 2.0
+ADMISSION_RATE = 1.0
+ADMISSION_BURST = 5
+ADMISSION_CLIENT_RATE = float(os.getenv("ADMISSION_CLIENT_RATE", "10"))
+ADMISSION_CLIENT_BURST = int(os.getenv("ADMISSION_CLIENT_BURST", "100"))
+ADMISSION_AUDIO_RATE = 10.0
+ADMISSION_AUDIO_BURST = 20
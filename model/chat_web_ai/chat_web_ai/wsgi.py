@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chat_web_ai.settings')
 
 application = get_wsgi_application()
+
+# Imported once Django is set up
+from ai_int_app.startup import warm_up  # noqa: E402
+
+warm_up()